@@ -0,0 +1,272 @@
+# cli.py
+"""
+Headless batch consolidation, for scheduled/unattended runs.
+
+    python main.py REPORTS... --tolerances tol.json --title "Week 42" --creator "QC Bot"
+    python main.py REPORTS... --tolerance-profile auto --title "Week 42" --creator "QC Bot"
+
+REPORTS may be .xlsx files, directories (all *.xlsx inside) or glob patterns.
+This module must not import PyQt5.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+from app.core.consolidator import Consolidator
+from app.core.instrumentation import RunStats
+from app.core.naming import map_symbol
+from app.core.parse_store import DEFAULT_STORE_PATH, ParseStore
+from app.core.tolerance_store import DEFAULT_PROFILES_PATH, ToleranceStore, incomplete_columns
+from app.io.data_writer import export_master_data
+from app.io.excel_writer import export_master_report, export_master_report_parts
+
+
+def collect_input_files(inputs):
+    """Expand files, directories and glob patterns into a de-duplicated list of .xlsx paths."""
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "*.xlsx")))
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+        else:
+            matches = [item]
+        for path in matches:
+            # Skip Excel lock files (~$report.xlsx) left by open workbooks
+            if os.path.basename(path).startswith("~$"):
+                continue
+            if path not in found:
+                found.append(path)
+    return found
+
+
+def load_tolerance_file(path):
+    """
+    Load tolerances from JSON ({"Diameter 1": [nominal, plus, minus], ...})
+    or CSV (columns: column,nominal,plus,minus). Column names are mapped to
+    their unit form, e.g. 'Diameter 1' -> 'Diameter 1 (mm)'.
+    Returns: {col_name_with_unit: (nominal, plus, minus)}
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            entries = {
+                row["column"]: (row["nominal"], row.get("plus") or 0.05, row.get("minus") or 0.05)
+                for row in csv.DictReader(f)
+            }
+    else:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+
+    tolerances = {}
+    for name, entry in entries.items():
+        nominal, plus, minus = entry
+        tolerances[map_symbol(name.strip())] = (float(nominal), float(plus), float(minus))
+    return tolerances
+
+
+def profile_incomplete_message(name, tolerance_dict):
+    """Error text for a saved profile with blank tolerance values."""
+    return (
+        f"Tolerance profile {name!r} has no nominal/plus/minus value for: "
+        f"{', '.join(incomplete_columns(tolerance_dict))}. Re-save it with every value filled."
+    )
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Consolidate gemstone measurement reports into a master Excel report (no GUI).",
+    )
+    parser.add_argument("inputs", nargs="+", help=".xlsx files, directories or glob patterns")
+    tolerances = parser.add_mutually_exclusive_group(required=True)
+    tolerances.add_argument("-t", "--tolerances", help="tolerance file (.json or .csv)")
+    tolerances.add_argument(
+        "--tolerance-profile", metavar="NAME",
+        help="use a saved tolerance profile; 'auto' picks the profile saved for the reports' columns",
+    )
+    parser.add_argument(
+        "--profiles", default=DEFAULT_PROFILES_PATH, metavar="PATH",
+        help=f"tolerance profile file (default: {DEFAULT_PROFILES_PATH})",
+    )
+    parser.add_argument(
+        "--save-profile", metavar="NAME",
+        help="save the --tolerances file as a named profile for the reports' columns, "
+             "for later runs (--tolerance-profile auto) and the GUI",
+    )
+    parser.add_argument("--title", required=True, help="report title")
+    parser.add_argument("--creator", required=True, help="report creator / inspector name")
+    parser.add_argument("-o", "--output", help="output .xlsx path (default: <title>.xlsx)")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="parse worker processes (default: CPU count, 1 = no pool)",
+    )
+    parser.add_argument(
+        "--disk-cache", nargs="?", const=DEFAULT_STORE_PATH, metavar="PATH",
+        help="reuse parsed reports from a persistent cache file across runs "
+             f"(default path: {DEFAULT_STORE_PATH})",
+    )
+    parser.add_argument(
+        "--data", metavar="PATH",
+        help="also write the master table with PASS/FAIL flags for analytics tools "
+             "(.parquet or .arrow with pyarrow installed, otherwise .csv)",
+    )
+    chunking = parser.add_mutually_exclusive_group()
+    chunking.add_argument(
+        "--chunk-rows", type=int, metavar="N",
+        help="split the report into sheets of N rows, each with its own tolerance header",
+    )
+    chunking.add_argument(
+        "--chunk-ids", type=int, metavar="N",
+        help="split the report by file-ID range of width N (e.g. 1000 -> IDs 0-999, 1000-1999, ...)",
+    )
+    parser.add_argument(
+        "--split-files", action="store_true",
+        help="with --chunk-rows/--chunk-ids, write each chunk to its own workbook "
+             "(<output>_<chunk>.xlsx), in parallel",
+    )
+    parser.add_argument(
+        "--stats", metavar="PATH",
+        help="save stage timings, per-file parse times and peak memory as JSON",
+    )
+    parser.add_argument(
+        "--cprofile", action="store_true",
+        help="also capture a cProfile (saved next to --stats as .prof) and per-stage "
+             "Python memory peaks; slows the run down",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print errors and the summary")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    files = collect_input_files(args.inputs)
+    if not files:
+        print("No input .xlsx files found.", file=sys.stderr)
+        return 1
+
+    profiles = None
+    if args.tolerance_profile or args.save_profile:
+        profiles = ToleranceStore(args.profiles)
+        if profiles.load_error:
+            print(f"Failed to read tolerance profiles {args.profiles}: {profiles.load_error}", file=sys.stderr)
+            return 1
+    if args.tolerances:
+        try:
+            tolerance_dict = load_tolerance_file(args.tolerances)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Failed to read tolerance file {args.tolerances}: {e}", file=sys.stderr)
+            return 1
+    elif args.save_profile:
+        print("--save-profile needs --tolerances.", file=sys.stderr)
+        return 1
+    elif args.tolerance_profile != "auto":
+        tolerance_dict = profiles.get(args.tolerance_profile)
+        if tolerance_dict is None:
+            print(f"No tolerance profile named {args.tolerance_profile!r} in {args.profiles}.", file=sys.stderr)
+            return 1
+        if incomplete_columns(tolerance_dict):
+            print(profile_incomplete_message(args.tolerance_profile, tolerance_dict), file=sys.stderr)
+            return 1
+    else:
+        # Matched once the reports' columns are known
+        tolerance_dict = None
+
+    chunk_size = args.chunk_rows or args.chunk_ids
+    chunk_by = "ids" if args.chunk_ids else "rows"
+    if args.split_files and not chunk_size:
+        print("--split-files needs --chunk-rows or --chunk-ids.", file=sys.stderr)
+        return 1
+
+    output_path = args.output or f"{args.title.replace(' ', '_')}.xlsx"
+    total = len(files)
+    step = max(1, total // 20)
+
+    def progress(done, total, path):
+        if not args.quiet and (done % step == 0 or done == total):
+            print(f"  parsed {done}/{total} files", file=sys.stderr)
+
+    store = ParseStore(args.disk_cache) if args.disk_cache else None
+    if store is not None and not store.available:
+        print(f"Disk cache {args.disk_cache} unavailable; parsing all files.", file=sys.stderr)
+
+    stats = RunStats(profile=args.cprofile, label=output_path)
+    with stats.recording():
+        started = time.perf_counter()
+        consolidator = Consolidator(
+            files, tolerance_dict, max_workers=args.workers, progress=progress, store=store
+        ).run()
+        if tolerance_dict is None:
+            profile_name = profiles.match(consolidator.table.measurement_names)
+            if profile_name is None:
+                print(f"No tolerance profile in {args.profiles} matches the reports' columns.", file=sys.stderr)
+                return 1
+            if not args.quiet:
+                print(f"Using tolerance profile '{profile_name}'", file=sys.stderr)
+            tolerance_dict = profiles.get(profile_name)
+            if incomplete_columns(tolerance_dict):
+                print(profile_incomplete_message(profile_name, tolerance_dict), file=sys.stderr)
+                return 1
+            consolidator.validate(tolerance_dict)
+        if args.save_profile:
+            # Indexed by the batch's columns, so 'auto' finds it for the next batch of this program
+            try:
+                profiles.save(args.save_profile, tolerance_dict, consolidator.table.measurement_names)
+            except (OSError, ValueError) as e:
+                print(f"Failed to save tolerance profile {args.save_profile}: {e}", file=sys.stderr)
+                return 1
+            if not args.quiet:
+                print(f"Tolerance profile '{args.save_profile}' saved to {args.profiles}", file=sys.stderr)
+        parsed_at = time.perf_counter()
+
+        report_args = dict(
+            files=[],
+            all_headers={},
+            all_data={},
+            tolerance_dict=tolerance_dict,
+            table=consolidator.table,
+            output_path=output_path,
+            creator=args.creator,
+            report_title=args.title,
+            chunk_size=chunk_size,
+            chunk_by=chunk_by,
+        )
+        if args.split_files:
+            outpaths = export_master_report_parts(max_workers=args.workers, **report_args)
+        else:
+            outpaths = [export_master_report(**report_args)]
+        finished = time.perf_counter()
+        data_path = None
+        if args.data:
+            data_path = export_master_data(
+                consolidator.table, tolerance_dict, args.data, creator=args.creator, report_title=args.title
+            )
+        data_written = time.perf_counter()
+
+    parse_time = parsed_at - started
+    rate = total / parse_time if parse_time > 0 else 0.0
+    failed = consolidator.validation.get("Final Status", []).count("FAIL")
+    for name, error in consolidator.parse_errors:
+        print(f"Skipped {name}: {error}", file=sys.stderr)
+    for outpath in outpaths:
+        print(f"Master report saved to: {outpath}")
+    if data_path:
+        print(f"Data saved to: {data_path}")
+    print(
+        f"Files: {total} ({len(consolidator.parse_errors)} skipped) | "
+        f"Rows: {len(consolidator.table)} ({failed} failing) | "
+        f"Parse+validate: {parse_time:.2f}s ({rate:.1f} files/s) | "
+        f"Write: {finished - parsed_at:.2f}s"
+        + (f" | Data: {data_written - finished:.2f}s" if data_path else "")
+        + f" | Total: {data_written - started:.2f}s"
+    )
+    if (args.stats or args.cprofile) and not args.quiet:
+        print(stats.format(), file=sys.stderr)
+    if args.stats:
+        print(f"Stats saved to: {stats.save(args.stats)}")
+    return 0
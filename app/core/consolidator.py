@@ -0,0 +1,335 @@
+# consolidator.py
+
+import os
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from app.core.instrumentation import stage
+from app.core.naming import map_symbol
+from app.core.parser import ParseCache, parse_reports
+from app.core.table import FIXED_COLUMNS, FINAL_STATUS_COLUMN, ColumnStore
+from app.core.validator import check_column
+
+
+def source_id_from_path(file_path):
+    """'C:/reports/1042.xlsx' -> '1042'"""
+    return os.path.basename(file_path).replace(".xlsx", "").replace(".xls", "")
+
+
+def runtime_key(runtime_at):
+    """Sort key for a report runtime datetime: earliest first, reports without one last."""
+    return (0, runtime_at) if runtime_at is not None else (1, datetime.min)
+
+
+def file_id_key(source_id):
+    """Sort key: numeric file IDs first in numeric order, then other IDs alphabetically."""
+    try:
+        return (0, int(source_id), "")
+    except (ValueError, TypeError):
+        return (1, 0, str(source_id))
+
+
+class ColumnRegistry:
+    """
+    Ordered set of master measurement columns. Each canonical column name
+    (map_symbol of the raw type name) gets a fixed integer slot the first
+    time it is seen, so rows can be filled by index and map_symbol runs once
+    per distinct raw name rather than once per cell. Slots are reference
+    counted by the files using them; a slot no file uses is left out of
+    active() but keeps its position should the column come back.
+    """
+
+    # Distinct column layouts remembered by layout(); reports from one
+    # program mostly share a handful
+    LAYOUT_CACHE_SIZE = 256
+
+    def __init__(self):
+        self.names = []   # slot -> canonical column name
+        self._slots = {}  # raw or canonical name -> slot
+        self._refs = np.zeros(64, dtype=np.int64)  # slot -> number of files having the column
+        self._layouts = {}
+
+    def slot(self, raw_name):
+        """Slot for a raw column name, registering the column if it is new."""
+        slot = self._slots.get(raw_name)
+        if slot is None:
+            name = map_symbol(raw_name)
+            slot = self._slots.get(name)
+            if slot is None:
+                slot = len(self.names)
+                self.names.append(name)
+                self._slots[name] = slot
+                if slot == len(self._refs):
+                    self._refs = np.concatenate([self._refs, np.zeros_like(self._refs)])
+            self._slots[raw_name] = slot
+        return slot
+
+    def layout(self, col_names):
+        """
+        Slots for one file's columns: (int32 slot array, keep), where keep lists
+        the positions of col_names to store (a column repeated within a file keeps
+        its last value), or is None when every column is distinct.
+        """
+        key = tuple(col_names)
+        layout = self._layouts.get(key)
+        if layout is None:
+            last = {}
+            for pos, name in enumerate(key):
+                last[self.slot(name)] = pos
+            keep = None if len(last) == len(key) else list(last.values())
+            layout = (np.array(list(last), dtype=np.int32), keep)
+            if len(self._layouts) >= self.LAYOUT_CACHE_SIZE:
+                self._layouts.clear()
+            self._layouts[key] = layout
+        return layout
+
+    def find(self, name):
+        """Slot of an existing column by its canonical name, or None."""
+        slot = self._slots.get(name)
+        if slot is None or self.names[slot] != name:
+            return None
+        return slot
+
+    def acquire(self, slots):
+        """Count one more file using each of the (distinct) slots."""
+        self._refs[slots] += 1
+
+    def release(self, slots):
+        self._refs[slots] -= 1
+
+    def active(self):
+        """Slots used by at least one file, in first-seen order."""
+        return np.flatnonzero(self._refs[:len(self.names)]).tolist()
+
+
+MasterEntry = namedtuple("MasterEntry", ["key", "order", "source_id", "runtime", "runtime_at", "row", "slots"])
+MasterEntry.__doc__ = """
+One file's row in the master table.
+    key:       ParseCache.key_for() of the file when it was parsed (detects edits on disk)
+    order:     (file_id_key, runtime_key, sequence, path) sort position of the row
+    source_id: file ID shown in the Source_File column
+    runtime:   report runtime string
+    runtime_at: report runtime as a datetime (or None)
+    row:       the file's row in the Consolidator's ColumnStore
+    slots:     int32 array of ColumnRegistry slots of the file's measurement columns
+"""
+
+
+class Consolidator:
+    """
+    Builds the master table (columns, rows and validation results) from a
+    set of input reports. Has no GUI dependency, so it can be used from the
+    PyQt window, command-line batch runs and benchmarks alike.
+
+    The table is maintained incrementally: add_files(), remove_files() and
+    sync() only parse and validate the files that were added or changed on
+    disk, and keep the column union (a ColumnRegistry) and the row order
+    (a sorted list) up to date without a rebuild. Cells are stored by
+    column (see app.core.table); table, master_colnames, master_rows and
+    validation are assembled on first access after a change.
+
+    Raw type names that map to the same canonical column (e.g. "Diameter 1"
+    and "Diameter 1 (mm)") share one master column. Columns keep the
+    position where they were first seen; a column is left out while no
+    file has it.
+
+    Usage:
+        c = Consolidator(paths, tolerance_dict).run()
+        c.table                                   # columnar MasterTable
+        c.master_colnames, c.master_rows, c.validation
+    """
+
+    def __init__(self, file_paths=(), tolerance_dict=None, max_workers=None, progress=None, store=None):
+        self.file_paths = list(dict.fromkeys(file_paths))
+        self.tolerance_dict = dict(tolerance_dict or {})
+        self.max_workers = max_workers
+        # Optional callable(done, total, file_path), called as each file is parsed
+        self.progress = progress
+        # Optional persistent ParseStore shared across sessions
+        self.store = store
+        self._entries = {}      # file path -> MasterEntry
+        self._errors = {}       # file path -> parse error
+        self.columns = ColumnRegistry()
+        self.cells = ColumnStore()
+        self._order = []        # sorted MasterEntry.order tuples
+        self._sequence = 0
+        self._table = None      # cached MasterTable snapshot
+        self._rows = None       # cached master_rows
+        self._validation = None
+
+    def run(self):
+        """Parse all files, build the master table and validate it. Returns self."""
+        return self.sync(self.file_paths)
+
+    def sync(self, file_paths):
+        """
+        Make the table match file_paths: drop files no longer listed, and
+        (re)parse files that are new or were modified since they were parsed.
+        Failed files are retried on every sync. Returns self.
+        """
+        file_paths = list(dict.fromkeys(file_paths))
+        wanted = set(file_paths)
+        self.remove_files([path for path in self._entries if path not in wanted])
+        self._errors = {path: error for path, error in self._errors.items() if path in wanted}
+        self.file_paths = file_paths
+        stale = [
+            path for path in file_paths
+            if path not in self._entries or self._entries[path].key != ParseCache.key_for(path)
+        ]
+        self._parse(stale)
+        return self
+
+    def add_files(self, file_paths):
+        """Parse and add files not in the table yet. Returns self."""
+        new = [path for path in dict.fromkeys(file_paths) if path not in self.file_paths]
+        self.file_paths.extend(new)
+        self._parse(new)
+        return self
+
+    def remove_files(self, file_paths):
+        """Drop files from the table; nothing is re-parsed or re-validated. Returns self."""
+        removed = set()
+        for path in file_paths:
+            self._errors.pop(path, None)
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                continue
+            removed.add(path)
+            idx = bisect_left(self._order, entry.order)
+            del self._order[idx]
+            self.columns.release(entry.slots)
+            self.cells.remove(entry.row, entry.slots)
+        if removed:
+            self.file_paths = [path for path in self.file_paths if path not in removed]
+            self._changed()
+        return self
+
+    def _changed(self):
+        self._table = self._rows = self._validation = None
+
+    def _parse(self, file_paths):
+        if not file_paths:
+            return
+        # Re-parsed files replace their old rows
+        self.remove_files([path for path in file_paths if path in self._entries])
+        with stage("parse"):
+            parsed = parse_reports(file_paths, self.max_workers, self.progress, store=self.store)
+        self.build(parsed)
+
+    def build(self, parsed):
+        """
+        Add parse_reports() output to the master table and validate the new rows.
+        Columns are the union of all files' columns in first-seen order;
+        rows are sorted by file ID, then runtime.
+        """
+        added = []
+        with stage("align columns"):
+            for filepath, report, error in parsed:
+                if error:
+                    self._errors[filepath] = error
+                    continue
+                self._errors.pop(filepath, None)
+                source_id = source_id_from_path(filepath)
+                slots, keep = self.columns.layout(report.col_names)
+                values = report.values if keep is None else [report.values[pos] for pos in keep]
+                self.columns.acquire(slots)
+                self._sequence += 1
+                order = (file_id_key(source_id), runtime_key(report.runtime_at), self._sequence, filepath)
+                insort(self._order, order)
+                self._entries[filepath] = MasterEntry(
+                    ParseCache.key_for(filepath), order, source_id, report.runtime, report.runtime_at,
+                    self.cells.add(slots, values), slots,
+                )
+                added.append(filepath)
+        with stage("validate"):
+            self._validate_entries(added)
+        self._changed()
+        return self
+
+    def validate(self, tolerance_dict=None):
+        """(Re)validate the master rows, optionally against new tolerances."""
+        if tolerance_dict is not None and dict(tolerance_dict) != self.tolerance_dict:
+            self.tolerance_dict = dict(tolerance_dict)
+            with stage("validate"):
+                for matrix in (self.cells.passed, self.cells.failed, self.cells.row_failed):
+                    matrix[...] = False
+                self._validate_entries(list(self._entries))
+            self._changed()
+        return self.validation
+
+    def _validate_entries(self, file_paths):
+        """Validate the rows of the given files only; rows are independent of each other."""
+        if not file_paths:
+            return
+        rows = np.array([self._entries[path].row for path in file_paths], dtype=np.intp)
+        cells = self.cells
+        for col, entry in self.tolerance_dict.items():
+            slot = self.columns.find(col)
+            if slot is None or col == FINAL_STATUS_COLUMN:
+                continue
+            values, valid, others = cells.column(slot, rows)
+            cells.passed[slot, rows], cells.failed[slot, rows] = check_column(values, valid, others, entry)
+        cells.row_failed[rows] = cells.failed[:, rows].any(axis=0)
+
+    @property
+    def table(self):
+        """The master table as a columnar MasterTable, rows sorted by file ID (then runtime)."""
+        if self._table is None:
+            with stage("table snapshot"):
+                active = self.columns.active()
+                entries = [self._entries[order[-1]] for order in self._order]
+                self._table = self.cells.snapshot(
+                    [self.columns.names[slot] for slot in active], active,
+                    [entry.row for entry in entries],
+                    [entry.source_id for entry in entries],
+                    [entry.runtime for entry in entries],
+                    [entry.runtime_at for entry in entries],
+                )
+        return self._table
+
+    @property
+    def master_colnames(self):
+        return self.table.colnames
+
+    @property
+    def master_rows(self):
+        """The table as row lists (numbers as floats, blanks as ""); built on demand."""
+        if self._rows is None:
+            self._rows = self.table.to_rows()
+        return self._rows
+
+    @property
+    def validation(self):
+        """
+        {col_name: ["PASS"/"FAIL"/"", ...]} per row; "Final Status" holds
+        "PASS"/"FAIL" for the whole row.
+        """
+        if self._validation is None:
+            table = self.table
+            status = np.full(table.passed.shape, "", dtype=object)
+            status[table.passed] = "PASS"
+            status[table.failed] = "FAIL"
+            validation = {col: [""] * len(table) for col in FIXED_COLUMNS}
+            validation.update(zip(table.measurement_names, status.tolist()))
+            validation[FINAL_STATUS_COLUMN] = np.where(table.row_failed, "FAIL", "PASS").tolist()
+            self._validation = validation
+        return self._validation
+
+    def measurement_counts(self):
+        """{file path: number of measurement columns} for the files in the table."""
+        return {path: len(entry.slots) for path, entry in self._entries.items()}
+
+    def file_errors(self):
+        """{file path: parse error} for listed files that could not be parsed."""
+        return dict(self._errors)
+
+    @property
+    def parse_errors(self):
+        """[(file name, error)] for listed files that could not be parsed."""
+        return [
+            (os.path.basename(path), self._errors[path])
+            for path in self.file_paths if path in self._errors
+        ]
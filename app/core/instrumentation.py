@@ -0,0 +1,248 @@
+# instrumentation.py
+"""
+Stage timers, per-file parse durations, peak memory and optional cProfile
+capture for one consolidation/export run.
+
+    stats = RunStats(profile=True)
+    with stats.recording():
+        ... Consolidator(...).run(); export_master_report(...) ...
+    print(stats.format())
+    stats.save("export_stats.json")
+
+Pipeline code marks its stages with `with stage("validate"):`; that is a
+no-op unless a RunStats is recording in the current thread, so the markers
+cost nothing in normal runs. Stages nest ("export/save workbook").
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import platform
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: no process peak RSS
+    resource = None
+
+# Functions listed from the cProfile capture
+PROFILE_TOP = 30
+# Slowest files kept in the summary text
+SLOWEST_FILES = 10
+
+# Per-stage memory peaks need tracemalloc.reset_peak() (Python 3.9+)
+_STAGE_PEAKS = hasattr(tracemalloc, "reset_peak")
+
+_local = threading.local()
+
+
+def current():
+    """RunStats recording in this thread, or None."""
+    return getattr(_local, "stats", None)
+
+
+def stage(name):
+    """Context manager timing a pipeline stage into the current RunStats (no-op without one)."""
+    stats = current()
+    return nullcontext() if stats is None else stats.stage(name)
+
+
+def timed(name):
+    """Decorator: run the function as a stage (see stage())."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record_file(file_path, seconds, source="parsed"):
+    """Record one file's parse duration (source: 'parsed', 'cache' or 'store')."""
+    stats = current()
+    if stats is not None:
+        stats.add_file(file_path, seconds, source)
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+class RunStats:
+    """
+    Measurements of one run. Record with `with stats.recording():` in the
+    thread doing the work.
+
+    Args:
+        profile: capture a cProfile of the recording thread, and trace Python
+            memory (per-stage peaks) with tracemalloc; both slow the run down
+        label: free text stored with the results (e.g. the output path)
+    """
+
+    def __init__(self, profile=False, label=None):
+        self.profile = profile
+        self.label = label
+        self.started_at = None
+        self.total_seconds = 0.0
+        self.stages = {}          # "parent/child" path -> [seconds, calls, peak traced MB or None]
+        self.files = []           # (file path, seconds, source)
+        self.peak_traced_mb = None
+        self.peak_rss_mb = None
+        self.profile_stats = None  # pstats.Stats
+        self._stack = []          # [path, peak traced bytes] of open stages
+
+    @contextmanager
+    def recording(self):
+        previous = current()
+        _local.stats = self
+        self.started_at = datetime.now()
+        started = time.perf_counter()
+        own_trace = self.profile and not tracemalloc.is_tracing()
+        if own_trace:
+            tracemalloc.start()
+        profiler = cProfile.Profile() if self.profile else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profile_stats = pstats.Stats(profiler)
+            if tracemalloc.is_tracing() and self.profile:
+                self.peak_traced_mb = tracemalloc.get_traced_memory()[1] / 1e6
+                if own_trace:
+                    tracemalloc.stop()
+            self.total_seconds += time.perf_counter() - started
+            self.peak_rss_mb = _peak_rss_mb()
+            _local.stats = previous
+
+    @contextmanager
+    def stage(self, name):
+        tracing = self.profile and _STAGE_PEAKS and tracemalloc.is_tracing()
+        path = f"{self._stack[-1][0]}/{name}" if self._stack else name
+        if tracing:
+            # Fold the peak so far into the open stages before restarting it
+            peak = tracemalloc.get_traced_memory()[1]
+            for entry in self._stack:
+                entry[1] = max(entry[1], peak)
+            tracemalloc.reset_peak()
+        record = self.stages.setdefault(path, [0.0, 0, None])  # listed in the order stages start
+        entry = [path, 0]
+        self._stack.append(entry)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self._stack.pop()
+            record[0] += seconds
+            record[1] += 1
+            if tracing:
+                peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                record[2] = max(record[2] or 0.0, peak / 1e6)
+
+    def add_file(self, file_path, seconds, source="parsed"):
+        self.files.append((file_path, seconds, source))
+
+    def to_dict(self):
+        """JSON-serialisable summary."""
+        parsed = [seconds for _, seconds, source in self.files if source == "parsed"]
+        result = {
+            "label": self.label,
+            "started": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "total_seconds": self.total_seconds,
+            "peak_rss_mb": self.peak_rss_mb,
+            "peak_traced_mb": self.peak_traced_mb,
+            "stages": [
+                {"stage": path, "seconds": seconds, "calls": calls, "peak_traced_mb": peak}
+                for path, (seconds, calls, peak) in self.stages.items()
+            ],
+            "files": {
+                "parsed": len(parsed),
+                "cached": sum(1 for _, _, source in self.files if source != "parsed"),
+                "parse_seconds_total": sum(parsed),
+                "parse_seconds_max": max(parsed, default=0.0),
+                "durations": [
+                    {"file": os.path.basename(path), "seconds": seconds, "source": source}
+                    for path, seconds, source in self.files
+                ],
+            },
+        }
+        if self.profile_stats is not None:
+            result["profile"] = self.profile_top()
+        return result
+
+    def profile_top(self, limit=PROFILE_TOP):
+        """[{function, calls, tottime, cumtime}] of the most expensive functions (by cumulative time)."""
+        if self.profile_stats is None:
+            return []
+        rows = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in self.profile_stats.stats.items():
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({func})",
+                "calls": calls, "tottime": tottime, "cumtime": cumtime,
+            })
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        return rows[:limit]
+
+    def save(self, path):
+        """Write to_dict() as JSON; with a profile, also a <name>.prof file for snakeviz/pstats."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        if self.profile_stats is not None:
+            self.profile_stats.dump_stats(os.path.splitext(path)[0] + ".prof")
+        return path
+
+    def format(self):
+        """Plain-text summary for display."""
+        out = io.StringIO()
+        out.write(f"Total: {self.total_seconds:.2f}s")
+        if self.peak_rss_mb is not None:
+            out.write(f" | Peak memory: {self.peak_rss_mb:.0f} MB")
+        if self.peak_traced_mb is not None:
+            out.write(f" (Python objects: {self.peak_traced_mb:.0f} MB)")
+        out.write("\n\nStage                              Time      Calls")
+        if self.peak_traced_mb is not None:
+            out.write("   Peak")
+        out.write("\n")
+        for path, (seconds, calls, peak) in self.stages.items():
+            name = "  " * path.count("/") + path.rsplit("/", 1)[-1]
+            out.write(f"{name:<32} {seconds:8.3f}s {calls:8d}")
+            if peak is not None:
+                out.write(f" {peak:6.0f} MB")
+            out.write("\n")
+
+        parsed = [(seconds, path) for path, seconds, source in self.files if source == "parsed"]
+        cached = len(self.files) - len(parsed)
+        if self.files:
+            out.write(f"\nFiles: {len(parsed)} parsed, {cached} from cache")
+            if parsed:
+                total = sum(seconds for seconds, _ in parsed)
+                out.write(f" | parse time {total:.2f}s total, {total / len(parsed) * 1000:.0f} ms/file\n")
+                out.write("Slowest files:\n")
+                for seconds, path in sorted(parsed, reverse=True)[:SLOWEST_FILES]:
+                    out.write(f"  {os.path.basename(path):<40} {seconds * 1000:8.0f} ms\n")
+            else:
+                out.write("\n")
+
+        if self.profile_stats is not None:
+            out.write("\nProfile (top functions by cumulative time):\n")
+            for row in self.profile_top(20):
+                out.write(f"  {row['cumtime']:8.3f}s {row['tottime']:8.3f}s {row['calls']:9d}  {row['function']}\n")
+        return out.getvalue()
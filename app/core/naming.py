@@ -0,0 +1,63 @@
+# naming.py
+"""
+Canonical measurement column names.
+
+Input reports name measurements by type ('Diameter 1', 'Angle 2'); the
+master report and tolerance tables show them with their unit symbol
+('Diameter 1 (mm)', 'Angle 2 (°)'), and that display header is also the
+key of the tolerance dict. Both directions are memoized: a session sees a
+few hundred distinct names but millions of cells, so hot loops only pay
+for a dictionary lookup.
+"""
+
+import re
+from functools import lru_cache
+
+# Checked in order; the first keyword found in a type name decides its unit
+UNIT_SYMBOLS = (
+    ("Distance", "mm"),
+    ("Diameter", "mm"),
+    ("Concentricity", "⟳"),
+    ("Angle", "°"),
+)
+UNIT_SUFFIXES = tuple(dict.fromkeys(f" ({symbol})" for _, symbol in UNIT_SYMBOLS))
+_UNIT_MARKERS = tuple(suffix.strip() for suffix in UNIT_SUFFIXES)
+# Occurrence number the parser appends to repeated types ('Diameter 2')
+_OCCURRENCE = re.compile(r"\s+\d+$")
+
+# Bounds memory if a caller feeds arbitrary strings through
+_NAME_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=_NAME_CACHE_SIZE)
+def map_symbol(name):
+    """
+    Map a measurement type name to its display header (with unit).
+    E.g., 'Diameter 1' -> 'Diameter 1 (mm)'; names already carrying a unit are unchanged.
+    """
+    if any(marker in name for marker in _UNIT_MARKERS):
+        return name
+    for keyword, symbol in UNIT_SYMBOLS:
+        if keyword in name:
+            return f"{name} ({symbol})"
+    return name
+
+
+@lru_cache(maxsize=_NAME_CACHE_SIZE)
+def strip_unit_symbols(name):
+    """
+    Remove unit symbols from a column name.
+    E.g., 'Diameter 1 (mm)' -> 'Diameter 1'
+    """
+    for suffix in UNIT_SUFFIXES:
+        name = name.replace(suffix, "")
+    return name.strip()
+
+
+@lru_cache(maxsize=_NAME_CACHE_SIZE)
+def measurement_type(name):
+    """
+    Measurement type of a column name, without occurrence number or unit.
+    E.g., 'Diameter 12 (mm)' -> 'Diameter'
+    """
+    return _OCCURRENCE.sub("", strip_unit_symbols(name))
@@ -0,0 +1,142 @@
+# parse_store.py
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+
+# Bump whenever ParsedReport or the parsing rules change: older entries are ignored
+PARSE_STORE_VERSION = 4
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache", "parse_cache.sqlite3",
+)
+DEFAULT_STORE_BYTES = 512 * 1024 * 1024
+
+# SQLite limits the number of bound parameters per statement
+_BATCH = 500
+
+
+def file_digest(file_path):
+    """SHA-1 of the file contents, or None if it can't be read."""
+    digest = hashlib.sha1()
+    try:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ParseStore:
+    """
+    Persistent cache of parsed reports in a SQLite file, keyed on the SHA-1 of
+    the workbook contents, so a renamed, copied or re-saved-but-identical file
+    still hits and an edited file misses. Entries from other store versions are
+    ignored and replaced. The least recently used entries are evicted once the
+    stored payloads exceed max_bytes.
+
+    A broken or unwritable cache file never fails a consolidation: errors
+    are treated as cache misses.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_bytes=DEFAULT_STORE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.available = True
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS reports ("
+                    " digest TEXT PRIMARY KEY,"
+                    " version INTEGER NOT NULL,"
+                    " payload BLOB NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS reports_last_used ON reports (last_used)")
+        except (OSError, sqlite3.Error):
+            self.available = False
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    key_for = staticmethod(file_digest)
+
+    def get_many(self, digests):
+        """Returns {digest: tuple of ParsedReport fields} for the digests found."""
+        found = {}
+        digests = [d for d in set(digests) if d]
+        if not self.available or not digests:
+            return found
+        try:
+            with closing(self._connect()) as conn, conn:
+                for start in range(0, len(digests), _BATCH):
+                    chunk = digests[start:start + _BATCH]
+                    marks = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT digest, payload FROM reports WHERE version = ? AND digest IN ({marks})",
+                        [PARSE_STORE_VERSION] + chunk,
+                    ).fetchall()
+                    for digest, payload in rows:
+                        found[digest] = pickle.loads(zlib.decompress(payload))
+                    if rows:
+                        conn.executemany(
+                            "UPDATE reports SET last_used = ? WHERE digest = ?",
+                            [(time.time(), digest) for digest, _ in rows],
+                        )
+        except (sqlite3.Error, pickle.UnpicklingError, zlib.error, EOFError):
+            return {}
+        return found
+
+    def put_many(self, items):
+        """Store [(digest, tuple of ParsedReport fields), ...], then evict down to max_bytes."""
+        if not self.available:
+            return
+        now = time.time()
+        rows = []
+        for digest, fields in items:
+            if not digest:
+                continue
+            payload = zlib.compress(pickle.dumps(tuple(fields), pickle.HIGHEST_PROTOCOL))
+            rows.append((digest, PARSE_STORE_VERSION, payload, len(payload), now))
+        if not rows:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)", rows)
+                self._evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn):
+        conn.execute("DELETE FROM reports WHERE version != ?", (PARSE_STORE_VERSION,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        stale = []
+        for digest, size in conn.execute("SELECT digest, size FROM reports ORDER BY last_used"):
+            stale.append((digest,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM reports WHERE digest = ?", stale)
+
+    def clear(self):
+        """Delete every entry and give the space back to the file system."""
+        if not self.available:
+            return
+        try:
+            with closing(self._connect()) as conn:
+                with conn:
+                    conn.execute("DELETE FROM reports")
+                conn.execute("VACUUM")
+        except sqlite3.Error:
+            pass
@@ -1,29 +1,320 @@
 # parser.py
 
-import openpyxl
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from app.core.instrumentation import record_file, stage
+from app.core.naming import map_symbol
+from app.io.excel_reader import is_header_row, iter_sheet_rows, iter_type_values, read_header_and_sample
+
+# Below this many files, worker start-up costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+# Default memory budget of the in-session parse cache
+DEFAULT_PARSE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Number of leading rows/columns scanned for the report runtime stamp
+RUNTIME_SCAN_ROWS = 20
+RUNTIME_SCAN_COLS = 14
+
+ParsedReport = namedtuple(
+    "ParsedReport", ["headers", "sample", "col_names", "values", "runtime", "runtime_at"]
+)
+ParsedReport.__doc__ = """
+Everything the app needs from one input workbook, read in a single pass.
+    headers:    header row tuple containing 'Type' and 'Value' (or None)
+    sample:     first non-empty data row after the header (or None)
+    col_names:  measurement column names ('Type 1', 'Type 2', ...) in input order
+    values:     measurement values aligned with col_names
+    runtime:    runtime timestamp as shown in the report ("" if none found)
+    runtime_at: the runtime as a datetime (None if none found)
+"""
+
+SchemaScan = namedtuple("SchemaScan", ["columns", "counts", "files", "errors"])
+SchemaScan.__doc__ = """
+Measurement columns found across many input files (see scan_schema).
+    columns: union of the display column names ('Diameter 1 (mm)'), in first-seen order
+    counts:  {column: number of files that have it}
+    files:   number of files read
+    errors:  [(file path, error)] for files that could not be read
+"""
+
+# Field order of numeric slash/dash dates such as 02/12/2025 or 02-12-2025:
+# month first (US) unless set. A date whose fields are out of range for that
+# order (25/12/2025) is read the other way round.
+RUNTIME_DAY_FIRST = False
+
+# Date-time layouts written by our CMMs. The time part is required, so
+# part numbers and plain dates ("12-05-2024") are not taken for a runtime.
+# Times are H:MM[:SS]; '.' separates them only when seconds or AM/PM follow
+# (10.30.15, 10.30 PM), so a decimal next to a date ("... 2024 3.50") is not a time.
+_TIME = (
+    r"[ T,]+(?P<H>\d{1,2})(?:(?P<colon>:)|\.(?=\d{2}(?:\.\d{2}|\s*[AaPp]\.?[Mm])))(?P<M>\d{2})"
+    r"(?:(?(colon):|\.)(?P<S>\d{2}))?(?:[.,]\d+)?(?:\s*(?P<p>[AaPp])\.?[Mm]\.?)?"
+)
+_MONTH = r"(?P<b>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?"
+RUNTIME_PATTERNS = [
+    re.compile(pattern + _TIME, re.IGNORECASE)
+    for pattern in (
+        r"(?P<Y>\d{4})[-/.](?P<m>\d{1,2})[-/.](?P<d>\d{1,2})",              # 2025-12-02 10:30:00, 2025/12/02 10.30.00
+        r"(?P<d>\d{1,2})\.(?P<m>\d{1,2})\.(?P<Y>\d{4}|\d{2})",             # 02.12.2025 10:30
+        r"(?P<x>\d{1,2})(?P<sep>[/-])(?P<y>\d{1,2})(?P=sep)(?P<Y>\d{4}|\d{2})",  # 12/2/2025 10:30:00 AM, 02-12-2025 10:30
+        r"(?P<d>\d{1,2})[ -]" + _MONTH + r"[-, ]+(?P<Y>\d{4})",              # 02 Dec 2025 10:30, 2-Dec-2025 10:30
+        _MONTH + r" (?P<d>\d{1,2}),? (?P<Y>\d{4})",                          # Dec 2, 2025 10:30 AM
+    )
+]
+_MONTHS = {name: idx for idx, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+
+
+def _match_datetime(match):
+    """datetime from a RUNTIME_PATTERNS match, or None if the fields are out of range."""
+    fields = match.groupdict()
+    year = int(fields["Y"])
+    if year < 100:
+        year += 2000
+    if fields.get("b"):
+        dates = [(_MONTHS[fields["b"][:3].lower()], int(fields["d"]))]
+    elif fields.get("x"):
+        # (month, day) in the configured order first, then swapped
+        first, second = int(fields["x"]), int(fields["y"])
+        dates = [(second, first), (first, second)] if RUNTIME_DAY_FIRST else [(first, second), (second, first)]
+    else:
+        dates = [(int(fields["m"]), int(fields["d"]))]
+    hour = int(fields["H"])
+    if fields["p"]:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if fields["p"].lower() == "p" else 0)
+    for month, day in dates:
+        try:
+            return datetime(year, month, day, hour, int(fields["M"]), int(fields["S"] or 0))
+        except ValueError:
+            continue
+    return None
+
+
+def _search_runtime(value):
+    """
+    Match a text cell against RUNTIME_PATTERNS.
+    Returns: (looks like a runtime stamp, datetime or None if it could not be parsed)
+    """
+    # Cheapest reject first: every pattern needs a digit, a time separator and 8+ characters
+    if len(value) < 8 or (":" not in value and "." not in value):
+        return False, None
+    matched = False
+    for pattern in RUNTIME_PATTERNS:
+        match = pattern.search(value)
+        if match:
+            matched = True
+            parsed = _match_datetime(match)
+            if parsed is not None:
+                return True, parsed
+    return matched, None
+
+
+def _runtime_from_value(val):
+    """
+    (runtime string as shown in the report, datetime) if the cell holds a timestamp:
+    a datetime cell, or text matching one of RUNTIME_PATTERNS anywhere in the string
+    (e.g. "Printed: 2025-12-02 10:30"); else None. A stamp whose date fields cannot
+    be parsed keeps its text with no datetime.
+    """
+    if isinstance(val, datetime):
+        return val.strftime("%Y-%m-%d %H:%M:%S"), val
+    if not isinstance(val, str):
+        return None
+    matched, parsed = _search_runtime(val)
+    if not matched:
+        return None
+    return val.strip(), parsed
+
+
+def find_runtime(rows):
+    """
+    First runtime stamp in the top RUNTIME_SCAN_ROWS x RUNTIME_SCAN_COLS
+    cells of the given rows; reads no further than that.
+    Returns: (runtime string, datetime) or None
+    """
+    for row_idx, row in enumerate(rows):
+        if row_idx >= RUNTIME_SCAN_ROWS:
+            break
+        for val in row[:RUNTIME_SCAN_COLS]:
+            found = _runtime_from_value(val)
+            if found:
+                return found
+    return None
+
+
+def parse_rows(rows):
+    """
+    Parse an iterable of worksheet row tuples (values only) in one pass.
+    Returns: ParsedReport
+    """
+    headers, sample, runtime = None, None, None
+    type_idx, value_idx = None, None
+    measurements = []
+    name_count = {}
+
+    for row_idx, row in enumerate(rows):
+        # Scan first 20 rows / 14 columns for datetime value (created/modified time)
+        if runtime is None and row_idx < RUNTIME_SCAN_ROWS and row:
+            for val in row[:RUNTIME_SCAN_COLS]:
+                runtime = _runtime_from_value(val)
+                if runtime:
+                    break
+
+        # Find header row
+        if headers is None:
+            if is_header_row(row):
+                headers = row
+                type_idx = headers.index("Type")
+                value_idx = headers.index("Value")
+            continue
+
+        if sample is None and row and any(cell is not None for cell in row):
+            sample = row
+
+        # Extract only Type and Value, in sequence
+        if not row or (len(row) <= max(type_idx, value_idx)):
+            continue
+
+        m_type = row[type_idx]
+        m_value = row[value_idx]
+
+        if m_type is None or m_value is None:
+            continue
+
+        m_type = str(m_type).strip()
+        idx = name_count.get(m_type, 0) + 1
+        name_count[m_type] = idx
+        measurements.append((f"{m_type} {idx}", m_value))
+
+    col_names = [t for t, v in measurements]
+    values = [v for t, v in measurements]
+    runtime, runtime_at = runtime or ("", None)
+    return ParsedReport(headers, sample, col_names, values, runtime, runtime_at)
+
+
+def parse_report(file_path, read_only=True):
+    """
+    Open an input Excel file ONCE and extract header, sample row,
+    Type/Value measurements and runtime stamp.
+    Rows are streamed (read-only mode by default), never held all at once.
+    Returns: ParsedReport
+    """
+    return parse_rows(iter_sheet_rows(file_path, read_only=read_only))
+
+
+def _report_size(report):
+    """Rough memory footprint of a ParsedReport in bytes (for cache budgeting)."""
+    size = sys.getsizeof(report)
+    for part in (report.headers, report.sample, report.col_names, report.values):
+        if part:
+            size += sys.getsizeof(part) + sum(sys.getsizeof(item) for item in part)
+    return size + sys.getsizeof(report.runtime) + sys.getsizeof(report.runtime_at)
+
+
+class ParseCache:
+    """
+    In-memory LRU cache of ParsedReport, keyed by (absolute path, size, mtime_ns)
+    so a file that changes on disk is re-read. Least recently used entries are
+    evicted once the estimated size exceeds max_bytes. Thread-safe, since the
+    GUI thread and the export worker both read through it.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PARSE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (ParsedReport, size)
+        self._keys_by_path = {}        # absolute path -> current key
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(file_path):
+        """Cache key for a file, or None if it can't be stat'ed."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), st.st_size, st.st_mtime_ns
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, report):
+        if key is None:
+            return
+        size = _report_size(report)
+        with self._lock:
+            # Drop the entry for an older version of the same file
+            old_key = self._keys_by_path.get(key[0])
+            if old_key is not None:
+                self._remove(old_key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (report, size)
+            self._keys_by_path[key[0]] = key
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        report, size = self._entries.pop(key, (None, 0))
+        self._bytes -= size
+        if self._keys_by_path.get(key[0]) == key:
+            del self._keys_by_path[key[0]]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by everything in this process (GUI session, CLI run)
+parse_cache = ParseCache()
+
+
+def get_parsed_report(file_path, cache=parse_cache):
+    """parse_report() through the parse cache: unchanged files are read only once."""
+    key = cache.key_for(file_path) if cache is not None else None
+    report = cache.get(key) if key is not None else None
+    if report is None:
+        report = parse_report(file_path)
+        if cache is not None:
+            cache.put(key, report)
+    return report
+
+
 def get_headers_and_sample(file_path):
     """
     Detect header row and one data row from input Excel.
     Returns: (headers tuple, sample tuple) or (None, error_string)
     """
     try:
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        headers, sample = None, None
-        
-        for idx, row in enumerate(rows):
-            if row and ("Type" in row and "Value" in row):
-                headers = row
-                for datarow in rows[idx + 1:]:
-                    if datarow and any(cell is not None for cell in datarow):
-                        sample = datarow
-                        break
-                break
-        
-        wb.close()
+        headers, sample = read_header_and_sample(file_path)
         if headers:
             return headers, sample
         else:
@@ -37,55 +328,26 @@ def extract_types_and_values(file_path):
     Dynamically constructs 'Type 1', 'Type 2', etc. as keys in order found.
     Returns: (columns, [values]) for each row (for report table)
     """
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    ws = wb.active
-    rows = list(ws.iter_rows(values_only=True))
-    wb.close()
-    
-    header_idx, type_idx, value_idx = None, None, None
-    
-    # Find header row
-    for idx, row in enumerate(rows):
-        if row and ("Type" in row and "Value" in row):
-            header_idx = idx
-            headers = row
-            try:
-                type_idx = headers.index("Type")
-            except ValueError:
-                type_idx = None
-            try:
-                value_idx = headers.index("Value")
-            except ValueError:
-                value_idx = None
-            break
-    
-    if header_idx is None or type_idx is None or value_idx is None:
-        return [], []
-    
-    # Extract only Type and Value, in sequence
-    measurements = []
-    name_count = {}
-    
-    for row in rows[header_idx + 1:]:
-        if not row or (len(row) <= max(type_idx, value_idx)):
-            continue
-        
-        m_type = row[type_idx]
-        m_value = row[value_idx]
-        
-        if m_type is None or m_value is None:
-            continue
-        
-        m_type = str(m_type).strip()
-        idx = name_count.get(m_type, 0) + 1
-        name_count[m_type] = idx
-        col_name = f"{m_type} {idx}"
-        measurements.append((col_name, m_value))
-    
-    # Return column names (unique, in input order) and row of their values
-    col_names = [t for t, v in measurements]
-    values_row = [v for t, v in measurements]
-    return col_names, values_row
+    report = get_parsed_report(file_path)
+    return report.col_names, report.values
+
+def read_report_runtime(file_path, cache=parse_cache):
+    """
+    Runtime stamp of one input file without parsing the measurements:
+    taken from the parse cache if the file was parsed already, otherwise
+    only the first RUNTIME_SCAN_ROWS rows are streamed from the workbook.
+    Returns: (runtime string, datetime), or ("", None) if there is none
+    """
+    key = cache.key_for(file_path) if cache is not None else None
+    report = cache.get(key) if key is not None else None
+    if report is not None:
+        return report.runtime, report.runtime_at
+    rows = iter_sheet_rows(file_path, max_rows=RUNTIME_SCAN_ROWS)
+    try:
+        return find_runtime(rows) or ("", None)
+    finally:
+        rows.close()
+
 
 def get_report_runtime(file_path):
     """
@@ -93,44 +355,232 @@ def get_report_runtime(file_path):
     Scans for datetime values in cells, returns formatted string.
     """
     try:
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        ws = wb.active
-        
-        runtime = None
-        
-        # Scan first 20 rows for datetime value (created/modified time)
-        for row_idx in range(1, min(21, ws.max_row + 1)):
-            for col_idx in range(1, min(15, ws.max_column + 1)):
-                cell = ws.cell(row=row_idx, column=col_idx)
-                val = cell.value
-                
-                # Check if it's a datetime object
-                if isinstance(val, datetime):
-                    runtime = val.strftime("%Y-%m-%d %H:%M:%S")
-                    break
-                
-                # Check if it's a string that looks like datetime
-                if isinstance(val, str):
-                    val_clean = val.strip()
-                    # Look for date-time patterns
-                    if any(c in val_clean for c in ["/", "-"]) and any(c in val_clean for c in [":", "."]):
-                        runtime = val_clean
-                        break
-            
-            if runtime:
-                break
-        
-        wb.close()
-        return runtime if runtime else ""
-        
+        return read_report_runtime(file_path)[0]
     except Exception:
         return ""
 
-def build_master_row(file_path, source_file):
+def build_master_row(file_path, source_file, report=None):
     """
     For one input file, returns: col_names list and [Source_File, Report_Runtime, (measurement values in order)]
+    Pass an already parsed `report` to avoid reading the workbook again.
+    """
+    if report is None:
+        report = get_parsed_report(file_path)
+    data_row = [source_file, report.runtime] + list(report.values)
+    return report.col_names, data_row
+
+
+def _safe_parse_report(file_path):
+    """
+    Worker entry point: never raises, so one bad file can't abort the batch.
+    Returns: (ParsedReport or None, error or None, seconds spent)
+    """
+    started = time.perf_counter()
+    try:
+        return parse_report(file_path), None, time.perf_counter() - started
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+
+def _map_files(func, file_paths, max_workers, collect):
+    """
+    Run func on every file and hand the results, in input order, to
+    collect(result_iter): in this process for small batches or max_workers=1,
+    otherwise in a process pool (max_workers None = CPU count). If collect
+    raises (e.g. a progress callback canceling), queued work is dropped
+    instead of finished and the exception propagates.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(file_paths))
+    if max_workers <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+        collect(func(path) for path in file_paths)
+        return
+    chunksize = max(1, len(file_paths) // (max_workers * 4))
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        collect(executor.map(func, file_paths, chunksize=chunksize))
+    except BaseException:
+        try:
+            executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:  # Python < 3.9
+            executor.shutdown(wait=False)
+        raise
+    executor.shutdown()
+
+
+def parse_reports(file_paths, max_workers=None, progress=None, cache=parse_cache, store=None):
+    """
+    Parse many input files, in a process pool when the batch is large enough.
+    openpyxl parsing is pure Python and CPU-bound, so processes (not threads)
+    are used to get real parallelism. Files already in the parse cache (and
+    unchanged on disk) are not read again; with a ParseStore, files parsed in
+    earlier sessions are loaded from it instead of being parsed.
+
+    Args:
+        file_paths: list of input file paths
+        max_workers: worker process count (None = CPU count, 1 = parse in this process)
+        progress: optional callable(done, total, file_path) called after each file;
+            an exception raised from it stops the batch and propagates
+        cache: ParseCache to read from and fill (None = always parse)
+        store: optional app.core.parse_store.ParseStore (persistent, content-hash keyed)
+
+    Returns:
+        list of (file_path, ParsedReport or None, error string or None),
+        in the same order as file_paths
     """
-    col_names, values_row = extract_types_and_values(file_path)
-    runtime = get_report_runtime(file_path)
-    data_row = [source_file, runtime] + values_row
-    return col_names, data_row
+    file_paths = list(file_paths)
+    total = len(file_paths)
+    results = [None] * total
+    done = 0
+
+    # Serve unchanged files from the cache; only the rest are parsed
+    pending = []  # (index, cache key)
+    for idx, path in enumerate(file_paths):
+        key = cache.key_for(path) if cache is not None else None
+        report = cache.get(key) if key is not None else None
+        if report is None:
+            pending.append((idx, key))
+            continue
+        results[idx] = (path, report, None)
+        record_file(path, 0.0, "cache")
+        done += 1
+        if progress:
+            progress(done, total, path)
+
+    def finish(idx, key, report, error):
+        nonlocal done
+        path = file_paths[idx]
+        results[idx] = (path, report, error)
+        if report is not None and cache is not None:
+            cache.put(key, report)
+        done += 1
+        if progress:
+            progress(done, total, path)
+
+    # Then the persistent store, by content hash
+    digests = {}
+    if store is not None and pending:
+        with stage("store lookup"):
+            digests = {idx: store.key_for(file_paths[idx]) for idx, _ in pending}
+            stored = store.get_many(digests.values())
+        still_pending = []
+        for idx, key in pending:
+            fields = stored.get(digests[idx])
+            if fields is None:
+                still_pending.append((idx, key))
+            else:
+                record_file(file_paths[idx], 0.0, "store")
+                finish(idx, key, ParsedReport(*fields), None)
+        pending = still_pending
+
+    pending_paths = [file_paths[idx] for idx, _ in pending]
+
+    parsed = []
+
+    def collect(result_iter):
+        try:
+            for (idx, key), (report, error, seconds) in zip(pending, result_iter):
+                record_file(file_paths[idx], seconds)
+                finish(idx, key, report, error)
+                if report is not None and digests.get(idx):
+                    parsed.append((digests[idx], report))
+        finally:
+            # Keep what was parsed, even if the batch was canceled
+            if store is not None and parsed:
+                with stage("store save"):
+                    store.put_many(parsed)
+
+    _map_files(_safe_parse_report, pending_paths, max_workers, collect)
+
+    return results
+
+
+def read_report_columns(file_path):
+    """
+    Measurement column names of one input file, named exactly as
+    parse_report() names them ('Type 1', 'Type 2', ...), from the Type and
+    Value cells only. Falls back to a full parse for workbooks the direct
+    reader can't handle.
+    """
+    try:
+        type_values = list(iter_type_values(file_path))
+    except Exception:
+        return parse_report(file_path).col_names
+    name_count = {}
+    col_names = []
+    for m_type, m_value in type_values:
+        if m_type is None or m_value is None:
+            continue
+        m_type = str(m_type).strip()
+        idx = name_count.get(m_type, 0) + 1
+        name_count[m_type] = idx
+        col_names.append(f"{m_type} {idx}")
+    return col_names
+
+
+def _safe_read_columns(file_path):
+    """Worker entry point: (column names or None, error or None); never raises."""
+    try:
+        return read_report_columns(file_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def scan_schema(file_paths, max_workers=None, progress=None, cache=parse_cache):
+    """
+    Find every measurement column of a batch, with the number of files that
+    have it, reading only the Type/Value cells of each file (a process pool
+    for large batches, as in parse_reports). Files already in the parse
+    cache are not read again.
+
+    Args:
+        file_paths: list of input file paths
+        max_workers: worker process count (None = CPU count, 1 = read in this process)
+        progress: optional callable(done, total, file_path) called after each file;
+            an exception raised from it stops the scan and propagates
+        cache: ParseCache to take already parsed files from (None = read all)
+
+    Returns:
+        SchemaScan
+    """
+    file_paths = list(dict.fromkeys(file_paths))
+    total = len(file_paths)
+    counts = {}
+    errors = []
+    files = 0
+    done = 0
+
+    def add(path, col_names, error):
+        nonlocal files, done
+        if error is not None:
+            errors.append((path, error))
+        else:
+            files += 1
+            for col in dict.fromkeys(map_symbol(name) for name in col_names):
+                counts[col] = counts.get(col, 0) + 1
+        done += 1
+        if progress:
+            progress(done, total, path)
+
+    cached = {}
+    pending_paths = []
+    for path in file_paths:
+        key = cache.key_for(path) if cache is not None else None
+        report = cache.get(key) if key is not None else None
+        if report is None:
+            pending_paths.append(path)
+        else:
+            cached[path] = report.col_names
+
+    def collect(result_iter):
+        # Results arrive in input order, so the union keeps the files' order (as the master table does)
+        for path in file_paths:
+            if path in cached:
+                add(path, cached[path], None)
+            else:
+                add(path, *next(result_iter))
+
+    _map_files(_safe_read_columns, pending_paths, max_workers, collect)
+
+    return SchemaScan(list(counts), counts, files, errors)
@@ -0,0 +1,247 @@
+# table.py
+"""
+Columnar storage for the master table.
+
+A master row holds a file ID, a runtime string and a few hundred
+measurements. Kept as lists of Python objects that is 50-80 bytes per
+measurement; here numbers live in float64 vectors with a validity mask
+(9 bytes per cell) and the rare non-numeric cell ("-", text) is kept
+as-is in a per-column dict.
+"""
+
+import sys
+
+import numpy as np
+
+FIXED_COLUMNS = ["Source_File", "Report_Runtime"]
+FINAL_STATUS_COLUMN = "Final Status"
+
+# Rows per block when turning columns back into row lists
+ROW_BLOCK = 2048
+
+
+def is_number(value):
+    """Cells the report stores as numbers (bools included, as the writer treats them)."""
+    return isinstance(value, (int, float))
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class MasterTable:
+    """
+    Read-only columnar master table, in report row order.
+
+    Attributes:
+        measurement_names: measurement column names (with units)
+        source_ids, runtimes: one value per row (strings are interned)
+        runtime_times: report runtime per row as a datetime (None where unknown)
+        values: float64 matrix (measurement columns x rows)
+        valid: bool matrix, True where values holds the cell's number
+        others: per measurement column, {row: value} for non-numeric cells
+        passed, failed: optional bool matrices like values, with validation results
+        row_failed: optional bool vector, True where any cell of the row failed
+
+    A measurement cell that is neither valid nor in others is blank.
+    """
+
+    def __init__(self, measurement_names, source_ids, runtimes, values=None, valid=None, others=None,
+                 passed=None, failed=None, row_failed=None, runtime_times=None):
+        self.measurement_names = list(measurement_names)
+        self.source_ids = [_intern(v) for v in source_ids]
+        self.runtimes = [_intern(v) for v in runtimes]
+        self.runtime_times = [None] * len(self.source_ids) if runtime_times is None else list(runtime_times)
+        shape = (len(self.measurement_names), len(self.source_ids))
+        self.values = np.zeros(shape) if values is None else values
+        self.valid = np.zeros(shape, dtype=bool) if valid is None else valid
+        self.others = [{} for _ in self.measurement_names] if others is None else others
+        self.passed = passed
+        self.failed = failed
+        self.row_failed = row_failed
+
+    @classmethod
+    def from_rows(cls, colnames, rows):
+        """
+        Build a table from master rows laid out as colnames
+        (Source_File, Report_Runtime, measurements..., Final Status).
+        Short rows are padded with blanks; the Final Status cell is ignored.
+        """
+        names = list(colnames[len(FIXED_COLUMNS):-1])
+        table = cls(names, [row[0] if row else "" for row in rows],
+                    [row[1] if len(row) > 1 else "" for row in rows])
+        offset = len(FIXED_COLUMNS)
+        for r, row in enumerate(rows):
+            for j, value in enumerate(row[offset:offset + len(names)]):
+                table.set_cell(j, r, value)
+        return table
+
+    def __len__(self):
+        return len(self.source_ids)
+
+    @property
+    def colnames(self):
+        return FIXED_COLUMNS + self.measurement_names + [FINAL_STATUS_COLUMN]
+
+    @property
+    def nbytes(self):
+        """Approximate size of the numeric storage."""
+        size = self.values.nbytes + self.valid.nbytes
+        for matrix in (self.passed, self.failed, self.row_failed):
+            if matrix is not None:
+                size += matrix.nbytes
+        return size
+
+    def set_cell(self, col, row, value):
+        """Store a measurement value; "" clears the cell."""
+        self.others[col].pop(row, None)
+        self.valid[col, row] = False
+        if is_number(value):
+            self.values[col, row] = value
+            self.valid[col, row] = True
+        elif value != "":
+            self.others[col][row] = value
+
+    def column_values(self, col):
+        """Cell values of one measurement column, as a list ("" for blanks)."""
+        return self._column_block(col, 0, len(self))
+
+    def _column_block(self, col, start, stop):
+        others = self.others[col]
+        cells = [
+            value if ok else ""
+            for value, ok in zip(self.values[col, start:stop].tolist(), self.valid[col, start:stop].tolist())
+        ]
+        if others:
+            for row, value in others.items():
+                if start <= row < stop:
+                    cells[row - start] = value
+        return cells
+
+    def iter_rows(self, block_rows=ROW_BLOCK):
+        """Yield master rows (Source_File, Report_Runtime, measurements..., "") a block at a time."""
+        for start in range(0, len(self), block_rows):
+            stop = min(start + block_rows, len(self))
+            columns = [self.source_ids[start:stop], self.runtimes[start:stop]]
+            columns.extend(self._column_block(col, start, stop) for col in range(len(self.measurement_names)))
+            columns.append([""] * (stop - start))
+            for row in zip(*columns):
+                yield list(row)
+
+    def to_rows(self):
+        return list(self.iter_rows())
+
+    def take(self, rows):
+        """New table with the given rows (indices into this one), in that order."""
+        rows = np.asarray(rows, dtype=np.intp)
+        position = np.full(len(self), -1, dtype=np.intp)
+        position[rows] = np.arange(len(rows))
+
+        def pick(matrix):
+            return None if matrix is None else matrix[..., rows]
+
+        return MasterTable(
+            self.measurement_names,
+            [self.source_ids[r] for r in rows.tolist()],
+            [self.runtimes[r] for r in rows.tolist()],
+            self.values[:, rows], self.valid[:, rows],
+            [{int(position[r]): v for r, v in others.items() if position[r] >= 0} for others in self.others],
+            pick(self.passed), pick(self.failed), pick(self.row_failed),
+            [self.runtime_times[r] for r in rows.tolist()],
+        )
+
+
+class ColumnStore:
+    """
+    Growable columnar cell storage behind Consolidator, addressed by
+    (column slot, row). Layout matches MasterTable; rows freed by remove()
+    are reused by the next add(), and both dimensions grow by doubling.
+    Also holds per-cell validation results so rows can be validated as
+    they are added.
+    """
+
+    def __init__(self, rows=64, slots=16):
+        self.values = np.zeros((slots, rows))
+        self.valid = np.zeros((slots, rows), dtype=bool)
+        self.passed = np.zeros((slots, rows), dtype=bool)
+        self.failed = np.zeros((slots, rows), dtype=bool)
+        self.row_failed = np.zeros(rows, dtype=bool)
+        self.others = [{} for _ in range(slots)]
+        self._free = []
+        self._used = 0  # rows handed out so far
+
+    def _reserve(self, slots, rows):
+        old_slots, old_rows = self.values.shape
+        if slots <= old_slots and rows <= old_rows:
+            return
+        new_slots = max(slots, old_slots * 2 if slots > old_slots else old_slots)
+        new_rows = max(rows, old_rows * 2 if rows > old_rows else old_rows)
+        for name in ("values", "valid", "passed", "failed"):
+            old = getattr(self, name)
+            grown = np.zeros((new_slots, new_rows), dtype=old.dtype)
+            grown[:old_slots, :old_rows] = old
+            setattr(self, name, grown)
+        row_failed = np.zeros(new_rows, dtype=bool)
+        row_failed[:old_rows] = self.row_failed
+        self.row_failed = row_failed
+        self.others.extend({} for _ in range(new_slots - old_slots))
+
+    def add(self, slots, values):
+        """Store one row of cells (slots and values aligned, slots unique). Returns the row index."""
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = self._used
+            self._used += 1
+        self._reserve(int(np.max(slots)) + 1 if len(slots) else 0, row + 1)
+        if all(value.__class__ is float for value in values):
+            # Usual case: every measurement is a number
+            numeric_slots, numbers = slots, values
+        else:
+            numeric_slots, numbers = [], []
+            for slot, value in zip(slots, values):
+                if is_number(value):
+                    numeric_slots.append(slot)
+                    numbers.append(value)
+                elif value != "":
+                    self.others[slot][row] = value
+        if len(numeric_slots):
+            self.values[numeric_slots, row] = numbers
+            self.valid[numeric_slots, row] = True
+        return row
+
+    def remove(self, row, slots):
+        """Clear a row previously stored with these slots and free it for reuse."""
+        slots = list(slots)
+        for matrix in (self.valid, self.passed, self.failed):
+            matrix[slots, row] = False
+        self.row_failed[row] = False
+        for slot in slots:
+            self.others[slot].pop(row, None)
+        self._free.append(row)
+
+    def column(self, slot, rows):
+        """(values, valid, {position in rows: value}) of one column over the given rows."""
+        others = self.others[slot]
+        if others:
+            extra = {pos: others[row] for pos, row in enumerate(rows.tolist()) if row in others}
+        else:
+            extra = {}
+        return self.values[slot, rows], self.valid[slot, rows], extra
+
+    def snapshot(self, measurement_names, slots, rows, source_ids, runtimes, runtime_times=None):
+        """MasterTable of the given column slots and rows, in the order given."""
+        slots = np.asarray(slots, dtype=np.intp)
+        rows = np.asarray(rows, dtype=np.intp)
+        grid = np.ix_(slots, rows)
+        position = np.full(self.values.shape[1], -1, dtype=np.intp)
+        position[rows] = np.arange(len(rows))
+        others = [
+            {int(position[r]): v for r, v in self.others[slot].items() if position[r] >= 0}
+            for slot in slots.tolist()
+        ]
+        return MasterTable(
+            measurement_names, source_ids, runtimes,
+            self.values[grid], self.valid[grid], others,
+            self.passed[grid], self.failed[grid], self.row_failed[rows], runtime_times,
+        )
@@ -0,0 +1,183 @@
+# tolerance_store.py
+"""
+Named tolerance profiles, saved in one JSON file and shared by the GUI and
+headless runs.
+
+    profiles = ToleranceStore()
+    profiles.save("GEM-STD-01", tolerance_dict)
+    name = profiles.match(columns)      # profile saved for this column set, or None
+    tolerance_dict = profiles.get(name)
+
+Profiles are indexed by the signature of the measurement columns they were
+saved for (see column_signature), so finding the profile for a batch is one
+dict lookup however many profiles are stored.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+from app.core.naming import map_symbol
+
+TOLERANCE_STORE_VERSION = 1
+
+
+def user_config_dir():
+    """
+    Per-user settings directory of the app (%APPDATA%, ~/Library/Application
+    Support or $XDG_CONFIG_HOME), next to the GUI's QSettings file.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Roaming"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "Orava Solutions", "Orava Gemstone Master Reporter")
+
+
+# Profiles are user configuration, so they are kept apart from the disposable cache/ directory
+DEFAULT_PROFILES_PATH = os.path.join(user_config_dir(), "tolerance_profiles.json")
+# Where profiles used to be saved; read when DEFAULT_PROFILES_PATH doesn't exist yet
+LEGACY_PROFILES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache", "tolerance_profiles.json",
+)
+
+
+def column_signature(columns):
+    """
+    Key of a measurement schema: SHA-1 of its distinct display column names,
+    so column order and unit spelling ('Diameter 1' / 'Diameter 1 (mm)') don't matter.
+    """
+    names = sorted({map_symbol(str(col).strip()) for col in columns})
+    return hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()
+
+
+def incomplete_columns(tolerance_dict):
+    """Columns of tolerance_dict with a blank nominal, plus or minus value."""
+    return [col for col, entry in tolerance_dict.items() if any(value is None for value in entry)]
+
+
+class ToleranceStore:
+    """
+    Tolerance profiles: {name: {col_name_with_unit: (nominal, plus, minus)}}.
+
+    The file is read once, when the store is created; save() and delete()
+    rewrite it atomically. An unreadable file leaves the store empty with
+    the reason in load_error; writes raise OSError for the caller to report.
+    Until the default file exists, profiles saved under cache/ by earlier
+    versions are loaded from there (and written to the default file).
+    """
+
+    def __init__(self, path=DEFAULT_PROFILES_PATH):
+        self.path = path
+        self.load_error = None
+        self._profiles = {}     # name -> {"updated": iso time, "signature": ..., "tolerances": {col: (nominal, plus, minus)}}
+        self._by_signature = {}  # column signature -> most recently saved profile name
+        source = path
+        if path == DEFAULT_PROFILES_PATH and not os.path.exists(path) and os.path.exists(LEGACY_PROFILES_PATH):
+            source = LEGACY_PROFILES_PATH
+        try:
+            with open(source, encoding="utf-8") as f:
+                stored = json.load(f)
+            for name, profile in stored.get("profiles", {}).items():
+                tolerances = {
+                    col: tuple(None if value is None else float(value) for value in entry)
+                    for col, entry in profile["tolerances"].items()
+                }
+                self._profiles[name] = {
+                    "updated": profile.get("updated"),
+                    "signature": profile.get("signature") or column_signature(tolerances),
+                    "tolerances": tolerances,
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._profiles = {}
+            self.load_error = str(e)
+        self._reindex()
+
+    def _write(self):
+        stored = {
+            "version": TOLERANCE_STORE_VERSION,
+            "profiles": {
+                name: {
+                    "updated": profile["updated"],
+                    "signature": profile["signature"],
+                    "tolerances": {col: list(entry) for col, entry in profile["tolerances"].items()},
+                }
+                for name, profile in self._profiles.items()
+            },
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def names(self):
+        return sorted(self._profiles, key=str.lower)
+
+    def __contains__(self, name):
+        return name in self._profiles
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def get(self, name):
+        """{col_name_with_unit: (nominal, plus, minus)} of a profile (a copy), or None."""
+        profile = self._profiles.get(name)
+        return None if profile is None else dict(profile["tolerances"])
+
+    def match(self, columns):
+        """Name of the profile saved for exactly this column set, or None."""
+        return self._by_signature.get(column_signature(columns))
+
+    def save(self, name, tolerance_dict, columns=None):
+        """
+        Create or replace a profile; it becomes the match for `columns`, the
+        batch's measurement columns (default: the columns of tolerance_dict).
+        Every column needs its nominal, plus and minus values.
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("Profile name is empty")
+        missing = incomplete_columns(tolerance_dict)
+        if missing:
+            raise ValueError(f"Missing tolerance values for: {', '.join(missing)}")
+        previous = self._profiles.get(name)
+        self._profiles[name] = {
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "signature": column_signature(tolerance_dict if columns is None else columns),
+            "tolerances": {map_symbol(col): tuple(entry) for col, entry in tolerance_dict.items()},
+        }
+        try:
+            self._write()
+        except OSError:
+            if previous is None:
+                del self._profiles[name]
+            else:
+                self._profiles[name] = previous
+            raise
+        self._reindex()
+        return name
+
+    def delete(self, name):
+        profile = self._profiles.pop(name, None)
+        if profile is None:
+            return
+        try:
+            self._write()
+        except OSError:
+            self._profiles[name] = profile
+            raise
+        self._reindex()
+
+    def _reindex(self):
+        # Later saves win when several profiles cover the same column set
+        self._by_signature = {}
+        for name in sorted(self._profiles, key=lambda name: self._profiles[name]["updated"] or ""):
+            self._by_signature[self._profiles[name]["signature"]] = name
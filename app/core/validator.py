@@ -1,3 +1,11 @@
+from collections import namedtuple
+from itertools import zip_longest
+
+import numpy as np
+
+from app.core.naming import strip_unit_symbols
+
+
 def is_pass(val, nominal, plus, minus):
     """
     Returns True if val is within [nominal - minus - 0.005, nominal + plus + 0.005], else False.
@@ -33,12 +41,38 @@ def is_pass(val, nominal, plus, minus):
         return False
 
 
-def strip_unit_symbols(name):
+def is_value_pass(value, tolerance_entry):
     """
-    Remove unit symbols from column name for tolerance lookup.
-    E.g., 'Diameter 1 (mm)' -> 'Diameter 1'
+    Check if a value is within tolerance range.
+    Validates using 3 decimal places with 0.005 rounding margin.
+    Unlike is_pass, blank and non-numeric values count as passing; this is
+    the rule used for the exported master report.
+    
+    Args:
+        value: The measurement value to check
+        tolerance_entry: Tuple of (nominal, plus, minus)
+    
+    Returns:
+        True if within tolerance, False otherwise
     """
-    return name.replace(" (mm)", "").replace(" (⟳)", "").replace(" (°)", "").strip()
+    # Skip empty, None, or dash values
+    if value is None or value == "" or value == "-":
+        return True  # Don't mark empty cells as fail
+    
+    try:
+        # Round to 3 decimals for validation
+        val_rounded = round(float(value), 3)
+        nominal, plus, minus = [float(x) for x in tolerance_entry]
+        
+        # Calculate bounds with 0.005 margin (for 3-decimal rounding tolerance)
+        lower_bound = round(nominal - minus - 0.005, 3)  # e.g., 0 - 0.05 - 0.005 = -0.055
+        upper_bound = round(nominal + plus + 0.005, 3)   # e.g., 0 + 0.05 + 0.005 = 0.055
+        
+        # Check if rounded value is within expanded bounds
+        return lower_bound <= val_rounded <= upper_bound
+    
+    except (ValueError, TypeError):
+        return True  # Non-numeric values pass (don't fail)
 
 
 def validate_measurements(rows, col_names, tolerance_dict):
@@ -54,6 +88,7 @@ def validate_measurements(rows, col_names, tolerance_dict):
         dict: {col_name: ["PASS"/"FAIL"/"", ...]} per row
     """
     results = {col: [] for col in col_names}
+    tolerance_keys = [strip_unit_symbols(col) for col in col_names]
     
     for row in rows:
         for idx, col in enumerate(col_names):
@@ -63,7 +98,7 @@ def validate_measurements(rows, col_names, tolerance_dict):
                 continue
             
             val = row[idx]
-            col_clean = strip_unit_symbols(col)
+            col_clean = tolerance_keys[idx]
             
             # Only check if tolerance is set and value is not empty/"-"
             if col_clean in tolerance_dict and val not in (None, "", "-"):
@@ -88,6 +123,193 @@ def validate_measurements(rows, col_names, tolerance_dict):
     return results
 
 
+BatchValidation = namedtuple("BatchValidation", ["columns", "indices", "passed", "failed", "row_failed"])
+BatchValidation.__doc__ = """
+Result of validate_table.
+    columns:    checked column names (in master column order)
+    indices:    position of each checked column in master_colnames
+    passed:     bool matrix (rows x columns), True where the cell is PASS
+    failed:     bool matrix (rows x columns), True where the cell is FAIL
+    row_failed: bool vector, True where any cell of the row is FAIL
+Cells that are neither passed nor failed are blank (no value).
+"""
+
+# Values further than this from a bound can't change side when rounded to 3 decimals
+_ROUNDING_BAND = 0.001
+
+
+def _column_to_floats(values):
+    """
+    Convert one column of cell values to float64.
+    Returns: (floats, blank mask, non-numeric mask); blank/non-numeric cells are NaN in floats.
+    """
+    count = len(values)
+    cells = np.empty(count, dtype=object)
+    cells[:] = values
+    blank = (cells == "") | (cells == "-") | np.equal(cells, None)
+    non_numeric = np.zeros(count, dtype=bool)
+    cells[blank] = np.nan
+    try:
+        floats = cells.astype(np.float64)
+    except (ValueError, TypeError):
+        # Mixed column: convert cell by cell with float(), like the scalar checks do
+        floats = np.empty(count, dtype=np.float64)
+        for idx, v in enumerate(cells):
+            try:
+                floats[idx] = float(v)
+            except (ValueError, TypeError):
+                floats[idx] = np.nan
+                non_numeric[idx] = True
+    return floats, blank, non_numeric
+
+
+def tolerance_values(tolerance_entry):
+    """
+    (nominal, plus, minus) as floats, or None if the entry is not three numbers;
+    is_value_pass passes every value against such an entry.
+    """
+    try:
+        nominal, plus, minus = [float(x) for x in tolerance_entry]
+    except (ValueError, TypeError):
+        return None
+    return nominal, plus, minus
+
+
+def _tolerance_bounds(tolerance_entry):
+    """(low, high) bounds exactly as is_value_pass computes them, or None if the entry is not numeric."""
+    values = tolerance_values(tolerance_entry)
+    if values is None:
+        return None
+    nominal, plus, minus = values
+    return round(nominal - minus - 0.005, 3), round(nominal + plus + 0.005, 3)
+
+
+def validate_table(rows, master_colnames, tolerance_dict):
+    """
+    Vectorized version of the per-cell is_value_pass check over a whole master table.
+    
+    Each checked column is converted to a float vector once (NaN mask for blanks
+    and "-"), its ±0.005 rounded bounds are computed once, and all values are
+    compared in one numpy pass. Values within 0.001 of a bound, where rounding
+    to 3 decimals could change the outcome, are re-checked with Python's round()
+    as in is_value_pass, so results match the scalar rules exactly.
+    
+    Args:
+        rows: master rows (lists/tuples aligned with master_colnames)
+        master_colnames: master column names, with units (as used in tolerance_dict)
+        tolerance_dict: {col_name_with_unit: (nom, plus, minus)}
+    
+    Returns:
+        BatchValidation
+    """
+    checked = [
+        (idx, col) for idx, col in enumerate(master_colnames)
+        if col != "Final Status" and col in tolerance_dict
+    ]
+    row_count = len(rows)
+    passed = np.zeros((row_count, len(checked)), dtype=bool)
+    failed = np.zeros((row_count, len(checked)), dtype=bool)
+    
+    # Transpose once; short rows are padded with blanks
+    columns = list(zip_longest(*rows, fillvalue=""))
+    
+    for pos, (idx, col) in enumerate(checked):
+        values = columns[idx] if idx < len(columns) else [""] * row_count
+        passed[:, pos], failed[:, pos] = _check_floats(*_column_to_floats(values), tolerance_dict[col])
+    
+    return BatchValidation(
+        [col for _, col in checked], [idx for idx, _ in checked], passed, failed, failed.any(axis=1)
+    )
+
+
+def _check_floats(floats, blank, non_numeric, tolerance_entry):
+    """
+    Check one column converted by _column_to_floats against a tolerance entry.
+    Returns: (passed, failed) bool vectors
+    """
+    present = ~blank
+    bounds = _tolerance_bounds(tolerance_entry)
+    if bounds is None:
+        # Unusable tolerance entry: is_value_pass passes every value
+        return present, np.zeros(len(floats), dtype=bool)
+    low, high = bounds
+    
+    with np.errstate(invalid="ignore"):
+        sure_pass = (floats >= low + _ROUNDING_BAND) & (floats <= high - _ROUNDING_BAND)
+        sure_fail = (floats < low - _ROUNDING_BAND) | (floats > high + _ROUNDING_BAND)
+    sure_pass |= non_numeric  # non-numeric values pass (don't fail)
+    sure_fail &= present
+    
+    # Near a bound (or NaN): settle with the scalar 3-decimal rounding rule
+    near = np.flatnonzero(present & ~sure_pass & ~sure_fail)
+    if near.size:
+        near_pass = np.array(
+            [low <= round(x, 3) <= high for x in floats[near].tolist()], dtype=bool
+        )
+        sure_pass[near[near_pass]] = True
+        sure_fail[near[~near_pass]] = True
+    
+    return sure_pass & present, sure_fail
+
+
+def check_column(values, valid, others, tolerance_entry):
+    """
+    Validate one columnar measurement column (see app.core.table) without
+    building Python values for its numeric cells.
+    
+    Args:
+        values: float64 vector
+        valid: bool vector, True where values holds the cell's number
+        others: {position: value} for non-numeric cells; other cells are blank
+        tolerance_entry: (nominal, plus, minus)
+    
+    Returns:
+        (passed, failed) bool vectors
+    """
+    floats = np.where(valid, values, np.nan)
+    blank = ~valid
+    non_numeric = np.zeros(len(floats), dtype=bool)
+    if others:
+        positions = list(others)
+        extra_floats, extra_blank, extra_non_numeric = _column_to_floats(list(others.values()))
+        floats[positions] = extra_floats
+        blank[positions] = extra_blank
+        non_numeric[positions] = extra_non_numeric
+    return _check_floats(floats, blank, non_numeric, tolerance_entry)
+
+
+def validate_columns(table, tolerance_dict):
+    """
+    validate_table for an app.core.table.MasterTable: numeric cells are
+    checked straight from its float64 vectors.
+    
+    Returns:
+        BatchValidation (rows in table order)
+    """
+    colnames = table.colnames
+    fixed = len(colnames) - len(table.measurement_names) - 1
+    checked = [
+        (idx, col) for idx, col in enumerate(colnames)
+        if col != "Final Status" and col in tolerance_dict
+    ]
+    row_count = len(table)
+    passed = np.zeros((row_count, len(checked)), dtype=bool)
+    failed = np.zeros((row_count, len(checked)), dtype=bool)
+    
+    for pos, (idx, col) in enumerate(checked):
+        if idx < fixed:
+            values = table.source_ids if idx == 0 else table.runtimes
+            result = _check_floats(*_column_to_floats(values), tolerance_dict[col])
+        else:
+            j = idx - fixed
+            result = check_column(table.values[j], table.valid[j], table.others[j], tolerance_dict[col])
+        passed[:, pos], failed[:, pos] = result
+    
+    return BatchValidation(
+        [col for _, col in checked], [idx for idx, _ in checked], passed, failed, failed.any(axis=1)
+    )
+
+
 def validate_measurements_legacy(rows, headers, tolerance_dict):
     """
     Legacy: Use when data has 'Type'/'Value' columns (for classic/old formats).
@@ -0,0 +1,106 @@
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from app.core.consolidator import Consolidator
+from app.core.instrumentation import RunStats
+from app.io.data_writer import export_master_data
+from app.io.excel_writer import export_master_report
+
+
+class ExportCanceled(Exception):
+    """Raised inside the worker to unwind out of parsing when the user cancels."""
+
+
+class ExportWorker(QObject):
+    """
+    Parses, validates and writes the master report off the GUI thread.
+    Move to a QThread and connect thread.started to run().
+    """
+    progress = pyqtSignal(int, int, float)   # files done, total files, files per second
+    stage = pyqtSignal(str)                  # human readable stage name
+    finished = pyqtSignal(str)               # saved output path
+    failed = pyqtSignal(str)                 # error message
+    canceled = pyqtSignal()
+
+    def __init__(self, files, tolerance_dict, output_path, creator, report_title, max_workers=None, store=None,
+                 consolidator=None, data_path=None, profile=False):
+        super().__init__()
+        self.files = list(files)
+        self.tolerance_dict = dict(tolerance_dict)
+        self.output_path = output_path
+        self.creator = creator
+        self.report_title = report_title
+        self.max_workers = max_workers
+        self.store = store
+        # An existing Consolidator to bring up to date (only changed files are parsed);
+        # it must not be touched from other threads until the worker finishes
+        self.consolidator = consolidator
+        # Optional analytics data file (see app.io.data_writer) written after the report
+        self.data_path = data_path
+        self.data_outpath = None
+        # Stage timings, per-file parse times and peak memory of this export
+        # (profile=True adds a cProfile and per-stage memory peaks)
+        self.stats = RunStats(profile=profile, label=output_path)
+        self._cancel_requested = False
+        self._started = None
+
+    def cancel(self):
+        """Request cancellation; takes effect at the next file boundary."""
+        self._cancel_requested = True
+
+    def _check_canceled(self):
+        if self._cancel_requested:
+            raise ExportCanceled()
+
+    def _on_file_parsed(self, done, total, file_path):
+        elapsed = time.perf_counter() - self._started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        self.progress.emit(done, total, rate)
+        self._check_canceled()
+
+    def run(self):
+        self._started = time.perf_counter()
+        outpath = error = None
+        canceled = False
+        # Signals go out once the stats are complete
+        with self.stats.recording():
+            try:
+                self.stage.emit("Parsing files...")
+                if self.consolidator is None:
+                    self.consolidator = Consolidator(max_workers=self.max_workers, store=self.store)
+                self.consolidator.progress = self._on_file_parsed
+                try:
+                    self.consolidator.validate(self.tolerance_dict)
+                    self.consolidator.sync(self.files)
+                finally:
+                    self.consolidator.progress = None
+                self._check_canceled()
+
+                self.stage.emit("Writing master report...")
+                outpath = export_master_report(
+                    files=[],
+                    all_headers={},
+                    all_data={},
+                    tolerance_dict=self.tolerance_dict,
+                    table=self.consolidator.table,
+                    output_path=self.output_path,
+                    creator=self.creator,
+                    report_title=self.report_title,
+                )
+                if self.data_path:
+                    self.stage.emit("Writing analytics data...")
+                    self.data_outpath = export_master_data(
+                        self.consolidator.table, self.tolerance_dict, self.data_path,
+                        creator=self.creator, report_title=self.report_title,
+                    )
+            except ExportCanceled:
+                canceled = True
+            except Exception as e:
+                error = str(e)
+        if canceled:
+            self.canceled.emit()
+        elif error is not None:
+            self.failed.emit(error)
+        else:
+            self.finished.emit(outpath)
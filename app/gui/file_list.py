@@ -0,0 +1,186 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QColor, QPen, QFont, QFontMetrics
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+# Per-file states shown in the upload list
+STATUS_READY = "ready"            # passed the upload check, not parsed yet
+STATUS_NO_HEADER = "no_header"    # opened fine, but no Type/Value header row found
+STATUS_PARSED = "parsed"          # in the master table
+STATUS_ERROR = "error"            # could not be parsed
+
+STATUS_COLORS = {
+    STATUS_READY: "#888888",
+    STATUS_NO_HEADER: "#c87f0a",
+    STATUS_PARSED: "#237346",
+    STATUS_ERROR: "#d9534f",
+}
+
+PathRole = Qt.UserRole
+StatusRole = Qt.UserRole + 1
+CountRole = Qt.UserRole + 2
+StatusTextRole = Qt.UserRole + 3
+
+
+def status_text(status, count=None, message=""):
+    if status == STATUS_PARSED:
+        return f"{count} measurement{'s' if count != 1 else ''}" if count is not None else "Parsed"
+    if status == STATUS_NO_HEADER:
+        return "No Type/Value header found"
+    if status == STATUS_ERROR:
+        return "Unreadable"
+    return "Ready"
+
+
+class FileListModel(QAbstractListModel):
+    """
+    Uploaded files with a parse status and measurement count per file.
+    Rows are inserted, removed and updated in place, so views repaint only
+    what changed; nothing per row is built beyond a small tuple.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._rows = {}      # path -> row
+        self._status = {}    # path -> (status, measurement count or None, message)
+
+    # ----- Qt model interface -----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._paths):
+            return None
+        path = self._paths[index.row()]
+        status, count, message = self._status.get(path, (STATUS_READY, None, ""))
+        if role == Qt.DisplayRole or role == PathRole:
+            return path
+        if role == StatusRole:
+            return status
+        if role == CountRole:
+            return count
+        if role == StatusTextRole:
+            return status_text(status, count, message)
+        if role == Qt.ToolTipRole:
+            return f"{path}\n{message}" if message else path
+        return None
+
+    # ----- updates -----
+    def files(self):
+        return list(self._paths)
+
+    def set_files(self, paths):
+        """Replace the whole list (statuses of files still listed are kept)."""
+        self.beginResetModel()
+        self._paths = list(dict.fromkeys(paths))
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+        self._status = {path: self._status[path] for path in self._paths if path in self._status}
+        self.endResetModel()
+
+    def append_files(self, paths, status=STATUS_READY):
+        new = [path for path in dict.fromkeys(paths) if path not in self._rows]
+        if not new:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+        for path in new:
+            self._rows[path] = len(self._paths)
+            self._paths.append(path)
+            self._status[path] = (status, None, "")
+        self.endInsertRows()
+
+    def remove_file(self, path):
+        row = self._rows.get(path)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._paths[row]
+        del self._rows[path]
+        self._status.pop(path, None)
+        for later in self._paths[row:]:
+            self._rows[later] -= 1
+        self.endRemoveRows()
+
+    def set_status(self, path, status, count=None, message=""):
+        row = self._rows.get(path)
+        if row is None:
+            return
+        self._status[path] = (status, count, message)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [StatusRole, CountRole, StatusTextRole, Qt.ToolTipRole])
+
+    def set_statuses(self, statuses):
+        """Update many files at once: {path: (status, count, message)}; one dataChanged for the lot."""
+        rows = [self._rows[path] for path in statuses if path in self._rows]
+        if not rows:
+            return
+        for path, entry in statuses.items():
+            if path in self._rows:
+                self._status[path] = entry
+        self.dataChanged.emit(
+            self.index(min(rows)), self.index(max(rows)),
+            [StatusRole, CountRole, StatusTextRole, Qt.ToolTipRole],
+        )
+
+
+class FileItemDelegate(QStyledItemDelegate):
+    """
+    Paints one file row: path, status text and a round remove button.
+    Clicking the button emits removeRequested(path).
+    """
+    removeRequested = pyqtSignal(str)
+
+    ROW_HEIGHT = 28
+    BUTTON_SIZE = 20
+    STATUS_WIDTH = 190
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font = QFont()
+        self._font.setPixelSize(14)
+        self._status_font = QFont()
+        self._status_font.setPixelSize(12)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _button_rect(self, rect):
+        size = self.BUTTON_SIZE
+        return QRect(rect.right() - size - 4, rect.center().y() - size // 2 + 1, size, size)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.State_MouseOver:
+            painter.fillRect(option.rect, QColor("#f2f6fa"))
+        rect = option.rect.adjusted(6, 0, -6, 0)
+        button = self._button_rect(option.rect)
+        status_rect = QRect(button.left() - self.STATUS_WIDTH - 10, rect.top(), self.STATUS_WIDTH, rect.height())
+        name_rect = QRect(rect.left(), rect.top(), status_rect.left() - rect.left() - 8, rect.height())
+
+        painter.setFont(self._font)
+        painter.setPen(QColor("#444444"))
+        name = QFontMetrics(self._font).elidedText(index.data(PathRole), Qt.ElideMiddle, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignVCenter | Qt.AlignLeft, name)
+
+        painter.setFont(self._status_font)
+        painter.setPen(QColor(STATUS_COLORS.get(index.data(StatusRole), "#888888")))
+        painter.drawText(status_rect, Qt.AlignVCenter | Qt.AlignRight, index.data(StatusTextRole))
+
+        painter.setRenderHint(painter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#d9534f"))
+        painter.drawEllipse(button)
+        painter.setPen(QPen(QColor("white")))
+        painter.setFont(self._status_font)
+        painter.drawText(button, Qt.AlignCenter, "X")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and self._button_rect(option.rect).contains(event.pos())
+        ):
+            self.removeRequested.emit(index.data(PathRole))
+            return True
+        return super().editorEvent(event, model, option, index)
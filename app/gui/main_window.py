@@ -1,15 +1,23 @@
+import os
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QLabel, QMessageBox,
-    QSpacerItem, QSizePolicy, QFrame, QListWidget, QListWidgetItem, QListView,
-    QAbstractItemView, QStackedLayout, QLineEdit
+    QSpacerItem, QSizePolicy, QFrame, QListView,
+    QAbstractItemView, QStackedLayout, QLineEdit, QProgressBar, QCheckBox
 )
 from PyQt5.QtGui import QPixmap, QFont, QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSettings, QThread
 
-from app.core.parser import build_master_row
-from app.core.parser import extract_types_and_values
+from app.core.consolidator import Consolidator
+from app.core.parse_store import DEFAULT_STORE_PATH, ParseStore
+from app.core.tolerance_store import ToleranceStore
+from app.gui.export_worker import ExportWorker
+from app.gui.file_list import FileItemDelegate, FileListModel, STATUS_ERROR, STATUS_NO_HEADER, STATUS_PARSED, STATUS_READY
+from app.gui.schema_worker import SchemaScanWorker
+from app.gui.stats_dialog import ExportStatsDialog
+from app.gui.upload_worker import UploadCheckWorker
 from app.gui.tolerance_dialog import ToleranceDialog
-from app.io.excel_writer import export_master_report
+from app.io.data_writer import data_path_for
 from app.core.validator import is_pass
 
 class MainWindow(QWidget):
@@ -22,19 +30,40 @@ class MainWindow(QWidget):
         # App state
         self.uploadedfiles = []
         self.tolerancedict = {}
-        self.allheaders = {}
-        self.alldata = {}
         self.reportcreatorinput = None
         self.reporttitleinput = None
         self.lastnominals = None
         self.master_colnames = []
-        self.master_rows = []
+        self.mastertable = None
+        self.parse_errors = []
+        # Worker processes used to parse files on export (None = CPU count, 1 = no pool)
+        self.parse_workers = None
+        # Parsed reports persisted across sessions (keyed on file contents); off unless
+        # "Keep parsed files on disk" is ticked on the export screen
+        self.settings = QSettings("Orava Solutions", "Orava Gemstone Master Reporter")
+        self.parse_store = None
+        # Named tolerance profiles, pre-filled in the tolerance dialog for matching columns
+        self.toleranceprofiles = ToleranceStore()
+        # Master table kept in step with uploadedfiles; exports only parse new or changed files
+        self.consolidator = Consolidator(max_workers=self.parse_workers, store=self.parse_store)
+        self.exportthread = None
+        self.exportworker = None
+        # RunStats of the last finished export, shown by "Export Timings"
+        self.lastexportstats = None
+        self.uploadthread = None
+        self.uploadworker = None
+        self.schemathread = None
+        self.schemaworker = None
+        self.uploadorder = []
+        self.uploadfailures = []
+        self.fileheaderflags = {}
 
         self.stacked = QStackedLayout()
         self.buildwelcomescreen()
         self.buildworkflowscreen()
         self.buildexportscreen()
         self.setLayout(self.stacked)
+        self.diskcachecheck.setChecked(self.settings.value("diskcache/enabled", False, type=bool))
 
     def buildwelcomescreen(self):
         layout = QVBoxLayout()
@@ -131,8 +160,15 @@ class MainWindow(QWidget):
         self.filecountlabel.setAlignment(Qt.AlignHCenter)
         self.filecountlabel.setStyleSheet("font-size:14px;color:#237346;margin-bottom:4px;")
         layout.addWidget(self.filecountlabel)
-        self.filelist = QListWidget()
-        self.filelist.setViewMode(QListView.ListMode)
+        # Model/delegate list: rows are painted on demand, so 10k+ files stay responsive
+        self.filemodel = FileListModel(self)
+        self.filedelegate = FileItemDelegate(self)
+        self.filedelegate.removeRequested.connect(self.removefile)
+        self.filelist = QListView()
+        self.filelist.setModel(self.filemodel)
+        self.filelist.setItemDelegate(self.filedelegate)
+        self.filelist.setUniformItemSizes(True)
+        self.filelist.setMouseTracking(True)
         self.filelist.setSelectionMode(QAbstractItemView.NoSelection)
         self.filelist.setFixedHeight(180)
         self.filelist.setStyleSheet(
@@ -149,6 +185,7 @@ class MainWindow(QWidget):
             "background-color:#366092; color:white; padding:8px 20px; border-radius:8px; font-size:15px; font-weight:bold;"
         )
         add_btn.clicked.connect(self.addmorefiles)
+        self.addmorebtn = add_btn
         btnslayout.addWidget(add_btn)
         clear_btn = QPushButton("Clear All")
         clear_btn.setIcon(QIcon.fromTheme("edit-clear"))
@@ -229,6 +266,25 @@ class MainWindow(QWidget):
         self.reportcreatorinput.setFixedWidth(340)
         self.reportcreatorinput.setStyleSheet("margin-bottom:7px;font-size:15px;padding:8px 12px;")
         center.addWidget(self.reportcreatorinput)
+        self.exportdatacheck = QCheckBox("Also save data for analytics tools (Parquet/CSV)")
+        self.exportdatacheck.setStyleSheet("font-size:14px;color:#444;")
+        center.addWidget(self.exportdatacheck, alignment=Qt.AlignHCenter)
+        self.exportprofilecheck = QCheckBox("Profile the export (detailed timings, slower)")
+        self.exportprofilecheck.setStyleSheet("font-size:14px;color:#444;")
+        center.addWidget(self.exportprofilecheck, alignment=Qt.AlignHCenter)
+        cachelayout = QHBoxLayout()
+        cachelayout.setSpacing(12)
+        self.diskcachecheck = QCheckBox("Keep parsed files on disk to speed up later exports")
+        self.diskcachecheck.setStyleSheet("font-size:14px;color:#444;")
+        self.diskcachecheck.toggled.connect(self.setdiskcache)
+        cachelayout.addWidget(self.diskcachecheck)
+        self.cleardiskcachebtn = QPushButton("Clear Cache")
+        self.cleardiskcachebtn.setStyleSheet(
+            "background-color:#e6edf5; color:#366092; padding:4px 12px; border-radius:8px; font-size:13px;"
+        )
+        self.cleardiskcachebtn.clicked.connect(self.cleardiskcache)
+        cachelayout.addWidget(self.cleardiskcachebtn)
+        center.addLayout(cachelayout)
         center.addSpacing(16)
         self.exportbutton = QPushButton("Export Master Excel Sheet")
         self.exportbutton.setStyleSheet(
@@ -236,6 +292,28 @@ class MainWindow(QWidget):
         )
         self.exportbutton.clicked.connect(self.exportmasterreport)
         center.addWidget(self.exportbutton, alignment=Qt.AlignHCenter)
+        self.exportprogress = QProgressBar()
+        self.exportprogress.setFixedWidth(340)
+        self.exportprogress.setVisible(False)
+        center.addWidget(self.exportprogress, alignment=Qt.AlignHCenter)
+        self.exportstatuslabel = QLabel()
+        self.exportstatuslabel.setAlignment(Qt.AlignHCenter)
+        self.exportstatuslabel.setStyleSheet("font-size:13px;color:#444;")
+        center.addWidget(self.exportstatuslabel, alignment=Qt.AlignHCenter)
+        self.cancelexportbutton = QPushButton("Cancel Export")
+        self.cancelexportbutton.setStyleSheet(
+            "background-color:#d9534f; color:white; padding:8px 20px; border-radius:8px; font-size:15px; font-weight:bold;"
+        )
+        self.cancelexportbutton.clicked.connect(self.cancelexport)
+        self.cancelexportbutton.setVisible(False)
+        center.addWidget(self.cancelexportbutton, alignment=Qt.AlignHCenter)
+        self.exportstatsbutton = QPushButton("Export Timings...")
+        self.exportstatsbutton.setStyleSheet(
+            "background-color:#e6edf5; color:#366092; padding:6px 16px; border-radius:8px; font-size:13px;"
+        )
+        self.exportstatsbutton.clicked.connect(self.showexportstats)
+        self.exportstatsbutton.setVisible(False)
+        center.addWidget(self.exportstatsbutton, alignment=Qt.AlignHCenter)
         backbtn = QPushButton("Back")
         backbtn.setStyleSheet(
             "background-color:#366092; color:white; padding:13px 34px; border-radius:8px; font-size:15px; margin-top:14px; font-weight:bold;"
@@ -247,6 +325,8 @@ class MainWindow(QWidget):
             "background-color:#4b85c5; color:white; padding:13px 34px; border-radius:8px; font-size:15px; margin-top:14px; font-weight:bold;"
         )
         home_btn.clicked.connect(self.go_home_reset)
+        self.exportbackbtn = backbtn
+        self.exporthomebtn = home_btn
         btn_row = QHBoxLayout()
         btn_row.setSpacing(12)
         btn_row.setAlignment(Qt.AlignHCenter)
@@ -268,54 +348,118 @@ class MainWindow(QWidget):
         if not files:
             return
         self.onuploadfiles(files)
-        self.updatefilelist()
         self.stacked.setCurrentIndex(1)
 
     def onuploadfiles(self, filelist):
+        self.canceluploadcheck()
         self.uploadedfiles = []
-        for file in filelist:
-            try:
-                import openpyxl
-                wb = openpyxl.load_workbook(file, data_only=True)
-                wb.close()
-                self.uploadedfiles.append(file)
-            except Exception as e:
-                print(f"Failed to validate file: {e}")
-                QMessageBox.warning(self, "Parse Error", f"Failed to read file\n{str(e)}")
+        self.fileheaderflags = {}
+        self.updatefilelist()
+        self.startuploadcheck(filelist)
 
-    def updatefilelist(self):
-        self.filelist.clear()
-        for filename in self.uploadedfiles:
-            item = QListWidgetItem(filename)
-            widget = QWidget()
-            hlayout = QHBoxLayout()
-            hlayout.setContentsMargins(0, 0, 0, 0)
-            label = QLabel(filename)
-            label.setStyleSheet("font-size:14px;color:#444;")
-            removebtn = QPushButton("X")
-            removebtn.setFixedWidth(26)
-            removebtn.setStyleSheet(
-                "background-color:#d9534f; color:white; border:none; border-radius:13px; font-size:13px;"
+    def startuploadcheck(self, files):
+        """Check files in the background; valid ones appear in the list as their checks finish."""
+        self.cancelschemascan()
+        files = [f for f in dict.fromkeys(files) if f not in self.uploadedfiles]
+        if not files:
+            return
+        self.uploadorder = list(self.uploadedfiles) + files
+        self.uploadfailures = []
+        self.uploadworker = UploadCheckWorker(files)
+        self.uploadthread = QThread(self)
+        self.uploadworker.moveToThread(self.uploadthread)
+        self.uploadthread.started.connect(self.uploadworker.run)
+        self.uploadworker.checked.connect(self.onfilechecked)
+        self.uploadworker.finished.connect(self.onuploadcheckfinished)
+        self.uploadworker.finished.connect(self.uploadthread.quit)
+        self.uploadthread.finished.connect(self.uploadthread.deleteLater)
+        # The lambda keeps the worker alive until its thread ends, even after a cancel drops self.uploadworker
+        self.uploadthread.finished.connect(lambda worker=self.uploadworker: worker.deleteLater())
+        self.uploadthread.finished.connect(self.onuploadthreaddone)
+        self.setuploadcheckrunning(True)
+        self.uploadthread.start()
+
+    def setuploadcheckrunning(self, running):
+        self.addmorebtn.setEnabled(not running)
+        self.tolerancebtn.setEnabled(not running and bool(self.uploadedfiles) and self.schemaworker is None)
+
+    def onfilechecked(self, path, ok, error, hasheader):
+        if self.sender() is not self.uploadworker:
+            return  # result of a canceled check
+        if ok:
+            self.uploadedfiles.append(path)
+            self.fileheaderflags[path] = hasheader
+            self.filemodel.append_files([path], STATUS_READY if hasheader else STATUS_NO_HEADER)
+        else:
+            print(f"Failed to validate: {path} {error}")
+            self.uploadfailures.append((path, error))
+        checked = len(self.uploadedfiles) + len(self.uploadfailures)
+        self.filecountlabel.setText(
+            f"Total uploaded files: {len(self.uploadedfiles)} (checked {checked}/{len(self.uploadorder)})"
+        )
+
+    def onuploadcheckfinished(self):
+        if self.sender() is not self.uploadworker:
+            return
+        # Checks complete in any order; keep the order the files were selected in
+        order = {f: i for i, f in enumerate(self.uploadorder)}
+        self.uploadedfiles.sort(key=lambda f: order.get(f, len(order)))
+        self.uploadworker = None
+        self.setuploadcheckrunning(False)
+        self.updatefilelist()
+        if self.uploadfailures:
+            failed = "\n".join(f"{f}\n    {error}" for f, error in self.uploadfailures[:10])
+            more = len(self.uploadfailures) - 10
+            if more > 0:
+                failed += f"\n... and {more} more"
+            QMessageBox.warning(
+                self, "Parse Error", f"Failed to read {len(self.uploadfailures)} file(s):\n{failed}"
             )
-            def makeremover(fname):
-                def inner():
-                    if fname in self.uploadedfiles:
-                        self.uploadedfiles.remove(fname)
-                    if fname in self.allheaders:
-                        del self.allheaders[fname]
-                    if fname in self.alldata:
-                        del self.alldata[fname]
-                    self.updatefilelist()
-                return inner
-            removebtn.clicked.connect(makeremover(filename))
-            hlayout.addWidget(label)
-            hlayout.addStretch()
-            hlayout.addWidget(removebtn)
-            widget.setLayout(hlayout)
-            item.setSizeHint(widget.sizeHint())
-            self.filelist.addItem(item)
-            self.filelist.setItemWidget(item, widget)
-        self.tolerancebtn.setEnabled(bool(self.uploadedfiles))
+
+    def canceluploadcheck(self):
+        if self.uploadworker is not None:
+            self.uploadworker.cancel()
+            self.uploadworker = None
+            self.setuploadcheckrunning(False)
+
+    def onuploadthreaddone(self):
+        if self.sender() is self.uploadthread:
+            self.uploadthread = None
+
+    def removefile(self, filename):
+        self.cancelschemascan()
+        if filename in self.uploadedfiles:
+            self.uploadedfiles.remove(filename)
+        self.fileheaderflags.pop(filename, None)
+        self.consolidator.remove_files([filename])
+        self.filemodel.remove_file(filename)
+        self.updatefilecontrols()
+
+    def updatefilelist(self):
+        self.filemodel.set_files(self.uploadedfiles)
+        self.refreshfilestatuses()
+        self.updatefilecontrols()
+
+    def refreshfilestatuses(self):
+        """Show each file's parse state and measurement count from the consolidator."""
+        counts = self.consolidator.measurement_counts()
+        errors = self.consolidator.file_errors()
+        statuses = {}
+        for path in self.uploadedfiles:
+            if path in errors:
+                statuses[path] = (STATUS_ERROR, None, errors[path])
+            elif path in counts:
+                statuses[path] = (STATUS_PARSED, counts[path], "")
+            elif not self.fileheaderflags.get(path, True):
+                statuses[path] = (STATUS_NO_HEADER, None, "")
+            else:
+                statuses[path] = (STATUS_READY, None, "")
+        self.filemodel.set_statuses(statuses)
+
+    def updatefilecontrols(self):
+        self.tolerancebtn.setEnabled(
+            bool(self.uploadedfiles) and self.uploadworker is None and self.schemaworker is None
+        )
         try:
             hasfiles = bool(self.uploadedfiles)
             hastolerances = bool(self.tolerancedict)
@@ -330,21 +474,14 @@ class MainWindow(QWidget):
     def addmorefiles(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Select Excel Files", "", "Excel Files (*.xlsx)")
         if files:
-            for f in files:
-                if f not in self.uploadedfiles:
-                    try:
-                        import openpyxl
-                        wb = openpyxl.load_workbook(f, data_only=True)
-                        wb.close()
-                        self.uploadedfiles.append(f)
-                    except Exception as e:
-                        print(f"Failed to validate: {f} {e}")
-                        QMessageBox.warning(self, "Parse Error", f"Failed to read {f}\n{str(e)}")
-            self.updatefilelist()
+            self.startuploadcheck(files)
             self.workflowinfolabel.clear()
 
     def clearallfiles(self):
+        self.canceluploadcheck()
+        self.cancelschemascan()
         self.uploadedfiles = []
+        self.consolidator.sync([])
         self.tolerancedict = {}
         self.lastnominals = None
         self.updatefilelist()
@@ -354,25 +491,64 @@ class MainWindow(QWidget):
         if not self.uploadedfiles:
             QMessageBox.warning(self, "Error", "Please add Excel files first!")
             return
-        columns = None
-        try:
-            firstfile = self.uploadedfiles[0]
-            cols, _ = extract_types_and_values(firstfile)
-            columns = [self.map_symbol(c) for c in cols] if cols else []
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to read columns from file\n{str(e)}")
+        if self.schemaworker is not None:
+            return
+        # Columns come from every file, not just the first: a column missing there still gets a tolerance
+        self.schemaworker = SchemaScanWorker(self.uploadedfiles, max_workers=self.parse_workers)
+        self.schemathread = QThread(self)
+        self.schemaworker.moveToThread(self.schemathread)
+        self.schemathread.started.connect(self.schemaworker.run)
+        self.schemaworker.progress.connect(self.onschemaprogress)
+        self.schemaworker.finished.connect(self.onschemascanned)
+        self.schemaworker.failed.connect(self.onschemafailed)
+        for signal in (self.schemaworker.finished, self.schemaworker.failed):
+            signal.connect(self.schemathread.quit)
+        self.schemathread.finished.connect(self.schemathread.deleteLater)
+        # The lambda keeps the worker alive until its thread ends, even after a cancel drops self.schemaworker
+        self.schemathread.finished.connect(lambda worker=self.schemaworker: worker.deleteLater())
+        self.schemathread.finished.connect(self.onschemathreaddone)
+        self.updatefilecontrols()
+        self.workflowinfolabel.setText(f"Reading measurement columns of {len(self.uploadedfiles)} files...")
+        self.schemathread.start()
+
+    def onschemaprogress(self, done, total):
+        if self.sender() is self.schemaworker:
+            self.workflowinfolabel.setText(f"Reading measurement columns: {done}/{total} files")
+
+    def onschemafailed(self, error):
+        if self.sender() is not self.schemaworker:
+            return
+        self.schemaworker = None
+        self.updatefilecontrols()
+        QMessageBox.warning(self, "Error", f"Failed to read columns from files\n{error}")
+        self.tolerancedict = {}
+        self.workflowinfolabel.setText(f"<b>Error:</b> Failed to read columns {error}")
+
+    def onschemascanned(self, scan):
+        if self.sender() is not self.schemaworker or scan is None:
+            return  # canceled
+        self.schemaworker = None
+        self.updatefilecontrols()
+        self.workflowinfolabel.clear()
+        if scan.errors and not scan.files:
+            path, error = scan.errors[0]
+            QMessageBox.warning(self, "Error", f"Failed to read columns from file\n{path}\n{error}")
             self.tolerancedict = {}
-            self.workflowinfolabel.setText(f"<b>Error:</b> Failed to read columns {e}")
+            self.workflowinfolabel.setText(f"<b>Error:</b> Failed to read columns {error}")
             return
+        columns = scan.columns
         if columns:
-            dlg = ToleranceDialog(columns, self, previous_nominals=self.lastnominals)
+            dlg = ToleranceDialog(
+                columns, self, previous_nominals=self.lastnominals, profiles=self.toleranceprofiles,
+                column_counts=scan.counts, file_count=scan.files,
+            )
             if dlg.exec_():
                 self.tolerancedict = dlg.get_tolerances()
                 try:
                     self.lastnominals = self.tolerancedict.copy()
                 except Exception:
                     self.lastnominals = None
-                self.updatefilelist()
+                self.updatefilecontrols()
                 self.stacked.setCurrentIndex(2)
             else:
                 try:
@@ -381,7 +557,7 @@ class MainWindow(QWidget):
                 except Exception:
                     self.tolerancedict = {}
                     self.lastnominals = None
-                self.updatefilelist()
+                self.updatefilecontrols()
                 summary = "<br><b style='color:red'>Tolerance setup canceled.</b>"
                 self.workflowinfolabel.setText(summary)
         else:
@@ -389,16 +565,30 @@ class MainWindow(QWidget):
             self.tolerancedict = {}
             self.workflowinfolabel.setText(summary)
 
+    def cancelschemascan(self):
+        if self.schemaworker is not None:
+            self.schemaworker.cancel()
+            self.schemaworker = None
+            self.updatefilecontrols()
+            self.workflowinfolabel.clear()
+
+    def onschemathreaddone(self):
+        if self.sender() is self.schemathread:
+            self.schemathread = None
+
     def gobacktoworkflow(self):
         self.stacked.setCurrentIndex(1)
 
     def go_home_reset(self):
+        self.canceluploadcheck()
+        self.cancelschemascan()
         self.uploadedfiles = []
+        self.consolidator.sync([])
         self.tolerancedict = {}
-        self.allheaders = {}
-        self.alldata = {}
         self.master_colnames = []
-        self.master_rows = []
+        self.mastertable = None
+        self.lastexportstats = None
+        self.exportstatsbutton.setVisible(False)
         try:
             self.lastnominals = None
         except Exception:
@@ -413,53 +603,6 @@ class MainWindow(QWidget):
             pass
         self.stacked.setCurrentIndex(0)
 
-    def _extract_filename(self, path):
-        import os
-        return os.path.basename(path)
-
-    def map_symbol(self, name):
-        if "(mm)" in name or "(⟳)" in name or "(°)" in name:
-            return name
-        if "Distance" in name or "Diameter" in name:
-            return f"{name} (mm)"
-        elif "Concentricity" in name:
-            return f"{name} (⟳)"
-        elif "Angle" in name:
-            return f"{name} (°)"
-        return name
-
-    def process_all_files_for_report(self):
-        all_file_columns = []
-        all_data_rows = []
-        raw_col_set = []
-        for filepath in self.uploadedfiles:
-            source_name = self._extract_filename(filepath)
-            cols, row = build_master_row(filepath, source_name)
-            source_id = source_name.replace(".xlsx", "").replace(".xls", "")
-            row[0] = source_id
-            all_file_columns.append(cols)
-            all_data_rows.append((source_id, row, cols))
-            for c in cols:
-                if c not in raw_col_set:
-                    raw_col_set.append(c)
-        master_cols = [self.map_symbol(c) for c in raw_col_set]
-        self.master_colnames = ["Source_File", "Report_Runtime"] + master_cols + ["Final Status"]
-        def file_id_key(item):
-            try:
-                return int(item[0])
-            except:
-                return item[0]
-        all_data_rows.sort(key=file_id_key)
-        self.master_rows = []
-        for source_id, row, cols in all_data_rows:
-            output_row = [source_id]
-            output_row.append(row[1] if len(row) > 1 else "")
-            col2val = {self.map_symbol(c): v for c, v in zip(cols, row[2:])}
-            for h in master_cols:
-                output_row.append(col2val.get(h, ""))
-            output_row.append("")
-            self.master_rows.append(output_row)
-
     def exportmasterreport(self):
         creator = self.reportcreatorinput.text().strip()
         reporttitle = self.reporttitleinput.text().strip()
@@ -474,25 +617,129 @@ class MainWindow(QWidget):
         path, _ = QFileDialog.getSaveFileName(self, "Save Master Report", defaultpath, "Excel Files (*.xlsx)")
         if not path:
             return
-        try:
-            self.process_all_files_for_report()
-            synthetic_key = "__master__"
-            transformed_headers = {synthetic_key: self.master_colnames}
-            transformed_data = {synthetic_key: self.master_rows}
-            outpath = export_master_report(
-                files=[synthetic_key],
-                all_headers=transformed_headers,
-                all_data=transformed_data,
-                tolerance_dict=self.tolerancedict,
-                col_names=self.master_colnames,
-                output_path=path,
-                creator=creator,
-                report_title=reporttitle,
-            )
-            QMessageBox.information(
-                self, "Export Complete",
-                f"Master report saved to:\n{outpath}\nCreator: {creator}\nTitle: {reporttitle}"
-            )
-            self.lastnominals = None
-        except Exception as e:
-            QMessageBox.critical(self, "Export Failed", f"Failed to export master report\n{str(e)}")
+        self.exportworker = ExportWorker(
+            self.uploadedfiles, self.tolerancedict, path, creator, reporttitle,
+            max_workers=self.parse_workers, store=self.parse_store, consolidator=self.consolidator,
+            data_path=data_path_for(path) if self.exportdatacheck.isChecked() else None,
+            profile=self.exportprofilecheck.isChecked(),
+        )
+        self.exportthread = QThread(self)
+        self.exportworker.moveToThread(self.exportthread)
+        self.exportthread.started.connect(self.exportworker.run)
+        self.exportworker.progress.connect(self.onexportprogress)
+        self.exportworker.stage.connect(self.exportstatuslabel.setText)
+        self.exportworker.finished.connect(self.onexportfinished)
+        self.exportworker.failed.connect(self.onexportfailed)
+        self.exportworker.canceled.connect(self.onexportcanceled)
+        for signal in (self.exportworker.finished, self.exportworker.failed, self.exportworker.canceled):
+            signal.connect(self.exportthread.quit)
+        self.exportthread.finished.connect(self.exportthread.deleteLater)
+        self.exportthread.finished.connect(self.exportworker.deleteLater)
+        self.exportthread.finished.connect(self.onexportthreaddone)
+        self.setexportrunning(True)
+        self.exportprogress.setRange(0, len(self.uploadedfiles))
+        self.exportprogress.setValue(0)
+        self.exportthread.start()
+
+    def setdiskcache(self, enabled):
+        self.settings.setValue("diskcache/enabled", enabled)
+        self.parse_store = ParseStore() if enabled else None
+        self.consolidator.store = self.parse_store
+        if self.parse_store is not None and not self.parse_store.available:
+            self.exportstatuslabel.setText(f"Disk cache {DEFAULT_STORE_PATH} unavailable; files will be parsed.")
+
+    def cleardiskcache(self):
+        if self.parse_store is not None:
+            self.parse_store.clear()
+        elif os.path.exists(DEFAULT_STORE_PATH):
+            try:
+                os.remove(DEFAULT_STORE_PATH)
+            except OSError as e:
+                QMessageBox.warning(self, "Clear Cache", f"Could not delete the disk cache:\n{e}")
+                return
+        self.exportstatuslabel.setText("Disk cache cleared.")
+
+    def isexportrunning(self):
+        return self.exportthread is not None
+
+    def setexportrunning(self, running):
+        self.exportbutton.setEnabled(not running)
+        self.exportbackbtn.setEnabled(not running)
+        self.exporthomebtn.setEnabled(not running)
+        self.reporttitleinput.setEnabled(not running)
+        self.reportcreatorinput.setEnabled(not running)
+        self.exportdatacheck.setEnabled(not running)
+        self.exportprofilecheck.setEnabled(not running)
+        self.diskcachecheck.setEnabled(not running)
+        self.cleardiskcachebtn.setEnabled(not running)
+        if running:
+            self.exportstatsbutton.setVisible(False)
+        self.exportprogress.setVisible(running)
+        self.cancelexportbutton.setVisible(running)
+        self.cancelexportbutton.setEnabled(running)
+
+    def onexportprogress(self, done, total, rate):
+        self.exportprogress.setMaximum(total)
+        self.exportprogress.setValue(done)
+        self.exportstatuslabel.setText(f"Parsed {done}/{total} files ({rate:.1f} files/s)")
+
+    def onexportfinished(self, outpath):
+        worker = self.exportworker
+        self.master_colnames = worker.consolidator.master_colnames
+        self.mastertable = worker.consolidator.table
+        self.parse_errors = worker.consolidator.parse_errors
+        self.refreshfilestatuses()
+        self.setexportrunning(False)
+        self.exportstatuslabel.setText("")
+        self.lastexportstats = worker.stats
+        self.exportstatsbutton.setVisible(True)
+        message = f"Master report saved to:\n{outpath}\nCreator: {worker.creator}\nTitle: {worker.report_title}"
+        if worker.data_outpath:
+            message += f"\n\nAnalytics data saved to:\n{worker.data_outpath}"
+        if self.parse_errors:
+            skipped = "\n".join(f"{name}: {error}" for name, error in self.parse_errors[:10])
+            more = len(self.parse_errors) - 10
+            if more > 0:
+                skipped += f"\n... and {more} more"
+            message += f"\n\nSkipped {len(self.parse_errors)} unreadable file(s):\n{skipped}"
+        message += f"\n\nCompleted in {worker.stats.total_seconds:.1f}s (details: Export Timings)"
+        QMessageBox.information(self, "Export Complete", message)
+        self.lastnominals = None
+
+    def showexportstats(self):
+        if self.lastexportstats is not None:
+            ExportStatsDialog(self.lastexportstats, self).exec_()
+
+    def onexportfailed(self, error):
+        self.setexportrunning(False)
+        self.exportstatuslabel.setText("")
+        QMessageBox.critical(self, "Export Failed", f"Failed to export master report\n{error}")
+
+    def cancelexport(self):
+        if self.exportworker is not None:
+            self.exportworker.cancel()
+            self.cancelexportbutton.setEnabled(False)
+            self.exportstatuslabel.setText("Canceling...")
+
+    def onexportcanceled(self):
+        self.setexportrunning(False)
+        self.exportstatuslabel.setText("Export canceled.")
+
+    def onexportthreaddone(self):
+        self.exportthread = None
+        self.exportworker = None
+
+    def closeEvent(self, event):
+        if self.isexportrunning():
+            self.exportworker.cancel()
+            self.exportthread.quit()
+            self.exportthread.wait()
+        if self.uploadthread is not None:
+            self.canceluploadcheck()
+            self.uploadthread.quit()
+            self.uploadthread.wait()
+        if self.schemathread is not None:
+            self.cancelschemascan()
+            self.schemathread.quit()
+            self.schemathread.wait()
+        super().closeEvent(event)
@@ -0,0 +1,41 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from app.core.parser import scan_schema
+
+
+class ScanCanceled(Exception):
+    """Raised inside the worker to unwind out of the scan when it is canceled."""
+
+
+class SchemaScanWorker(QObject):
+    """
+    Finds the measurement columns of all uploaded files off the GUI thread
+    (see parser.scan_schema). Move to a QThread and connect thread.started to run().
+    """
+    progress = pyqtSignal(int, int)   # files done, total files
+    finished = pyqtSignal(object)     # SchemaScan, or None when canceled
+    failed = pyqtSignal(str)          # error message
+
+    def __init__(self, files, max_workers=None):
+        super().__init__()
+        self.files = list(files)
+        self.max_workers = max_workers
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def _on_file_scanned(self, done, total, file_path):
+        if self._cancel_requested:
+            raise ScanCanceled()
+        self.progress.emit(done, total)
+
+    def run(self):
+        try:
+            scan = scan_schema(self.files, self.max_workers, progress=self._on_file_scanned)
+        except ScanCanceled:
+            self.finished.emit(None)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(scan)
@@ -0,0 +1,45 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QPlainTextEdit, QDialogButtonBox, QFileDialog, QMessageBox
+)
+from PyQt5.QtGui import QFontDatabase
+
+
+class ExportStatsDialog(QDialog):
+    """Shows the timings of the last export (app.core.instrumentation.RunStats) and saves them as JSON."""
+
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.setWindowTitle("Export Timings")
+        self.resize(720, 520)
+
+        layout = QVBoxLayout(self)
+        text = QPlainTextEdit()
+        text.setReadOnly(True)
+        text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        text.setPlainText(stats.format())
+        layout.addWidget(text)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        savebtn = buttons.addButton("Save JSON Log...", QDialogButtonBox.ActionRole)
+        savebtn.clicked.connect(self.savelog)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def savelog(self):
+        default = "export_stats.json"
+        if self.stats.label:
+            default = os.path.splitext(self.stats.label)[0] + "_stats.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Save Export Timings", default, "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.stats.save(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Save Failed", f"Could not save timings:\n{e}")
+            return
+        note = "\n(cProfile data saved next to it as .prof)" if self.stats.profile_stats is not None else ""
+        QMessageBox.information(self, "Timings Saved", f"Timings saved to:\n{path}{note}")
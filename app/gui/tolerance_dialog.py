@@ -1,67 +1,305 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QDialogButtonBox, QScrollArea, QWidget, QMessageBox
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
+    QDialogButtonBox, QMessageBox, QTableView, QHeaderView, QAbstractItemView, QStyledItemDelegate,
+    QInputDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QLocale, QSortFilterProxyModel
+from PyQt5.QtGui import QDoubleValidator, QColor
+
+from app.core.naming import measurement_type
+
+DEFAULT_TOLERANCE = 0.05
+# Missing columns listed in the OK warning; the rest are counted
+MISSING_LISTED = 20
+
+COLUMN, NOMINAL, PLUS, MINUS, FILES = range(5)
+# Files-count text of columns that some files lack
+PARTIAL_COLOR = "#c87f0a"
+
+
+def parse_number(text):
+    """Float of an edited cell; '' -> None. Raises ValueError for anything else."""
+    text = str(text).strip()
+    return float(text) if text else None
+
+
+def number_validator(parent=None):
+    # C locale: always '.' as decimal separator, as in the reports
+    validator = QDoubleValidator(parent)
+    validator.setNotation(QDoubleValidator.StandardNotation)
+    validator.setLocale(QLocale.c())
+    return validator
+
+
+class ToleranceModel(QAbstractTableModel):
+    """
+    Nominal / Tol+ / Tol- per measurement column, as floats. A nominal may be
+    None (not set yet); a cleared tolerance falls back to DEFAULT_TOLERANCE.
+    With column_counts ({column: files having it}, see parser.scan_schema),
+    the last column shows in how many of file_count files each column occurs.
+    """
+    HEADERS = ("Column", "Nominal Value", "Tolerance + (Upper)", "Tolerance - (Lower)", "In Files")
+
+    def __init__(self, columns, previous_nominals=None, parent=None, column_counts=None, file_count=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.column_counts = column_counts or {}
+        self.file_count = file_count
+        self.values = [[None, DEFAULT_TOLERANCE, DEFAULT_TOLERANCE] for _ in self.columns]
+        self._rows = {col: row for row, col in enumerate(self.columns)}
+        if previous_nominals:
+            self.load(previous_nominals)
+
+    # ----- Qt model interface -----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return flags if index.column() in (COLUMN, FILES) else flags | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == COLUMN:
+            return self.columns[row] if role in (Qt.DisplayRole, Qt.ToolTipRole) else None
+        if column == FILES:
+            count = self.column_counts.get(self.columns[row])
+            if count is None:
+                return None
+            if role == Qt.DisplayRole:
+                return f"{count}/{self.file_count}"
+            if role == Qt.ToolTipRole:
+                return f"In {count} of {self.file_count} files"
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+            if role == Qt.ForegroundRole and count < self.file_count:
+                return QColor(PARTIAL_COLOR)
+            return None
+        value = self.values[row][column - 1]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return "" if value is None else str(value)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() in (COLUMN, FILES):
+            return False
+        try:
+            number = parse_number(value)
+        except ValueError:
+            return False
+        if number is None and index.column() != NOMINAL:
+            number = DEFAULT_TOLERANCE
+        self.values[index.row()][index.column() - 1] = number
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    # ----- bulk edits -----
+    def fill(self, rows, nominal=None, plus=None, minus=None):
+        """Set the given (non-None) values on many rows; one dataChanged for the lot."""
+        rows = list(rows)
+        updates = [(i, value) for i, value in enumerate((nominal, plus, minus)) if value is not None]
+        if not rows or not updates:
+            return
+        for row in rows:
+            for i, value in updates:
+                self.values[row][i] = value
+        self.dataChanged.emit(
+            self.index(min(rows), NOMINAL), self.index(max(rows), MINUS), [Qt.DisplayRole, Qt.EditRole]
+        )
+
+    def load(self, tolerance_dict):
+        """Take the values of the columns listed in tolerance_dict ({col: (nominal, plus, minus)}). Returns how many."""
+        loaded = 0
+        for col, (nominal, plus, minus) in tolerance_dict.items():
+            row = self._rows.get(col)
+            if row is None:
+                continue
+            self.values[row] = [
+                nominal,
+                DEFAULT_TOLERANCE if plus is None else plus,
+                DEFAULT_TOLERANCE if minus is None else minus,
+            ]
+            loaded += 1
+        if loaded:
+            self.dataChanged.emit(
+                self.index(0, NOMINAL), self.index(len(self.values) - 1, MINUS), [Qt.DisplayRole, Qt.EditRole]
+            )
+        return loaded
+
+    def clear_nominals(self):
+        if not self.values:
+            return
+        for entry in self.values:
+            entry[0] = None
+        self.dataChanged.emit(
+            self.index(0, NOMINAL), self.index(len(self.values) - 1, NOMINAL), [Qt.DisplayRole, Qt.EditRole]
+        )
+
+    def type_rows(self):
+        """{measurement type: [rows]} in first-seen order (e.g. every 'Diameter N (mm)' row)."""
+        groups = {}
+        for row, col in enumerate(self.columns):
+            groups.setdefault(measurement_type(col), []).append(row)
+        return groups
+
+    def partial_columns(self):
+        """Columns that only some of the files have."""
+        return [col for col in self.columns if self.column_counts.get(col, self.file_count) < (self.file_count or 0)]
+
+    def missing_nominals(self):
+        """Rows without a nominal value."""
+        return [row for row, entry in enumerate(self.values) if entry[0] is None]
+
+    def tolerances(self):
+        """{column: (nominal or None, plus, minus)}"""
+        return {col: tuple(entry) for col, entry in zip(self.columns, self.values)}
+
+
+class NumberDelegate(QStyledItemDelegate):
+    """Line edit accepting numbers only, for the value cells."""
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setValidator(number_validator(editor))
+        editor.setPlaceholderText("Nominal value" if index.column() == NOMINAL else f"default: {DEFAULT_TOLERANCE}")
+        return editor
+
 
 class ToleranceDialog(QDialog):
-    def __init__(self, columns, parent=None, previous_nominals=None):
+    """
+    Tolerance editor: one table row per measurement column, painted on demand,
+    so opening and scrolling cost the same for 10 or 1000 columns. The fill bar
+    applies one Nominal/Tol+/Tol- to the selected rows, all rows or every
+    column of a measurement type.
+
+    With a ToleranceStore as `profiles`, the profile saved for these columns
+    is selected and pre-filled (previous_nominals, this session's values,
+    still take precedence), and profiles can be loaded, saved and deleted.
+
+    column_counts/file_count (from parser.scan_schema over all uploaded
+    files) add an "In Files" column; columns some files lack are highlighted.
+    """
+
+    def __init__(self, columns, parent=None, previous_nominals=None, profiles=None,
+                 column_counts=None, file_count=None):
         super().__init__(parent)
         self.setWindowTitle("Set Tolerance for Each Column")
-        self.resize(700, 400)
-        self.inputs = {}
+        self.resize(820, 520)
+        self.profiles = profiles
+        self.model = ToleranceModel(columns, None, self, column_counts, file_count)
+        self.typerows = self.model.type_rows()
+        matched = profiles.match(columns) if profiles is not None else None
+        if matched is not None:
+            self.model.load(profiles.get(matched))
+        if previous_nominals:
+            self.model.load(previous_nominals)
 
         main_layout = QVBoxLayout(self)
         info = QLabel("Set Nominal value, Tolerance + (upper), and Tolerance - (lower) for each column:")
         info.setWordWrap(True)
         main_layout.addWidget(info)
+        if column_counts:
+            partial = len(self.model.partial_columns())
+            summary = QLabel(
+                f"{len(self.model.columns)} columns found across {file_count} files"
+                + (f"; {partial} of them are missing from some files (highlighted)." if partial else ".")
+            )
+            summary.setStyleSheet(f"color:{PARTIAL_COLOR};" if partial else "color:#237346;")
+            main_layout.addWidget(summary)
+
+        # --- Profiles ---
+        if profiles is not None:
+            profile_layout = QHBoxLayout()
+            profile_layout.addWidget(QLabel("Profile"))
+            self.profilecombo = QComboBox()
+            profile_layout.addWidget(self.profilecombo, 1)
+            for text, handler in (("Load", self.load_profile), ("Save As...", self.save_profile),
+                                  ("Delete", self.delete_profile)):
+                button = QPushButton(text)
+                button.setStyleSheet("color:#366092; font-size:14px; padding:4px 18px; background:#eee;")
+                button.clicked.connect(handler)
+                profile_layout.addWidget(button)
+            main_layout.addLayout(profile_layout)
+            self.profileinfo = QLabel()
+            self.profileinfo.setStyleSheet("color:#237346;")
+            main_layout.addWidget(self.profileinfo)
+            self.refresh_profiles(matched)
+            if profiles.load_error:
+                self.profileinfo.setStyleSheet("color:#d9534f;")
+                self.profileinfo.setText(f"Saved profiles could not be read: {profiles.load_error}")
+            elif matched is not None:
+                self.profileinfo.setText(f"Profile '{matched}' matches these columns and was pre-filled.")
+
+        # --- Filter ---
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(COLUMN)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        filter_input = QLineEdit()
+        filter_input.setPlaceholderText("Filter columns...")
+        filter_input.setClearButtonEnabled(True)
+        filter_input.textChanged.connect(self.proxy.setFilterFixedString)
+        main_layout.addWidget(filter_input)
 
-        # --- Scrollable Container ---
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_widget = QWidget()
-        layout = QVBoxLayout(scroll_widget)
-
-        # --- Header ---
-        header_layout = QHBoxLayout()
-        header_layout.addWidget(QLabel("Column"), 1)
-        header_layout.addWidget(QLabel("Nominal Value"), 1)
-        header_layout.addWidget(QLabel("Tolerance + (Upper)"), 1)
-        header_layout.addWidget(QLabel("Tolerance - (Lower)"), 1)
-        layout.addLayout(header_layout)
-
-        # --- Rows for Each Column ---
-        for col in columns:
-            row = QHBoxLayout()
-            lbl = QLabel(col)
-            lbl.setFixedWidth(200)
-            nominal = QLineEdit()
-            nominal.setPlaceholderText("Nominal value")
-            nominal.setText("")
-            plus = QLineEdit()
-            plus.setPlaceholderText("+Tol (default: 0.05)")
-            plus.setText("0.05")
-            minus = QLineEdit()
-            minus.setPlaceholderText("-Tol (default: 0.05)")
-            minus.setText("0.05")
-            # Restore/or set previous values
-            if previous_nominals and col in previous_nominals:
-                if previous_nominals[col][0] is not None:
-                    nominal.setText(str(previous_nominals[col][0]))
-                if previous_nominals[col][1] is not None:
-                    plus.setText(str(previous_nominals[col][1]))
-                if previous_nominals[col][2] is not None:
-                    minus.setText(str(previous_nominals[col][2]))
-            row.addWidget(lbl, 1)
-            row.addWidget(nominal, 1)
-            row.addWidget(plus, 1)
-            row.addWidget(minus, 1)
-            layout.addLayout(row)
-            self.inputs[col] = (nominal, plus, minus)
-
-        layout.addStretch()
-        scroll_area.setWidget(scroll_widget)
-        main_layout.addWidget(scroll_area)
+        # --- Table ---
+        table = QTableView()
+        table.setModel(self.proxy)
+        table.setItemDelegate(NumberDelegate(table))
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked
+            | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed
+        )
+        table.setAlternatingRowColors(True)
+        table.setWordWrap(False)
+        # Fixed row heights and stretched columns: nothing is measured per row
+        table.verticalHeader().setVisible(False)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.verticalHeader().setDefaultSectionSize(26)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.horizontalHeader().setSectionResizeMode(FILES, QHeaderView.Fixed)
+        table.horizontalHeader().resizeSection(FILES, 80)
+        table.setColumnHidden(FILES, not column_counts)
+        table.setStyleSheet("font-size:14px;")
+        main_layout.addWidget(table, 1)
+        self.table = table
+
+        # --- Fill bar ---
+        fill_layout = QHBoxLayout()
+        fill_layout.addWidget(QLabel("Fill"))
+        target = QComboBox()
+        target.addItem("Selected rows", None)
+        target.addItem(f"All columns ({len(self.model.columns)})", "")
+        for m_type, rows in self.typerows.items():
+            target.addItem(f"All {m_type} ({len(rows)})", m_type)
+        fill_layout.addWidget(target, 1)
+        self.filltarget = target
+        self.fillinputs = []
+        for placeholder in ("Nominal", "Tol +", "Tol -"):
+            edit = QLineEdit()
+            edit.setPlaceholderText(placeholder)
+            edit.setValidator(number_validator(edit))
+            edit.setFixedWidth(90)
+            fill_layout.addWidget(edit)
+            self.fillinputs.append(edit)
+        apply_button = QPushButton("Apply")
+        apply_button.setStyleSheet("color:#366092; font-size:14px; padding:4px 18px; background:#eee;")
+        apply_button.clicked.connect(self.apply_fill)
+        fill_layout.addWidget(apply_button)
+        main_layout.addLayout(fill_layout)
 
         # --- Clear Nominals Button ---
         clear_button = QPushButton("Clear Nominal Values")
@@ -75,34 +313,105 @@ class ToleranceDialog(QDialog):
         buttons.rejected.connect(self.reject)
         main_layout.addWidget(buttons)
 
+    def selected_rows(self):
+        """Model rows of the selected table rows."""
+        rows = {self.proxy.mapToSource(index).row() for index in self.table.selectionModel().selectedRows()}
+        return sorted(rows)
+
+    def apply_fill(self):
+        try:
+            values = [parse_number(edit.text()) for edit in self.fillinputs]
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Value", "Fill values must be numbers.")
+            return
+        if all(value is None for value in values):
+            QMessageBox.information(self, "Nothing to Fill", "Enter a Nominal, Tol + or Tol - value to fill.")
+            return
+        m_type = self.filltarget.currentData()
+        if m_type is None:
+            rows = self.selected_rows()
+            if not rows:
+                QMessageBox.information(self, "Nothing to Fill", "Select the rows to fill first.")
+                return
+        elif m_type == "":
+            rows = range(len(self.model.columns))
+        else:
+            rows = self.typerows[m_type]
+        self.model.fill(rows, *values)
+
     def clear_nominals(self):
-        for nominal, _, _ in self.inputs.values():
-            nominal.clear()
+        self.model.clear_nominals()
 
-    def handle_accept_ok(self):
-        # Require ALL nominal values filled
-        missing = []
-        for col, (nom, plus, minus) in self.inputs.items():
-            if not nom.text().strip():
-                missing.append(col)
+    def refresh_profiles(self, current=None):
+        self.profilecombo.clear()
+        self.profilecombo.addItems(self.profiles.names())
+        if current is not None:
+            self.profilecombo.setCurrentText(current)
+
+    def load_profile(self):
+        name = self.profilecombo.currentText()
+        tolerances = self.profiles.get(name) if name else None
+        if tolerances is None:
+            return
+        loaded = self.model.load(tolerances)
+        self.profileinfo.setText(f"Loaded {loaded} of {len(self.model.columns)} columns from profile '{name}'.")
+
+    def save_profile(self):
+        if not self.check_nominals():
+            return
+        name, ok = QInputDialog.getText(self, "Save Tolerance Profile", "Profile name:", text=self.profilecombo.currentText())
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in self.profiles and QMessageBox.question(
+            self, "Replace Profile", f"Replace the saved profile '{name}'?"
+        ) != QMessageBox.Yes:
+            return
+        try:
+            self.profiles.save(name, self.model.tolerances(), self.model.columns)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Save Failed", f"Could not save the profile:\n{e}")
+            return
+        self.refresh_profiles(name)
+        self.profileinfo.setText(f"Profile '{name}' saved; it will be pre-filled for files with these columns.")
+
+    def delete_profile(self):
+        name = self.profilecombo.currentText()
+        if not name or QMessageBox.question(
+            self, "Delete Profile", f"Delete the saved profile '{name}'?"
+        ) != QMessageBox.Yes:
+            return
+        try:
+            self.profiles.delete(name)
+        except OSError as e:
+            QMessageBox.critical(self, "Delete Failed", f"Could not delete the profile:\n{e}")
+            return
+        self.refresh_profiles()
+        self.profileinfo.setText(f"Profile '{name}' deleted.")
+
+    def check_nominals(self):
+        """True if every nominal is filled; otherwise lists the blank ones and selects the first."""
+        missing = self.model.missing_nominals()
         if missing:
+            names = [self.model.columns[row] for row in missing[:MISSING_LISTED]]
+            if len(missing) > MISSING_LISTED:
+                names.append(f"... and {len(missing) - MISSING_LISTED} more")
             QMessageBox.critical(
                 self,
                 "Missing Value",
-                "Please enter a nominal value for:\n" + "\n".join(missing)
+                "Please enter a nominal value for:\n" + "\n".join(names)
             )
-            return
-        self.accept()
+            first = self.proxy.mapFromSource(self.model.index(missing[0], NOMINAL))
+            if first.isValid():
+                self.table.setCurrentIndex(first)
+                self.table.scrollTo(first)
+            return False
+        return True
+
+    def handle_accept_ok(self):
+        # Require ALL nominal values filled
+        if self.check_nominals():
+            self.accept()
 
     def get_tolerances(self):
-        result = {}
-        for col, (nom, plus, minus) in self.inputs.items():
-            try:
-                result[col] = (
-                    float(nom.text().strip()) if nom.text().strip() else None,
-                    float(plus.text().strip()) if plus.text().strip() else 0.05,
-                    float(minus.text().strip()) if minus.text().strip() else 0.05,
-                )
-            except Exception:
-                result[col] = (None, 0.05, 0.05)
-        return result
+        return self.model.tolerances()
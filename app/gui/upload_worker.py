@@ -0,0 +1,33 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from app.io.excel_reader import check_workbooks
+
+
+class UploadCheckWorker(QObject):
+    """
+    Checks newly selected files off the GUI thread (see excel_reader.check_workbook)
+    and reports each one as soon as its check completes.
+    Move to a QThread and connect thread.started to run().
+    """
+    checked = pyqtSignal(str, bool, str, bool)  # file path, ok, error message, has Type/Value header
+    finished = pyqtSignal()
+
+    def __init__(self, files, max_workers=8):
+        super().__init__()
+        self.files = list(files)
+        self.max_workers = max_workers
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        results = check_workbooks(self.files, self.max_workers)
+        try:
+            for path, result in results:
+                if self._cancel_requested:
+                    break
+                self.checked.emit(path, result.ok, result.error or "", result.has_header)
+        finally:
+            results.close()
+            self.finished.emit()
@@ -0,0 +1,185 @@
+# data_writer.py
+"""
+Machine-readable export of the master table, for SPC/analytics tooling.
+
+Writes the same rows as the Excel report without any styling, in a
+columnar format: Parquet (.parquet) or Arrow IPC (.arrow/.feather), via
+the optional pyarrow package. CSV (.csv) needs nothing extra and is also
+the fallback when pyarrow is not installed.
+
+Layout (one row per report, in master table order):
+    Source_File, Report_Runtime        strings (the runtime as shown in the report)
+    Report_Time                        timestamp (ISO text in CSV), null where unknown
+    <measurement>                      float64, null where blank or non-numeric
+    <measurement> Status               "PASS"/"FAIL"/null, for toleranced columns
+    Final Status                       "PASS"/"FAIL"
+Tolerances ({column: [nominal, plus, minus]}), title, creator and the
+generation time are stored as schema metadata (Parquet/Arrow) or in a
+<name>.meta.json file next to a CSV. Tolerance entries that are not three
+numbers are left out of the metadata; as in the Excel report, every value
+of such a column passes.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from app.core.instrumentation import timed
+from app.core.table import FINAL_STATUS_COLUMN, FIXED_COLUMNS
+from app.core.validator import tolerance_values, validate_columns
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: CSV only
+    pa = None
+
+DATA_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".csv": "csv",
+}
+STATUS_SUFFIX = " Status"
+TIME_COLUMN = "Report_Time"
+METADATA_KEY = "gemstone_report"
+
+
+def data_format_for(path):
+    """'parquet', 'arrow' or 'csv' from the file extension (unknown extensions -> 'csv')."""
+    return DATA_FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def data_path_for(report_path):
+    """Data file to write next to an Excel report: Parquet if pyarrow is available, else CSV."""
+    return os.path.splitext(report_path)[0] + (".parquet" if pa is not None else ".csv")
+
+
+def _numeric_tolerances(tolerance_dict):
+    """{column: (nominal, plus, minus) floats} for the entries that are three numbers."""
+    numeric = {}
+    for col, entry in tolerance_dict.items():
+        values = tolerance_values(entry)
+        if values is not None:
+            numeric[col] = values
+    return numeric
+
+
+def _report_metadata(table, tolerances, creator, report_title):
+    return {
+        "title": report_title or "Master Gemstone Report",
+        "creator": creator or "",
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "rows": len(table),
+        "tolerances": {col: list(entry) for col, entry in tolerances.items()},
+    }
+
+
+def _status_codes(checks, pos):
+    """int8 codes for one checked column: 0 = PASS, 1 = FAIL, -1 = blank."""
+    codes = np.full(len(checks.passed), -1, dtype=np.int8)
+    codes[checks.passed[:, pos]] = 0
+    codes[checks.failed[:, pos]] = 1
+    return codes
+
+
+@timed("export data")
+def export_master_data(table, tolerance_dict, output_path, creator=None, report_title=None):
+    """
+    Export a MasterTable (e.g. Consolidator.table) with per-cell PASS/FAIL flags.
+
+    Args:
+        table: app.core.table.MasterTable
+        tolerance_dict: {col_name_with_unit: (nominal, plus, minus)}
+        output_path: .parquet, .arrow/.feather or .csv path
+        creator, report_title: stored with the tolerances as metadata
+
+    Returns:
+        Path of the written file; when pyarrow is missing, Parquet/Arrow
+        requests are written as CSV to the same path with a .csv extension.
+    """
+    fmt = data_format_for(output_path)
+    if fmt != "csv" and pa is None:
+        output_path = os.path.splitext(output_path)[0] + ".csv"
+        fmt = "csv"
+
+    tolerance_dict = tolerance_dict or {}
+    checks = validate_columns(table, tolerance_dict)
+    # Measurement column index in the table -> position in checks
+    check_pos = {idx - len(FIXED_COLUMNS): pos for pos, idx in enumerate(checks.indices)}
+    tolerances = _numeric_tolerances(tolerance_dict)
+    metadata = _report_metadata(table, tolerances, creator, report_title)
+
+    if fmt == "csv":
+        _write_csv(table, checks, check_pos, output_path)
+        with open(os.path.splitext(output_path)[0] + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+    else:
+        _write_arrow(table, tolerances, checks, check_pos, metadata, output_path, fmt)
+    return output_path
+
+
+def _write_csv(table, checks, check_pos, output_path):
+    header = list(FIXED_COLUMNS) + [TIME_COLUMN]
+    for j, name in enumerate(table.measurement_names):
+        header.append(name)
+        if j in check_pos:
+            header.append(name + STATUS_SUFFIX)
+    header.append(FINAL_STATUS_COLUMN)
+
+    labels = ("PASS", "FAIL", "")  # indexed by status code (-1 -> "")
+    columns = [
+        [str(v) for v in table.source_ids],
+        [str(v) for v in table.runtimes],
+        [v.isoformat() if v is not None else "" for v in table.runtime_times],
+    ]
+    for j in range(len(table.measurement_names)):
+        # Full-precision repr of each number; blank where there is no number
+        columns.append([repr(v) if ok else "" for v, ok in zip(table.values[j].tolist(), table.valid[j].tolist())])
+        if j in check_pos:
+            columns.append([labels[code] for code in _status_codes(checks, check_pos[j]).tolist()])
+    columns.append(np.where(checks.row_failed, "FAIL", "PASS").tolist())
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(zip(*columns))
+
+
+def _write_arrow(table, tolerances, checks, check_pos, metadata, output_path, fmt):
+    status_type = pa.dictionary(pa.int8(), pa.string())
+    status_labels = pa.array(["PASS", "FAIL"], type=pa.string())
+
+    def status_array(codes):
+        return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), status_labels)
+
+    fields = [pa.field(name, pa.string()) for name in FIXED_COLUMNS] + [pa.field(TIME_COLUMN, pa.timestamp("s"))]
+    arrays = [
+        pa.array([str(v) for v in table.source_ids], type=pa.string()),
+        pa.array([str(v) for v in table.runtimes], type=pa.string()),
+        pa.array(table.runtime_times, type=pa.timestamp("s")),
+    ]
+    for j, name in enumerate(table.measurement_names):
+        field_meta = None
+        if name in tolerances:
+            nominal, plus, minus = tolerances[name]
+            field_meta = {"nominal": str(nominal), "plus": str(plus), "minus": str(minus)}
+        fields.append(pa.field(name, pa.float64(), metadata=field_meta))
+        arrays.append(pa.array(table.values[j], type=pa.float64(), mask=~table.valid[j]))
+        if j in check_pos:
+            fields.append(pa.field(name + STATUS_SUFFIX, status_type))
+            arrays.append(status_array(_status_codes(checks, check_pos[j])))
+    fields.append(pa.field(FINAL_STATUS_COLUMN, status_type, nullable=False))
+    arrays.append(status_array(checks.row_failed.astype(np.int8)))
+
+    schema = pa.schema(fields, metadata={METADATA_KEY: json.dumps(metadata, ensure_ascii=False)})
+    data = pa.Table.from_arrays(arrays, schema=schema)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(data, output_path)
+    else:
+        with pa.OSFile(output_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(data)
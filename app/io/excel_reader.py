@@ -0,0 +1,254 @@
+# excel_reader.py
+
+import posixpath
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.etree import ElementTree
+
+import openpyxl
+
+# Rows read while sniffing for the Type/Value header during upload checks
+HEADER_SNIFF_ROWS = 200
+
+WorkbookCheck = namedtuple("WorkbookCheck", ["ok", "error", "has_header"])
+WorkbookCheck.__doc__ = """
+Result of check_workbook.
+    ok:         True if the file is a readable .xlsx workbook
+    error:      reason it is not (None when ok)
+    has_header: a 'Type'/'Value' header row was found near the top of the sheet
+"""
+
+
+def is_header_row(row):
+    """True if the row is the measurement table header (has 'Type' and 'Value')."""
+    return bool(row) and ("Type" in row and "Value" in row)
+
+
+def iter_sheet_rows(file_path, read_only=True, max_rows=None):
+    """
+    Stream value tuples from the active sheet of an input Excel file.
+
+    In read-only mode openpyxl parses the sheet XML lazily, so only the
+    current row is held in memory. Dimensions are reset because some
+    measurement machines write a wrong <dimension> tag, which would make
+    read-only mode truncate rows. Rows are therefore NOT padded to a
+    common width; missing rows are yielded as empty tuples.
+
+    Args:
+        file_path: Path to the .xlsx file
+        read_only: Use openpyxl read-only (streaming) mode; False loads the full workbook
+        max_rows: Stop after this many rows (None = whole sheet)
+
+    Yields:
+        tuple of cell values per row, starting at row 1
+    """
+    wb = openpyxl.load_workbook(file_path, read_only=read_only, data_only=True)
+    try:
+        ws = wb.active
+        if read_only:
+            ws.reset_dimensions()
+        for idx, row in enumerate(ws.iter_rows(values_only=True)):
+            if max_rows is not None and idx >= max_rows:
+                break
+            yield tuple(row)
+    finally:
+        wb.close()
+
+
+def read_header_and_sample(file_path, read_only=True):
+    """
+    Stream rows until the 'Type'/'Value' header and the first non-empty
+    data row after it are found, then stop reading.
+    Returns: (headers tuple, sample tuple) - either may be None
+    """
+    headers, sample = None, None
+    rows = iter_sheet_rows(file_path, read_only=read_only)
+    try:
+        for row in rows:
+            if headers is None:
+                if is_header_row(row):
+                    headers = row
+                continue
+            if row and any(cell is not None for cell in row):
+                sample = row
+                break
+    finally:
+        rows.close()
+    return headers, sample
+
+
+def _local(tag):
+    """Tag without its XML namespace (transitional and strict OOXML use different ones)."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _column_number(ref):
+    """1-based column of a cell reference ('C12' -> 3)."""
+    number = 0
+    for char in ref:
+        if char.isdigit():
+            break
+        number = number * 26 + ord(char.upper()) - 64
+    return number
+
+
+def _cell_text(cell):
+    """Text of a <v> or inline <is> string element tree."""
+    parts = []
+    for child in cell:
+        name = _local(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+        # 'rPh' (phonetic runs) is not part of the value
+    return "".join(parts)
+
+
+def _active_sheet_part(archive):
+    """Zip member name of the workbook's active sheet (the one openpyxl's wb.active returns)."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    active = 0
+    sheet_ids = []
+    for element in workbook.iter():
+        name = _local(element.tag)
+        if name == "workbookView" and not sheet_ids:
+            active = int(element.get("activeTab", 0))
+        elif name == "sheet":
+            sheet_ids.append(next(value for key, value in element.attrib.items() if _local(key) == "id"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels}
+    target = targets[sheet_ids[min(active, len(sheet_ids) - 1)]]
+    return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+
+
+def _shared_strings(archive):
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, element in ElementTree.iterparse(f):
+            if _local(element.tag) == "si":
+                strings.append(_cell_text(element))
+                element.clear()
+    return strings
+
+
+def _cell_value(cell, shared):
+    """Cell value as openpyxl returns it with data_only=True (dates and styles aside)."""
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        for child in cell:
+            if _local(child.tag) == "is":
+                return _cell_text(child)
+        return None
+    value = None
+    for child in cell:
+        if _local(child.tag) == "v":
+            value = child.text
+    if value is None:
+        return None
+    if kind == "s":
+        return shared[int(value)]
+    if kind == "b":
+        return bool(int(value))
+    if kind == "n":
+        return float(value) if "." in value or "E" in value or "e" in value else int(value)
+    return value
+
+
+def iter_type_values(file_path):
+    """
+    Stream (Type, Value) cell pairs from the rows below the 'Type'/'Value'
+    header of an input Excel file, reading the active sheet's XML directly:
+    below the header only the cells of the Type and Value columns are
+    decoded, which is several times faster than openpyxl's row streaming.
+    Nothing is yielded without a header. Raises on workbooks laid out in a
+    way this reader doesn't know; callers fall back to iter_sheet_rows.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_part = _active_sheet_part(archive)
+        shared = _shared_strings(archive)
+        type_col = value_col = None
+        with archive.open(sheet_part) as f:
+            parent = row_tag = None
+            for event, element in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if parent is None and _local(element.tag) == "sheetData":
+                        parent = element
+                        row_tag = element.tag[:-len("sheetData")] + "row"
+                    continue
+                if element.tag != row_tag:
+                    continue
+                if type_col is None:
+                    # Before the header: decode the whole row, as openpyxl would
+                    cells, column = {}, 0
+                    for cell in element:
+                        ref = cell.get("r")
+                        column = _column_number(ref) if ref else column + 1
+                        cells[column] = _cell_value(cell, shared)
+                    values = list(cells.values())
+                    if "Type" in values and "Value" in values:
+                        by_value = {value: col for col, value in sorted(cells.items(), reverse=True)}
+                        type_col, value_col = by_value["Type"], by_value["Value"]
+                else:
+                    m_type = m_value = None
+                    column = 0
+                    for cell in element:
+                        ref = cell.get("r")
+                        column = _column_number(ref) if ref else column + 1
+                        if column == type_col:
+                            m_type = _cell_value(cell, shared)
+                        elif column == value_col:
+                            m_value = _cell_value(cell, shared)
+                    yield m_type, m_value
+                if parent is not None:
+                    parent.clear()
+
+
+def check_workbook(file_path):
+    """
+    Fast structural check used when files are added, instead of loading the
+    whole workbook: the file must be a valid zip archive containing the
+    workbook part, and the active sheet must be readable. Only the first
+    HEADER_SNIFF_ROWS rows are streamed, to look for the Type/Value header.
+    Returns: WorkbookCheck
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            if "xl/workbook.xml" not in names:
+                return WorkbookCheck(False, "Not an Excel workbook (xl/workbook.xml missing)", False)
+            # CRC-check the workbook part itself; sheet data is verified as it streams
+            archive.read("xl/workbook.xml")
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        return WorkbookCheck(False, f"Corrupt or not an .xlsx file: {e}", False)
+    except OSError as e:
+        return WorkbookCheck(False, str(e), False)
+
+    try:
+        rows = iter_sheet_rows(file_path, max_rows=HEADER_SNIFF_ROWS)
+        try:
+            has_header = any(is_header_row(row) for row in rows)
+        finally:
+            rows.close()
+    except Exception as e:
+        return WorkbookCheck(False, f"{type(e).__name__}: {e}", False)
+    return WorkbookCheck(True, None, has_header)
+
+
+def check_workbooks(file_paths, max_workers=8):
+    """
+    Run check_workbook over many files concurrently.
+    Yields: (file_path, WorkbookCheck) in completion order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(check_workbook, path): path for path in file_paths}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Consumer stopped early: don't start checks nobody will read
+            for future in futures:
+                future.cancel()
@@ -1,71 +1,239 @@
 from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.borders import DEFAULT_BORDER
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import os
 
+from app.core.validator import validate_columns, validate_table
+from app.core.instrumentation import stage, timed
+from app.core.naming import map_symbol
 
 
-def map_symbol(name):
-    """Map measurement type names to include appropriate units."""
-    if "(" in name and ")" in name:
-        return name  # Already has units
-    
-    if "Diameter" in name or "Distance" in name:
-        return f"{name} (mm)"
-    elif "Concentricity" in name:
-        return f"{name} (⟳)"
-    elif "Angle" in name:
-        return f"{name} (°)"
-    
-    return name
+# ========== SHARED REPORT STYLES ==========
+# Built once at import. Each export registers them as named styles on its
+# workbook and cells refer to them by name, so styling a cell is a single
+# lookup instead of hashing a Font, Fill, Border and Alignment every time.
+THIN_BORDER = Border(
+    left=Side(style="thin", color="000000"),
+    right=Side(style="thin", color="000000"),
+    top=Side(style="thin", color="000000"),
+    bottom=Side(style="thin", color="000000"),
+)
+CENTER = Alignment(horizontal="center", vertical="center")
+CENTER_WRAP = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+REPORT_STYLES = {
+    # Title section
+    "Report Title": dict(
+        font=Font(size=20, bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid"),
+        alignment=CENTER_WRAP,
+        border=DEFAULT_BORDER,
+    ),
+    "Report Creator": dict(font=Font(size=11, color="1F4E78"), alignment=CENTER_WRAP, border=DEFAULT_BORDER),
+    # Tolerance reference table
+    "Tolerance Header": dict(
+        font=Font(bold=True, size=10, color="000000"),
+        fill=PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
+        alignment=CENTER_WRAP,
+        border=THIN_BORDER,
+    ),
+    "Tolerance Table Label": dict(
+        font=Font(size=10, bold=True, color="000000"),
+        fill=PatternFill(start_color="92D050", end_color="92D050", fill_type="solid"),
+        alignment=CENTER_WRAP,
+        border=THIN_BORDER,
+    ),
+    "Tolerance Label": dict(font=Font(size=10, bold=True, color="000000"), alignment=CENTER, border=THIN_BORDER),
+    "Tolerance Value": dict(font=Font(size=10, color="000000"), alignment=CENTER, border=THIN_BORDER),
+    "Nominal": dict(font=Font(size=10, bold=True, color="00B050"), alignment=CENTER, border=THIN_BORDER),
+    # Legend and data table header
+    "Report Legend": dict(
+        font=Font(size=11, color="000000"),
+        fill=PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid"),
+        alignment=CENTER_WRAP,
+        border=THIN_BORDER,
+    ),
+    "Report Header": dict(
+        font=Font(bold=True, size=11, color="000000"),
+        fill=PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid"),  # LIGHT BLUE
+        alignment=CENTER_WRAP,
+        border=THIN_BORDER,
+    ),
+    # Data cells: neutral/pass = black text, fail = red text, numbers shown with 2 decimals
+    "Data Text": dict(font=Font(color="000000"), alignment=CENTER, border=THIN_BORDER),
+    "Data Number": dict(font=Font(color="000000"), alignment=CENTER, border=THIN_BORDER, number_format="0.00"),
+    "Data Text Fail": dict(font=Font(color="FF0000", bold=True), alignment=CENTER, border=THIN_BORDER),
+    "Data Number Fail": dict(
+        font=Font(color="FF0000", bold=True), alignment=CENTER, border=THIN_BORDER, number_format="0.00"
+    ),
+    # Final Status: green = PASS, red = FAIL
+    "Status Pass": dict(
+        font=Font(color="FFFFFF", bold=True),
+        fill=PatternFill(start_color="00B050", end_color="00B050", fill_type="solid"),
+        alignment=CENTER,
+        border=THIN_BORDER,
+    ),
+    "Status Fail": dict(
+        font=Font(color="FFFFFF", bold=True),
+        fill=PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid"),
+        alignment=CENTER,
+        border=THIN_BORDER,
+    ),
+}
 
 
+def _register_report_styles(wb):
+    """Add REPORT_STYLES to a workbook as named styles (NamedStyle objects bind to one workbook)."""
+    for name, attrs in REPORT_STYLES.items():
+        wb.add_named_style(NamedStyle(name=name, **attrs))
 
-def normalize_header(header):
-    """Normalize header by removing units for tolerance dict lookup."""
-    clean = (
-        header.replace("(mm)", "")
-        .replace("(⟳)", "")
-        .replace("(°)", "")
-        .strip()
-    )
-    return clean
 
+def _cell(ws, value=None, style=None):
+    """Create a cell with a named report style, for a normal or write-only sheet."""
+    cell = WriteOnlyCell(ws)
+    if style is not None:
+        cell.style = style
+    # Set after the style so date values still get a date number format
+    cell.value = value
+    return cell
 
 
-def is_value_pass(value, tolerance_entry):
+def _merge(ws, start_row, start_column, end_row, end_column):
+    """Merge a cell range; write-only sheets only record the range."""
+    if isinstance(ws, WriteOnlyWorksheet):
+        ws.merged_cells.add(
+            f"{get_column_letter(start_column)}{start_row}:{get_column_letter(end_column)}{end_row}"
+        )
+    else:
+        ws.merge_cells(start_row=start_row, start_column=start_column, end_row=end_row, end_column=end_column)
+
+
+# Longest sheet name Excel accepts
+SHEET_NAME_MAX = 31
+CHUNK_MODES = ("rows", "ids")
+
+
+def extract_file_id(file_val):
+    """Extract numeric file ID from a first-column value (0 if it isn't numeric)."""
+    file_val = str(file_val).replace(".xlsx", "").replace(".xls", "").strip()
+    try:
+        return int(file_val)
+    except ValueError:
+        return 0
+
+
+def plan_report_chunks(file_ids, chunk_size, chunk_by="rows"):
     """
-    Check if a value is within tolerance range.
-    Validates using 3 decimal places with 0.005 rounding margin.
+    Split report rows (already sorted by file ID) into chunks.
     
     Args:
-        value: The measurement value to check
-        tolerance_entry: Tuple of (nominal, plus, minus)
+        file_ids: numeric file ID of each row, in report order
+        chunk_size: rows per chunk (chunk_by="rows") or width of each
+            file-ID range (chunk_by="ids", e.g. 1000 -> IDs 0-999, 1000-1999, ...)
+        chunk_by: "rows" or "ids"
     
     Returns:
-        True if within tolerance, False otherwise
+        list of (label, start, stop) row ranges; a single (None, 0, n) without chunk_size
+    """
+    row_count = len(file_ids)
+    if not chunk_size or chunk_size <= 0:
+        return [(None, 0, row_count)]
+    if chunk_by not in CHUNK_MODES:
+        raise ValueError(f"chunk_by must be one of {CHUNK_MODES}, not {chunk_by!r}")
+    
+    chunks = []
+    if chunk_by == "rows":
+        for start in range(0, row_count, chunk_size):
+            stop = min(start + chunk_size, row_count)
+            chunks.append((f"Rows {start + 1}-{stop}", start, stop))
+        return chunks or [(None, 0, 0)]
+    
+    # Rows are sorted by file ID, so each ID range is a contiguous run of rows
+    start = 0
+    while start < row_count:
+        bucket = file_ids[start] // chunk_size
+        stop = start + 1
+        while stop < row_count and file_ids[stop] // chunk_size == bucket:
+            stop += 1
+        low = bucket * chunk_size
+        chunks.append((f"IDs {low}-{low + chunk_size - 1}", start, stop))
+        start = stop
+    return chunks or [(None, 0, 0)]
+
+
+def _prepare_report(files, all_data, col_names, table):
+    """
+    Common input handling for the report writers.
+    Returns: (master_headers, data, file_ids) where data is the sorted list of
+    rows, or the MasterTable in report order when table is given.
     """
-    # Skip empty, None, or dash values
-    if value is None or value == "" or value == "-":
-        return True  # Don't mark empty cells as fail
+    if table is not None:
+        col_names = table.colnames
     
-    try:
-        # Round to 3 decimals for validation
-        val_rounded = round(float(value), 3)
-        nominal, plus, minus = [float(x) for x in tolerance_entry]
-        
-        # Calculate bounds with 0.005 margin (for 3-decimal rounding tolerance)
-        lower_bound = round(nominal - minus - 0.005, 3)  # e.g., 0 - 0.05 - 0.005 = -0.055
-        upper_bound = round(nominal + plus + 0.005, 3)   # e.g., 0 + 0.05 + 0.005 = 0.055
-        
-        # Check if rounded value is within expanded bounds
-        return lower_bound <= val_rounded <= upper_bound
+    # Prepare master headers with unit symbols
+    master_headers = [map_symbol(c) for c in col_names] if col_names else []
     
-    except (ValueError, TypeError):
-        return True  # Non-numeric values pass (don't fail)
+    # Ensure "Final Status" column is present
+    if master_headers and master_headers[-1] != "Final Status":
+        master_headers.append("Final Status")
+    elif not master_headers:
+        master_headers = ["Final Status"]
+    
+    if table is not None:
+        # Sort rows by numeric file ID (first column)
+        file_ids = [extract_file_id(source_id) for source_id in table.source_ids]
+        order = sorted(range(len(table)), key=file_ids.__getitem__)
+        if order != list(range(len(table))):
+            table = table.take(order)
+            file_ids = [file_ids[r] for r in order]
+        return master_headers, table, file_ids
+    
+    # Aggregate data from all files
+    master_data_rows = []
+    for file in files:
+        if file in all_data and all_data[file]:
+            master_data_rows.extend(all_data[file])
+    
+    # Sort rows by numeric file ID (first column)
+    master_data_rows.sort(key=lambda row: extract_file_id(row[0]) if row else 0)
+    file_ids = [extract_file_id(row[0]) if row else 0 for row in master_data_rows]
+    return master_headers, master_data_rows, file_ids
+
+
+def _report_texts(creator, report_title):
+    """(title, creator line) shown at the top of every report sheet."""
+    title_text = f"{report_title}" if report_title else "Master Gemstone Report"
+    if creator:
+        creator_text = f"Inspector: {creator} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    else:
+        creator_text = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    return title_text, creator_text
+
+
+def _new_report_workbook(write_only):
+    wb = Workbook(write_only=True) if write_only else Workbook()
+    _register_report_styles(wb)
+    return wb
+
 
+def _add_report_sheet(wb, title, first):
+    if first and wb.active is not None:  # write-only workbooks start without sheets
+        ws = wb.active  # reuse the default sheet of a normal workbook
+        ws.title = title
+        return ws
+    return wb.create_sheet(title)
 
 
+def _sheet_title(label):
+    return "Master Report" if label is None else f"Master {label}"[:SHEET_NAME_MAX]
+
+
+@timed("export report")
 def export_master_report(
     files,
     all_headers,
@@ -75,10 +243,27 @@ def export_master_report(
     output_path=None,
     creator=None,
     report_title=None,
+    write_only=True,
+    table=None,
+    chunk_size=None,
+    chunk_by="rows",
 ):
     """
     Export consolidated master report with tolerance checking and color coding.
     
+    Rows are emitted top to bottom as pre-styled cells. With write_only=True
+    (default) openpyxl streams each row to disk as it is appended, so memory
+    stays flat however many rows the report has.
+    
+    The data can be given either as rows (files/all_headers/all_data/col_names)
+    or as a columnar app.core.table.MasterTable (table=, e.g. Consolidator.table),
+    in which case it is validated from its float vectors and turned into rows
+    a block at a time while writing.
+    
+    With chunk_size, rows are split over several sheets (see plan_report_chunks),
+    each with its own title and tolerance header; export_master_report_parts
+    writes the chunks to separate files instead.
+    
     Args:
         files: List of source file names
         all_headers: Dict of headers per file
@@ -88,6 +273,10 @@ def export_master_report(
         output_path: Path to save Excel file
         creator: Creator/Inspector name
         report_title: Title for the report
+        write_only: Stream rows with a write-only workbook (False = build in memory)
+        table: MasterTable to export instead of files/all_headers/all_data/col_names
+        chunk_size: Split rows over sheets of this many rows / file-ID range width
+        chunk_by: "rows" or "ids"
     
     Returns:
         Path to the saved Excel file
@@ -98,341 +287,247 @@ def export_master_report(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = f"Master_Report_{timestamp}.xlsx"
     
-    # Prepare master headers with unit symbols
-    master_headers = [map_symbol(c) for c in col_names] if col_names else []
-    
-    # Ensure "Final Status" column is present
-    if master_headers and master_headers[-1] != "Final Status":
-        master_headers.append("Final Status")
-    elif not master_headers:
-        master_headers = ["Final Status"]
-    
-    # Aggregate data from all files
-    master_data_rows = []
-    for file in files:
-        if file in all_data and all_data[file]:
-            master_data_rows.extend(all_data[file])
+    with stage("sort rows"):
+        master_headers, data, file_ids = _prepare_report(files, all_data, col_names, table)
     
     # Handle empty data case
-    if not master_headers or not master_data_rows:
+    if not master_headers or not len(data):
         wb = Workbook()
         ws = wb.active
         ws.append(["No data available"])
         wb.save(output_path)
         return output_path
     
-    # Sort rows by numeric file ID (first column)
-    def extract_file_id(row):
-        """Extract numeric file ID from first column."""
-        if not row:
-            return 0
-        file_val = str(row[0]).replace(".xlsx", "").replace(".xls", "").strip()
-        try:
-            return int(file_val)
-        except ValueError:
-            return 0
-    
-    master_data_rows.sort(key=extract_file_id)
-    
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Master Report"
+    title_text, creator_text = _report_texts(creator, report_title)
+    wb = _new_report_workbook(write_only)
+    for i, (label, start, stop) in enumerate(plan_report_chunks(file_ids, chunk_size, chunk_by)):
+        ws = _add_report_sheet(wb, _sheet_title(label), first=i == 0)
+        _write_master_sheet(ws, master_headers, _chunk(data, start, stop), tolerance_dict,
+                            _chunk_title(title_text, label), creator_text)
     
-    last_col_idx = len(master_headers)
+    # ========== SAVE WORKBOOK ==========
+    with stage("save workbook"):
+        wb.save(output_path)
     
-    # ========== TITLE SECTION ==========
-    # Row 1: Report Title (merged, large font, bold, centered)
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=last_col_idx)
-    title_cell = ws.cell(row=1, column=1)
+    return output_path
+
+
+@timed("export report parts")
+def export_master_report_parts(
+    files,
+    all_headers,
+    all_data,
+    tolerance_dict,
+    chunk_size,
+    chunk_by="rows",
+    col_names=None,
+    output_path=None,
+    creator=None,
+    report_title=None,
+    write_only=True,
+    table=None,
+    max_workers=None,
+):
+    """
+    Like export_master_report with chunk_size, but each chunk is saved as its
+    own workbook (<output stem>_<chunk label>.xlsx, e.g. Week42_IDs_1000-1999.xlsx),
+    each with its own title and tolerance header. Workbooks are written in
+    parallel worker processes (openpyxl is pure Python and CPU-bound).
     
-    if report_title:
-        title_cell.value = f"{report_title}"
-    else:
-        title_cell.value = "Master Gemstone Report"
+    Args:
+        max_workers: worker processes (None = CPU count, 1 = write in this process)
+        (others as for export_master_report)
     
-    title_cell.font = Font(size=20, bold=True, color="FFFFFF")
-    title_cell.fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-    title_cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    ws.row_dimensions[1].height = 30
+    Returns:
+        list of saved file paths, in row order
+    """
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = f"Master_Report_{timestamp}.xlsx"
     
-    # Row 2: Creator and Timestamp (merged, centered)
-    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=last_col_idx)
-    creator_cell = ws.cell(row=2, column=1)
+    master_headers, data, file_ids = _prepare_report(files, all_data, col_names, table)
+    if not master_headers or not len(data):
+        return [export_master_report([], {}, {}, tolerance_dict, output_path=output_path)]
+    
+    title_text, creator_text = _report_texts(creator, report_title)
+    stem, ext = os.path.splitext(output_path)
+    jobs = []
+    for label, start, stop in plan_report_chunks(file_ids, chunk_size, chunk_by):
+        path = output_path if label is None else f"{stem}_{label.replace(' ', '_')}{ext or '.xlsx'}"
+        jobs.append((path, master_headers, _chunk(data, start, stop), tolerance_dict,
+                     _chunk_title(title_text, label), creator_text, write_only))
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+    if max_workers <= 1:
+        return [_save_report_part(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_save_report_part, *zip(*jobs)))
+
+
+def _chunk_title(title_text, label):
+    return title_text if label is None else f"{title_text} ({label})"
+
+
+def _chunk(data, start, stop):
+    """Rows start:stop of a sorted row list or a MasterTable."""
+    if start == 0 and stop == len(data):
+        return data
+    if isinstance(data, list):
+        return data[start:stop]
+    return data.take(range(start, stop))
+
+
+def _save_report_part(path, master_headers, data, tolerance_dict, title_text, creator_text, write_only):
+    """Worker entry point for export_master_report_parts: one chunk -> one workbook."""
+    wb = _new_report_workbook(write_only)
+    ws = _add_report_sheet(wb, "Master Report", first=True)
+    _write_master_sheet(ws, master_headers, data, tolerance_dict, title_text, creator_text)
+    wb.save(path)
+    return path
+
+
+def _write_master_sheet(ws, master_headers, data, tolerance_dict, title_text, creator_text):
+    """
+    Write one complete report sheet: title, creator line, tolerance table,
+    legend, header and data rows (a sorted row list or a MasterTable).
+    """
+    last_col_idx = len(master_headers)
     
-    if creator:
-        creator_cell.value = f"Inspector: {creator} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    else:
-        creator_cell.value = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    # ========== SET COLUMN WIDTHS ==========
+    # (must be set before any row is written in write-only mode)
+    for col_idx, header in enumerate(master_headers, start=1):
+        col_letter = get_column_letter(col_idx)
+        # Width based on header length, minimum 15
+        ws.column_dimensions[col_letter].width = max(15, len(str(header)) + 3)
+    
+    # Set file ID column width
+    ws.column_dimensions["A"].width = 12
     
-    creator_cell.font = Font(size=11, color="1F4E78")
-    creator_cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    ws.row_dimensions[2].height = 20
+    # Rows are numbered as they are appended (write-only sheets have no max_row)
+    row_num = 0
     
-    # Blank row for spacing
-    ws.append([])
+    def append_row(cells, height=None):
+        nonlocal row_num
+        row_num += 1
+        if height is not None:
+            ws.row_dimensions[row_num].height = height
+        ws.append(cells)
+        return row_num
+    
+    # ========== TITLE SECTION ==========
+    # Row 1: Report Title (merged, large font, bold, centered)
+    title_row = append_row([_cell(ws, title_text, "Report Title")], height=30)
+    _merge(ws, title_row, 1, title_row, last_col_idx)
+    
+    # Row 2: Creator and Timestamp (merged, centered)
+    creator_row = append_row([_cell(ws, creator_text, "Report Creator")], height=20)
+    _merge(ws, creator_row, 1, creator_row, last_col_idx)
     
     # ========== TOLERANCE REFERENCE TABLE ==========
     if tolerance_dict:
         # Get tolerance column names and map them
         tol_column_names = list(tolerance_dict.keys())
         tol_column_mapped = [map_symbol(name) for name in tol_column_names]
-        tol_count = len(tol_column_mapped)
-        
-        # Define colors and borders
-        thin_border = Border(
-            left=Side(style="thin", color="000000"),
-            right=Side(style="thin", color="000000"),
-            top=Side(style="thin", color="000000"),
-            bottom=Side(style="thin", color="000000"),
-        )
-        
-        # Row 4: Tolerance header titles (C...last) - LIGHT GREEN BACKGROUND ONLY
-        tol_header_row = ws.max_row + 1
-        header_row_values = ["", ""] + tol_column_mapped
-
-
-        # Create row cells manually with light green background for C onwards
-        for col_idx, value in enumerate(header_row_values, start=1):
-            cell = ws.cell(row=tol_header_row, column=col_idx)
-            cell.value = value
-            
-            # Apply light green background ONLY to columns C onwards (col_idx >= 3)
-            if col_idx >= 3:
-                cell.font = Font(bold=True, size=10, color="000000")
-                cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-                cell.border = thin_border
-
-
-        # Row 5: Tolerance + row - WHITE BACKGROUND (NOT GREEN)
-        tol_plus_row = ws.max_row + 1
-        upper_values = ["PLACEHOLDER_FOR_MERGE", "Tolerance +"]
-        for tol_name in tol_column_names:
-            nominal, plus, minus = [float(x) for x in tolerance_dict[tol_name]]
-            upper_values.append(round(nominal + plus, 2))
-        ws.append(upper_values)
-        
-        # B5: Tolerance + label - WHITE background, black text
-        tol_plus_label = ws.cell(row=tol_plus_row, column=2)
-        tol_plus_label.value = "Tolerance +"
-        tol_plus_label.font = Font(size=10, bold=True, color="000000")
-        tol_plus_label.alignment = Alignment(horizontal="center", vertical="center")
-        tol_plus_label.border = thin_border
-        
-        # C...last: upper values - WHITE background, black text
-        for col_idx in range(3, 3 + tol_count):
-            cell = ws.cell(row=tol_plus_row, column=col_idx)
-            cell.font = Font(size=10, color="000000")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-        
-        # Row 6: Nominal row - WHITE background, GREEN TEXT
-        nominal_row = ws.max_row + 1
-        nominal_values = ["PLACEHOLDER_FOR_MERGE", "Nominal"]
-        for tol_name in tol_column_names:
-            nominal, plus, minus = [float(x) for x in tolerance_dict[tol_name]]
-            nominal_values.append(round(nominal, 2))
-        ws.append(nominal_values)
-        
-        # B6: "Nominal" - WHITE background, green text, bold
-        nominal_label = ws.cell(row=nominal_row, column=2)
-        nominal_label.value = "Nominal"
-        nominal_label.font = Font(size=10, bold=True, color="00B050")
-        nominal_label.alignment = Alignment(horizontal="center", vertical="center")
-        nominal_label.border = thin_border
-        
-        # C...last: nominal values - WHITE background, green text, bold
-        for col_idx in range(3, 3 + tol_count):
-            cell = ws.cell(row=nominal_row, column=col_idx)
-            cell.font = Font(size=10, bold=True, color="00B050")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-        
-        # Row 7: Tolerance - row - WHITE background, black text
-        tol_minus_row = ws.max_row + 1
-        lower_values = ["PLACEHOLDER_FOR_MERGE", "Tolerance -"]
-        for tol_name in tol_column_names:
-            nominal, plus, minus = [float(x) for x in tolerance_dict[tol_name]]
-            lower_values.append(round(nominal - minus, 2))
-        ws.append(lower_values)
+        tol_entries = [[float(x) for x in tolerance_dict[name]] for name in tol_column_names]
         
-        # B7: "Tolerance -" - WHITE background, bold black
-        tol_minus_label = ws.cell(row=tol_minus_row, column=2)
-        tol_minus_label.value = "Tolerance -"
-        tol_minus_label.font = Font(size=10, bold=True, color="000000")
-        tol_minus_label.alignment = Alignment(horizontal="center", vertical="center")
-        tol_minus_label.border = thin_border
+        # Row 3: Tolerance header titles (C...last) - LIGHT GREEN BACKGROUND ONLY
+        header_cells = [_cell(ws, ""), _cell(ws, "")]
+        for value in tol_column_mapped:
+            header_cells.append(_cell(ws, value, "Tolerance Header"))
+        append_row(header_cells)
         
-        # C...last: lower values - WHITE background, black text
-        for col_idx in range(3, 3 + tol_count):
-            cell = ws.cell(row=tol_minus_row, column=col_idx)
-            cell.font = Font(size=10, color="000000")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-        
-        # === MERGE A5:A7 and apply styling AFTER merge ===
-        ws.merge_cells(start_row=tol_plus_row, start_column=1, end_row=tol_minus_row, end_column=1)
+        # Rows 4-6: Tolerance +, Nominal, Tolerance - (WHITE background)
+        # (label text, label style, value style, value for (nominal, plus, minus))
+        tolerance_rows = [
+            ("Tolerance +", "Tolerance Label", "Tolerance Value",
+             lambda nominal, plus, minus: round(nominal + plus, 2)),
+            # Nominal row - GREEN TEXT
+            ("Nominal", "Nominal", "Nominal",
+             lambda nominal, plus, minus: round(nominal, 2)),
+            ("Tolerance -", "Tolerance Label", "Tolerance Value",
+             lambda nominal, plus, minus: round(nominal - minus, 2)),
+        ]
+        tol_rows = []
+        for row_offset, (label, label_style, value_style, compute) in enumerate(tolerance_rows):
+            if row_offset == 0:
+                # Column A of rows 4-6 is merged into the GREEN "Tolerance Reference Table" label
+                first_cell = _cell(ws, "Tolerance\nReference\nTable", "Tolerance Table Label")
+            else:
+                first_cell = _cell(ws)
+            cells = [first_cell, _cell(ws, label, label_style)]
+            for nominal, plus, minus in tol_entries:
+                cells.append(_cell(ws, compute(nominal, plus, minus), value_style))
+            tol_rows.append(append_row(cells))
         
-        # Apply formatting to the MERGED cell - GREEN background
-        merged_label = ws.cell(row=tol_plus_row, column=1)
-        merged_label.value = "Tolerance\nReference\nTable"
-        merged_label.font = Font(size=10, bold=True, color="000000")
-        merged_label.fill = PatternFill(start_color="92D050", end_color="92D050", fill_type="solid")
-        merged_label.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        merged_label.border = thin_border
-    
-    # ========== LEGEND ROW ========== (FIXED: Append first, then merge and style)
-    legend_text = "Pass = Black Text, Fail = Red Text | Final Status: Green = PASS, Red = FAIL"
-    
-    # APPEND the legend row first with the text
-    legend_data = [legend_text] + [""] * (last_col_idx - 1)
-    ws.append(legend_data)
-    legend_row = ws.max_row
-    
-    # Now merge the cells
-    ws.merge_cells(start_row=legend_row, start_column=1, end_row=legend_row, end_column=last_col_idx)
-    
-    # Apply formatting to the merged cell
-    legend_cell = ws.cell(row=legend_row, column=1)
-    legend_cell.font = Font(size=11, color="000000")
-    legend_cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    legend_cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        # === MERGE A4:A6 ===
+        _merge(ws, tol_rows[0], 1, tol_rows[-1], 1)
+    else:
+        # Blank row for spacing (the tolerance table takes its place otherwise)
+        append_row([])
     
-    legend_border = Border(
-        left=Side(style="thin", color="000000"),
-        right=Side(style="thin", color="000000"),
-        top=Side(style="thin", color="000000"),
-        bottom=Side(style="thin", color="000000"),
-    )
-    legend_cell.border = legend_border
+    # ========== LEGEND ROW ==========
+    legend_text = "Pass = Black Text, Fail = Red Text | Final Status: Green = PASS, Red = FAIL"
+    legend_row = append_row([_cell(ws, legend_text, "Report Legend")] + [""] * (last_col_idx - 1))
+    _merge(ws, legend_row, 1, legend_row, last_col_idx)
     
     # ========== DATA TABLE HEADER ==========
-    header_row_num = ws.max_row + 1
-    ws.append(master_headers)
-    
-    # Style data table header - LIGHT BLUE background with BOLD BLACK text
-    header_font = Font(bold=True, size=11, color="000000")
-    header_fill = PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid")  # LIGHT BLUE
-    header_border = Border(
-        left=Side(style="thin", color="000000"),
-        right=Side(style="thin", color="000000"),
-        top=Side(style="thin", color="000000"),
-        bottom=Side(style="thin", color="000000"),
-    )
-    
-    for col_idx, header in enumerate(master_headers, start=1):
-        cell = ws.cell(row=header_row_num, column=col_idx)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        cell.border = header_border
-    
-    ws.row_dimensions[header_row_num].height = 25
-    
-    # ========== DEFINE COLOR FILLS AND FONTS ==========
-    pass_fill = PatternFill(start_color="00B050", end_color="00B050", fill_type="solid")
-    fail_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-    white_font = Font(color="FFFFFF", bold=True)
-    black_font = Font(color="000000")
-    red_text_font = Font(color="FF0000", bold=True)
-    
-    data_border = Border(
-        left=Side(style="thin", color="000000"),
-        right=Side(style="thin", color="000000"),
-        top=Side(style="thin", color="000000"),
-        bottom=Side(style="thin", color="000000"),
-    )
-    
-    # ========== DATA ROWS WITH TOLERANCE CHECKING ==========
-    for row_data in master_data_rows:
-        row_data_fixed = list(row_data) if row_data else []
-        
-        # Clean file name (remove extensions)
-        if row_data_fixed and isinstance(row_data_fixed[0], str):
-            row_data_fixed[0] = (
-                row_data_fixed[0]
-                .replace(".xlsx", "")
-                .replace(".xls", "")
-                .strip()
-            )
-        
-        # Pad to length-1 (excluding Final Status)
-        while len(row_data_fixed) < len(master_headers) - 1:
-            row_data_fixed.append("")
-        
-        # Add placeholder for Final Status if needed
-        if len(row_data_fixed) < len(master_headers):
-            row_data_fixed.append("")
-        
-        ws.append(row_data_fixed)
-        row_idx = ws.max_row
-        
-        row_fails = False
-        
-        # Check each value against tolerance
-        for col_idx, header in enumerate(master_headers, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            value = row_data_fixed[col_idx - 1] if col_idx - 1 < len(row_data_fixed) else ""
-            
-            cell.border = data_border
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Skip Final Status column for value checking
-            if header == "Final Status":
-                continue
-            
-            # ========== STORE FULL PRECISION, VALIDATE WITH 3 DECIMALS, DISPLAY 2 DECIMALS ==========
-            
-            # Store the FULL PRECISION value in the cell
-            if isinstance(value, (int, float)):
-                cell.value = float(value)  # Store full precision (e.g., 0.053237...)
-            else:
-                cell.value = value if value is not None else ""
+    # LIGHT BLUE background with BOLD BLACK text
+    append_row([_cell(ws, header, "Report Header") for header in master_headers], height=25)
+    
+    # ========== TOLERANCE CHECKING (whole table in one vectorized pass) ==========
+    # Uses header directly as key (already includes units from map_symbol);
+    # values are rounded to 3 decimals and checked with ±0.005 margin
+    with stage("validate"):
+        if isinstance(data, list):
+            checks = validate_table(data, master_headers, tolerance_dict)
+            master_data_rows = data
+        else:
+            checks = validate_columns(data, tolerance_dict)
+            master_data_rows = data.iter_rows()
+    failed_cells = checks.failed.tolist()
+    failed_rows = checks.row_failed.tolist()
+    check_pos = {idx: pos for pos, idx in enumerate(checks.indices)}
+    
+    # ========== DATA ROWS ==========
+    with stage("write rows"):
+        for data_idx, row_data in enumerate(master_data_rows):
+            row_data_fixed = list(row_data) if row_data else []
             
-            # Apply number format to DISPLAY only 2 decimal places
-            if isinstance(value, (int, float)) and value not in (None, "", "-"):
-                cell.number_format = '0.00'  # Display format: 2 decimals (shows as 0.05)
+            # Clean file name (remove extensions)
+            if row_data_fixed and isinstance(row_data_fixed[0], str):
+                row_data_fixed[0] = (
+                    row_data_fixed[0]
+                    .replace(".xlsx", "")
+                    .replace(".xls", "")
+                    .strip()
+                )
             
-            # Use header directly as key (already includes units from map_symbol)
-            clean_header = header
+            row_fails = failed_rows[data_idx]
+            row_failed_cells = failed_cells[data_idx]
+            cells = []
             
-            # Perform tolerance check using FULL PRECISION value
-            # is_value_pass will round to 3 decimals internally and check with ±0.005 margin
-            if clean_header in tolerance_dict and value not in (None, "", "-"):
-                if not is_value_pass(value, tolerance_dict[clean_header]):
-                    cell.font = red_text_font
-                    row_fails = True
+            for col_idx, header in enumerate(master_headers[:-1]):
+                value = row_data_fixed[col_idx] if col_idx < len(row_data_fixed) else ""
+                
+                # ========== STORE FULL PRECISION, VALIDATE WITH 3 DECIMALS, DISPLAY 2 DECIMALS ==========
+                
+                # Store the FULL PRECISION value in the cell, DISPLAY only 2 decimal places
+                # ("Data Number" displays 2 decimals, e.g. 0.053237... shows as 0.05)
+                if isinstance(value, (int, float)):
+                    cell_value = float(value)  # Store full precision
+                    style = "Data Number"
                 else:
-                    cell.font = black_font
-            else:
-                cell.font = black_font
-        
-        # ========== SET FINAL STATUS CELL ==========
-        final_status_cell = ws.cell(row=row_idx, column=len(master_headers))
-        
-        if row_fails:
-            final_status_cell.value = "Fail"
-            final_status_cell.fill = fail_fill
-            final_status_cell.font = white_font
-        else:
-            final_status_cell.value = "Pass"
-            final_status_cell.fill = pass_fill
-            final_status_cell.font = white_font
-        
-        final_status_cell.alignment = Alignment(horizontal="center", vertical="center")
-        final_status_cell.border = data_border
-    
-    # ========== SET COLUMN WIDTHS ==========
-    for col_idx, header in enumerate(master_headers, start=1):
-        col_letter = get_column_letter(col_idx)
-        # Width based on header length, minimum 15
-        ws.column_dimensions[col_letter].width = max(15, len(str(header)) + 3)
-    
-    # Set file ID column width
-    ws.column_dimensions["A"].width = 12
-    
-    # ========== SAVE WORKBOOK ==========
-    wb.save(output_path)
-    
-    return output_path
+                    cell_value = value if value is not None else ""
+                    style = "Data Text"
+                
+                pos = check_pos.get(col_idx)
+                if pos is not None and row_failed_cells[pos]:
+                    style += " Fail"
+                
+                cells.append(_cell(ws, cell_value, style))
+            
+            # ========== FINAL STATUS CELL ==========
+            cells.append(_cell(ws, "Fail" if row_fails else "Pass", "Status Fail" if row_fails else "Status Pass"))
+            append_row(cells)
@@ -0,0 +1,111 @@
+# bench_excel_writer.py
+"""
+Time export_master_report on a synthetic master table.
+
+    python -m benchmarks.bench_excel_writer --rows 10000 --cols 100
+    python -m benchmarks.bench_excel_writer --cprofile     # cProfile top 25
+    python -m benchmarks.bench_excel_writer --json writer.json   # results as JSON (see bench_pipeline)
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import sys
+import tempfile
+import time
+
+from app.io.excel_writer import export_master_report
+from benchmarks.bench_pipeline import results_record, write_results
+
+MEASUREMENT_TYPES = ["Diameter", "Distance", "Concentricity", "Angle", "Height"]
+
+
+def make_master_table(rows, cols, seed=0):
+    """Return (master_colnames, master_rows, tolerance_dict) with ~5% failing and ~2% blank cells."""
+    rng = random.Random(seed)
+    measurement_cols = []
+    for idx in range(cols):
+        m_type = MEASUREMENT_TYPES[idx % len(MEASUREMENT_TYPES)]
+        measurement_cols.append(f"{m_type} {idx // len(MEASUREMENT_TYPES) + 1}")
+    # Use the same unit mapping as the app for header/tolerance keys
+    from app.core.naming import map_symbol
+    mapped = [map_symbol(c) for c in measurement_cols]
+    colnames = ["Source_File", "Report_Runtime"] + mapped + ["Final Status"]
+    tolerance_dict = {c: (2.0, 0.05, 0.05) for c in mapped}
+
+    master_rows = []
+    for row_idx in range(rows):
+        row = [str(1000 + row_idx), "2025-12-02 10:30:00"]
+        for _ in mapped:
+            roll = rng.random()
+            if roll < 0.02:
+                row.append("")
+            elif roll < 0.07:
+                row.append(2.0 + rng.choice((-1, 1)) * rng.uniform(0.06, 0.2))
+            else:
+                row.append(2.0 + rng.uniform(-0.05, 0.05))
+        row.append("")
+        master_rows.append(row)
+    return colnames, master_rows, tolerance_dict
+
+
+def run_export(colnames, master_rows, tolerance_dict, output_path, **kwargs):
+    synthetic_key = "__master__"
+    return export_master_report(
+        files=[synthetic_key],
+        all_headers={synthetic_key: colnames},
+        all_data={synthetic_key: master_rows},
+        tolerance_dict=tolerance_dict,
+        col_names=colnames,
+        output_path=output_path,
+        creator="Benchmark",
+        report_title="Writer Benchmark",
+        **kwargs,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--cprofile", action="store_true", help="print cProfile stats for one export")
+    parser.add_argument("--json", metavar="PATH", help="save results as JSON ('-' = stdout)")
+    args = parser.parse_args(argv)
+
+    colnames, master_rows, tolerance_dict = make_master_table(args.rows, args.cols)
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "bench.xlsx")
+        if args.cprofile:
+            profiler = cProfile.Profile()
+            profiler.runcall(run_export, colnames, master_rows, tolerance_dict, output_path)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+            return 0
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            run_export(colnames, master_rows, tolerance_dict, output_path)
+            timings.append(time.perf_counter() - started)
+        size_mb = os.path.getsize(output_path) / 1e6
+
+    cells = args.rows * (args.cols + 3)
+    best = min(timings)
+    print(
+        f"export_master_report {args.rows} x {args.cols}: best {best:.2f}s of {args.repeat} "
+        f"({cells / best:,.0f} cells/s, {size_mb:.1f} MB)",
+        file=sys.stderr if args.json == "-" else sys.stdout,
+    )
+    if args.json:
+        record = results_record(
+            "excel_writer", {"rows": args.rows, "cols": args.cols}, {"write": timings},
+            output_mb=round(size_mb, 2),
+        )
+        write_results(record, args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+# bench_pipeline.py
+"""
+Time the whole pipeline on synthetic gem reports, one stage at a time:
+
+    parse        parse_reports() (no parse cache)
+    consolidate  Consolidator.build() + the MasterTable snapshot
+    validate     Consolidator.validate() against a tolerance per column
+    write        export_master_report() of the table
+
+    python -m benchmarks.bench_pipeline --files 500 --measurements 300
+    python -m benchmarks.bench_pipeline --json results.json --compare baseline.json
+
+Results are printed and, with --json, saved as JSON (stage timings, run
+parameters, git commit) so runs can be compared across commits. Reports are
+generated into a temporary directory unless --reports DIR is given; existing
+<file ID>.xlsx files in DIR are reused.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from app.core.consolidator import Consolidator
+from app.core.parser import parse_reports
+from app.io.excel_writer import export_master_report
+from benchmarks.gen_reports import (
+    FIRST_FILE_ID,
+    add_generator_arguments,
+    generate_reports,
+    generator_options,
+    report_tolerances,
+)
+
+STAGES = ("parse", "consolidate", "validate", "write")
+RESULTS_VERSION = 1
+
+
+def git_commit():
+    """Short hash of the checked-out commit (with '+dirty' for local changes), or None."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+dirty" if dirty else "")
+
+
+def results_record(benchmark, params, timings, **extra):
+    """
+    Machine-readable benchmark results.
+    timings: {stage: [seconds per repeat]}
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": params,
+        "stages": {
+            stage: {"best": min(runs), "median": statistics.median(runs), "runs": runs}
+            for stage, runs in timings.items()
+        },
+        **extra,
+    }
+
+
+def write_results(record, path):
+    """Save a results record as JSON ('-' = stdout)."""
+    text = json.dumps(record, indent=2)
+    if path == "-":
+        print(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+def print_comparison(record, baseline_path):
+    """Print best times against a saved results file (ratio < 1 = faster now)."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("params") != record["params"]:
+        print("note: baseline was run with different parameters", file=sys.stderr)
+    print(f"vs {baseline.get('commit') or baseline_path}:")
+    for stage, result in record["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        ratio = result["best"] / before["best"] if before["best"] else float("inf")
+        print(f"  {stage:<12} {before['best']:8.3f}s -> {result['best']:8.3f}s  x{ratio:.2f}")
+
+
+def run_pipeline(paths, tolerance_dict, output_path, workers=None):
+    """Run every stage once. Returns ({stage: seconds}, consolidator)."""
+    timings = {}
+
+    started = time.perf_counter()
+    parsed = parse_reports(paths, max_workers=workers, cache=None)
+    timings["parse"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    consolidator = Consolidator().build(parsed)
+    consolidator.table
+    timings["consolidate"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    consolidator.validate(tolerance_dict)
+    table = consolidator.table
+    timings["validate"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    export_master_report(
+        files=[],
+        all_headers={},
+        all_data={},
+        tolerance_dict=tolerance_dict,
+        table=table,
+        output_path=output_path,
+        creator="Benchmark",
+        report_title="Pipeline Benchmark",
+    )
+    timings["write"] = time.perf_counter() - started
+    return timings, consolidator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_arguments(parser)
+    parser.add_argument("--tolerance-every", type=int, default=1, help="tolerance on every Nth column")
+    parser.add_argument("--reports", metavar="DIR", help="generate reports here (and reuse them) instead of a temp dir")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="parse worker processes (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", metavar="PATH", help="save results as JSON ('-' = stdout)")
+    parser.add_argument("--compare", metavar="PATH", help="compare with results saved by an earlier --json run")
+    args = parser.parse_args(argv)
+
+    options = generator_options(args)
+    tolerance_dict = report_tolerances(args.measurements, args.distinct_types, args.tolerance_every)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report_dir = args.reports or os.path.join(tmp, "reports")
+        started = time.perf_counter()
+        expected = [os.path.join(report_dir, f"{FIRST_FILE_ID + i}.xlsx") for i in range(args.files)]
+        if args.reports and all(os.path.exists(path) for path in expected):
+            paths = expected
+        else:
+            paths = generate_reports(report_dir, **options)
+        generated = time.perf_counter() - started
+
+        output_path = os.path.join(tmp, "bench.xlsx")
+        timings = {stage: [] for stage in STAGES}
+        for _ in range(args.repeat):
+            run, consolidator = run_pipeline(paths, tolerance_dict, output_path, args.workers)
+            for stage in STAGES:
+                timings[stage].append(run[stage])
+        size_mb = os.path.getsize(output_path) / 1e6
+
+    table = consolidator.table
+    params = dict(options, tolerance_every=args.tolerance_every, workers=args.workers)
+    record = results_record(
+        "pipeline", params, timings,
+        rows=len(table), columns=len(table.measurement_names),
+        tolerances=len(tolerance_dict), output_mb=round(size_mb, 2),
+    )
+
+    # Keep stdout clean for --json -
+    out = sys.stderr if args.json == "-" else sys.stdout
+    print(
+        f"{len(paths)} reports x {args.measurements} measurements -> "
+        f"{len(table)} rows x {len(table.measurement_names)} columns "
+        f"(reports ready in {generated:.2f}s, best of {args.repeat}):",
+        file=out,
+    )
+    for stage in STAGES:
+        result = record["stages"][stage]
+        print(f"  {stage:<12} {result['best']:8.3f}s  (median {result['median']:.3f}s)", file=out)
+    if args.json:
+        write_results(record, args.json)
+    if args.compare:
+        print_comparison(record, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+# gen_reports.py
+"""
+Generate synthetic gem reports in the measurement machines' Type/Value layout.
+
+    python -m benchmarks.gen_reports OUT_DIR --files 500 --measurements 300
+    python -m benchmarks.gen_reports OUT_DIR --distinct-types 3 --runtime late
+
+Each report is one sheet: a few metadata rows, then a header row
+(ID, Date Time, Type, Unit, Value) and one row per measurement. Measurement
+types repeat (Diameter, Angle, ...) so the parser numbers them Diameter 1,
+Diameter 2, ... exactly as it does for real reports.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+
+from app.core.naming import map_symbol
+
+MEASUREMENT_TYPES = [
+    "Diameter", "Distance", "Concentricity", "Angle", "Height",
+    "Table", "Crown", "Pavilion", "Girdle", "Culet",
+]
+TYPE_UNITS = {"Angle": "°", "Crown": "°", "Pavilion": "°"}
+HEADER = ["ID", "Date Time", "Type", "Unit", "Value"]
+
+# Where the report's runtime stamp is written:
+#   metadata  datetime cell in the metadata block above the header (most machines)
+#   column    text in the Date Time column of the first measurement row
+#   late      text in a metadata row after the measurements (outside the parser's scan window)
+#   none      no runtime stamp at all
+RUNTIME_PLACEMENTS = ("metadata", "column", "late", "none")
+
+NOMINAL = 2.0
+TOLERANCE = 0.05
+FIRST_FILE_ID = 1000
+STARTED = datetime(2025, 12, 1, 8, 0, 0)
+
+
+def measurement_types(measurements, distinct_types):
+    """
+    Type name of each measurement row: distinct_types names cycled, so every
+    name appears about measurements / distinct_types times.
+    """
+    names = []
+    for i in range(max(1, distinct_types)):
+        base, rank = MEASUREMENT_TYPES[i % len(MEASUREMENT_TYPES)], i // len(MEASUREMENT_TYPES)
+        names.append(base if rank == 0 else f"{base}-{rank + 1}")
+    return [names[i % len(names)] for i in range(measurements)]
+
+
+def report_tolerances(measurements, distinct_types, every=1):
+    """
+    {col_name_with_unit: (nominal, plus, minus)} for the generated columns,
+    one per `every` columns (every=1 -> all of them).
+    """
+    counts = {}
+    tolerances = {}
+    for i, m_type in enumerate(measurement_types(measurements, distinct_types)):
+        counts[m_type] = counts.get(m_type, 0) + 1
+        if i % every == 0:
+            tolerances[map_symbol(f"{m_type} {counts[m_type]}")] = (NOMINAL, TOLERANCE, TOLERANCE)
+    return tolerances
+
+
+def write_report(path, file_id, measurements=200, distinct_types=5, runtime="metadata",
+                 fail_rate=0.05, text_rate=0.01, dropped=0, seed=0):
+    """
+    Write one synthetic report.
+
+    Args:
+        measurements: measurement rows
+        distinct_types: distinct Type names (fewer -> more duplicated names)
+        runtime: one of RUNTIME_PLACEMENTS
+        fail_rate: share of values outside nominal +/- tolerance
+        text_rate: share of non-numeric values ("-")
+        dropped: measurement rows left out at random (files with different column sets)
+        seed: random seed (same arguments and seed -> same file)
+    """
+    if runtime not in RUNTIME_PLACEMENTS:
+        raise ValueError(f"runtime must be one of {RUNTIME_PLACEMENTS}, not {runtime!r}")
+    rng = random.Random(seed)
+    stamp = STARTED + timedelta(minutes=7 * file_id)
+    types = measurement_types(measurements, distinct_types)
+    if dropped:
+        skip = set(rng.sample(range(len(types)), min(dropped, len(types))))
+        types = [m_type for i, m_type in enumerate(types) if i not in skip]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Report")
+    ws.append(["Program", "GEM-STD-01"])
+    ws.append(["Part", str(file_id)])
+    ws.append(["Date", stamp if runtime == "metadata" else None])
+    ws.append([])
+    ws.append(HEADER)
+    for i, m_type in enumerate(types):
+        roll = rng.random()
+        if roll < text_rate:
+            value = "-"
+        elif roll < text_rate + fail_rate:
+            value = round(NOMINAL + rng.choice((-1, 1)) * rng.uniform(1.2, 4) * TOLERANCE, 4)
+        else:
+            value = round(NOMINAL + rng.uniform(-TOLERANCE, TOLERANCE), 4)
+        when = stamp.strftime("%Y-%m-%d %H:%M:%S") if runtime == "column" and i == 0 else None
+        ws.append([f"C{i + 1}", when, m_type, TYPE_UNITS.get(m_type, "mm"), value])
+    if runtime == "late":
+        ws.append([])
+        ws.append(["Printed", stamp.strftime("%Y-%m-%d %H:%M:%S")])
+    wb.save(path)
+    return path
+
+
+def generate_reports(out_dir, files=100, measurements=200, distinct_types=5, runtime="metadata",
+                     fail_rate=0.05, text_rate=0.01, dropped=0, seed=0):
+    """
+    Write `files` reports named <file ID>.xlsx into out_dir (see write_report).
+    Returns: list of paths, in file ID order
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(files):
+        file_id = FIRST_FILE_ID + i
+        paths.append(write_report(
+            os.path.join(out_dir, f"{file_id}.xlsx"), file_id, measurements, distinct_types, runtime,
+            fail_rate, text_rate, dropped, seed=seed * 1_000_003 + i,
+        ))
+    return paths
+
+
+def add_generator_arguments(parser):
+    """Generator options, shared with the benchmark scripts."""
+    parser.add_argument("--files", type=int, default=100, help="number of reports")
+    parser.add_argument("--measurements", type=int, default=200, help="measurement rows per report")
+    parser.add_argument(
+        "--distinct-types", type=int, default=5,
+        help="distinct Type names per report (fewer = more duplicate names)",
+    )
+    parser.add_argument("--runtime", choices=RUNTIME_PLACEMENTS, default="metadata", help="runtime stamp placement")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="share of out-of-tolerance values")
+    parser.add_argument("--text-rate", type=float, default=0.01, help="share of non-numeric values")
+    parser.add_argument("--dropped", type=int, default=0, help="measurement rows left out per report, at random")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def generator_options(args):
+    """generate_reports() keyword arguments from parsed add_generator_arguments() options."""
+    return dict(
+        files=args.files, measurements=args.measurements, distinct_types=args.distinct_types,
+        runtime=args.runtime, fail_rate=args.fail_rate, text_rate=args.text_rate,
+        dropped=args.dropped, seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    add_generator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    paths = generate_reports(args.out_dir, **generator_options(args))
+    print(f"Wrote {len(paths)} reports to {args.out_dir} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,22 @@
 # main.py
 
-from app.gui.main_window import MainWindow  # Ensure correct import path
-from PyQt5.QtWidgets import QApplication
+import multiprocessing
 import sys
 
 def main():
+    # Imported here so headless (command-line) runs never load PyQt5
+    from app.gui.main_window import MainWindow  # Ensure correct import path
+    from PyQt5.QtWidgets import QApplication
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # Required for the parse worker pool in frozen (PyInstaller) Windows builds
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        from app.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     main()
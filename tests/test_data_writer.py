@@ -0,0 +1,81 @@
+"""CSV data export: read back, it must hold the table, the PASS/FAIL flags and the tolerances."""
+
+import csv
+import json
+from datetime import datetime
+
+from app.core.table import MasterTable
+from app.core.validator import validate_columns
+from app.io.data_writer import export_master_data
+
+COLNAMES = ["Source_File", "Report_Runtime", "Diameter 1 (mm)", "Angle 1 (°)", "Height 1 (mm)", "Final Status"]
+ROWS = [
+    ["1001", "2025-12-02 10:30", 2.0, 45.0, 1.0 / 3, ""],
+    ["1002", "", 2.2, "-", 0.1, ""],
+    ["1003", "02/12/2025 10:31", "", 44.96, "n/a", ""],
+]
+TOLERANCES = {
+    "Diameter 1 (mm)": (2.0, 0.05, 0.05),
+    "Angle 1 (°)": ("45", "0.1", "0.1"),   # numeric strings, as a CSV tolerance file may give
+    "Height 1 (mm)": ("", 0.05, 0.05),     # blank nominal: every value passes, left out of the metadata
+}
+
+
+def make_table():
+    table = MasterTable.from_rows(COLNAMES, ROWS)
+    table.runtime_times = [datetime(2025, 12, 2, 10, 30), None, datetime(2025, 2, 12, 10, 31)]
+    return table
+
+
+def test_csv_round_trip(tmp_path):
+    table = make_table()
+    path = export_master_data(table, TOLERANCES, str(tmp_path / "week42.csv"), "QC Line 2", "Week 42")
+
+    assert path == str(tmp_path / "week42.csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        records = list(csv.DictReader(f))
+    with open(tmp_path / "week42.meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    assert list(records[0]) == [
+        "Source_File", "Report_Runtime", "Report_Time",
+        "Diameter 1 (mm)", "Diameter 1 (mm) Status",
+        "Angle 1 (°)", "Angle 1 (°) Status",
+        "Height 1 (mm)", "Height 1 (mm) Status",
+        "Final Status",
+    ]
+    assert [r["Source_File"] for r in records] == ["1001", "1002", "1003"]
+    assert [r["Report_Runtime"] for r in records] == [row[1] for row in ROWS]
+    assert [r["Report_Time"] for r in records] == ["2025-12-02T10:30:00", "", "2025-02-12T10:31:00"]
+
+    # Numbers at full precision; blank and non-numeric cells are empty
+    for j, name in enumerate(table.measurement_names):
+        for record, row in zip(records, ROWS):
+            value = row[2 + j]
+            if isinstance(value, float):
+                assert float(record[name]) == value
+            else:
+                assert record[name] == ""
+
+    checks = validate_columns(table, TOLERANCES)
+    for pos, name in enumerate(checks.columns):
+        expected = ["PASS" if p else "FAIL" if f else "" for p, f in zip(checks.passed[:, pos], checks.failed[:, pos])]
+        assert [r[name + " Status"] for r in records] == expected
+    assert [r["Diameter 1 (mm) Status"] for r in records] == ["PASS", "FAIL", ""]
+    assert [r["Angle 1 (°) Status"] for r in records] == ["PASS", "", "PASS"]
+    assert [r["Height 1 (mm) Status"] for r in records] == ["PASS", "PASS", "PASS"]
+    assert [r["Final Status"] for r in records] == ["PASS", "FAIL", "PASS"]
+
+    assert meta["title"] == "Week 42" and meta["creator"] == "QC Line 2" and meta["rows"] == 3
+    assert meta["tolerances"] == {"Diameter 1 (mm)": [2.0, 0.05, 0.05], "Angle 1 (°)": [45.0, 0.1, 0.1]}
+
+
+def test_csv_without_tolerances(tmp_path):
+    path = export_master_data(make_table(), None, str(tmp_path / "plain.csv"))
+
+    with open(path, newline="", encoding="utf-8") as f:
+        records = list(csv.DictReader(f))
+    assert not any(name.endswith(" Status") for name in records[0] if name != "Final Status")
+    assert [r["Final Status"] for r in records] == ["PASS"] * 3
+    with open(tmp_path / "plain.meta.json", encoding="utf-8") as f:
+        assert json.load(f)["tolerances"] == {}
@@ -0,0 +1,97 @@
+"""The direct Type/Value reader must name columns exactly as parse_report does."""
+
+import zipfile
+
+import pytest
+
+from app.core.parser import parse_report, read_report_columns
+from app.io.excel_reader import iter_type_values
+from benchmarks.gen_reports import RUNTIME_PLACEMENTS, write_report
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+</Types>"""
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Report" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+SHARED_STRINGS = """<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<si><t>Type</t></si><si><t>Value</t></si><si><t>Diameter</t></si><si><r><t>Ang</t></r><r><t>le</t></r></si>
+</sst>"""
+
+# Shared and inline strings, rich-text runs, cells and rows without 'r',
+# gaps between cells, blank Type/Value cells, booleans and numeric types
+SHEET_ROWS = """
+<row r="1"><c r="A1" t="inlineStr"><is><t>Program</t></is></c><c r="B1" t="inlineStr"><is><t>GEM</t></is></c></row>
+<row r="3"><c r="A3" t="inlineStr"><is><t>Date</t></is></c><c r="B3" t="inlineStr"><is><t>2025-12-02 10:30</t></is></c></row>
+<row r="5"><c r="A5" t="inlineStr"><is><t>ID</t></is></c><c r="C5" t="s"><v>0</v></c><c r="E5" t="s"><v>1</v></c></row>
+<row r="6"><c r="A6" t="inlineStr"><is><t>C1</t></is></c><c r="C6" t="s"><v>2</v></c><c r="E6"><v>2.01</v></c></row>
+<row><c t="inlineStr"><is><t>C2</t></is></c><c/><c t="s"><v>3</v></c><c/><c><v>45</v></c></row>
+<row r="9"><c r="C9" t="s"><v>2</v></c><c r="E9" t="inlineStr"><is><t>-</t></is></c></row>
+<row r="10"><c r="C10" t="inlineStr"><is><t> Diameter </t></is></c></row>
+<row r="11"><c r="E11"><v>1.5</v></c></row>
+<row r="12"><c r="C12"><v>7</v></c><c r="E12" t="b"><v>1</v></c></row>
+<row r="13"><c r="C13" t="inlineStr"><is><t>Height</t></is></c><c r="E13"><v>1E-3</v></c></row>
+<row r="14"/>
+<row r="15"><c r="A15" t="inlineStr"><is><t>C9</t></is></c><c r="C15" t="s"><v>3</v></c><c r="D15" t="inlineStr"><is><t>deg</t></is></c><c r="E15"><v>44.9</v></c></row>
+"""
+
+
+def write_raw_workbook(path, rows=SHEET_ROWS):
+    sheet = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f"<sheetData>{rows}</sheetData></worksheet>"
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("xl/workbook.xml", WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        archive.writestr("xl/sharedStrings.xml", SHARED_STRINGS)
+        archive.writestr("xl/worksheets/sheet1.xml", sheet)
+    return str(path)
+
+
+def assert_same_columns(path):
+    # The direct reader itself must succeed; read_report_columns would hide a fallback
+    list(iter_type_values(path))
+    assert read_report_columns(path) == parse_report(path).col_names
+
+
+@pytest.mark.parametrize("runtime", RUNTIME_PLACEMENTS)
+def test_generated_reports(tmp_path, runtime):
+    for seed, (distinct_types, dropped) in enumerate([(5, 0), (2, 7), (12, 3)]):
+        path = write_report(
+            str(tmp_path / f"{runtime}{seed}.xlsx"), 1000 + seed, measurements=40,
+            distinct_types=distinct_types, runtime=runtime, text_rate=0.2, dropped=dropped, seed=seed,
+        )
+        assert_same_columns(path)
+
+
+def test_shared_inline_and_sparse_cells(tmp_path):
+    path = write_raw_workbook(tmp_path / "raw.xlsx")
+    assert parse_report(path).col_names == [
+        "Diameter 1", "Angle 1", "Diameter 2", "7 1", "Height 1", "Angle 2",
+    ]
+    assert_same_columns(path)
+
+
+def test_no_header(tmp_path):
+    path = write_raw_workbook(tmp_path / "noheader.xlsx", SHEET_ROWS.replace('t="s"><v>0</v>', 't="s"><v>2</v>'))
+    assert read_report_columns(path) == parse_report(path).col_names == []
@@ -0,0 +1,87 @@
+"""Which cell texts are taken for a report runtime, and how they are read."""
+
+from datetime import datetime
+
+import pytest
+
+from app.core import parser
+from app.core.parser import RUNTIME_PATTERNS, _runtime_from_value
+
+# (cell text, datetime with RUNTIME_DAY_FIRST off, with it on)
+PARSED = [
+    ("2025-12-02 10:30:00", datetime(2025, 12, 2, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("2025/12/02 10:30", datetime(2025, 12, 2, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("2025-12-02T10:30:15.250", datetime(2025, 12, 2, 10, 30, 15), datetime(2025, 12, 2, 10, 30, 15)),
+    ("Printed: 2025-12-02 10:30", datetime(2025, 12, 2, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("2025/12/02 10.30.15", datetime(2025, 12, 2, 10, 30, 15), datetime(2025, 12, 2, 10, 30, 15)),
+    ("02.12.2025 10:30", datetime(2025, 12, 2, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("02.12.25 10.30 PM", datetime(2025, 12, 2, 22, 30), datetime(2025, 12, 2, 22, 30)),
+    ("12/2/2025 10:30:00 AM", datetime(2025, 12, 2, 10, 30), datetime(2025, 2, 12, 10, 30)),
+    ("12/2/2025 12:05 am", datetime(2025, 12, 2, 0, 5), datetime(2025, 2, 12, 0, 5)),
+    ("02/12/2025 10:30", datetime(2025, 2, 12, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("02-12-2025 10:30", datetime(2025, 2, 12, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    # Only one field order fits: read that way whatever the setting
+    ("25/12/2025 10:30", datetime(2025, 12, 25, 10, 30), datetime(2025, 12, 25, 10, 30)),
+    ("12/25/2025 10:30", datetime(2025, 12, 25, 10, 30), datetime(2025, 12, 25, 10, 30)),
+    ("25-12-2025 10:30", datetime(2025, 12, 25, 10, 30), datetime(2025, 12, 25, 10, 30)),
+    ("2 Dec 2025 10:30", datetime(2025, 12, 2, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("2-December-2025 10:30", datetime(2025, 12, 2, 10, 30), datetime(2025, 12, 2, 10, 30)),
+    ("Dec 2, 2025 10:30 PM", datetime(2025, 12, 2, 22, 30), datetime(2025, 12, 2, 22, 30)),
+]
+
+# Look like a runtime stamp but the date or time is out of range: kept as text, no datetime
+UNPARSED = [
+    "2025-13-45 10:30",
+    "31/31/2025 10:30",
+    "2025-12-02 25:30",
+    "12/2/2025 13:30 PM",
+]
+
+# Not a runtime at all
+NOT_RUNTIME = [
+    "12/05/2024 3.50",
+    "2025-12-02 10.30",
+    "02.12.2025 1.5",
+    "12-05-2024",
+    "2025-12-02",
+    "Rev-1.2",
+    "v1.2 3.45",
+    "Part 12-05 10:30",
+    "Diameter 1.234",
+    "",
+    "10:30",
+]
+
+
+@pytest.fixture(params=[False, True], ids=["month-first", "day-first"])
+def day_first(request, monkeypatch):
+    monkeypatch.setattr(parser, "RUNTIME_DAY_FIRST", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("text, month_first_at, day_first_at", PARSED)
+def test_parsed(day_first, text, month_first_at, day_first_at):
+    expected = day_first_at if day_first else month_first_at
+    assert _runtime_from_value(f"  {text} ") == (text, expected)
+
+
+@pytest.mark.parametrize("text", UNPARSED)
+def test_unparsed_stamp_keeps_text(day_first, text):
+    assert any(pattern.search(text) for pattern in RUNTIME_PATTERNS)
+    assert _runtime_from_value(text) == (text, None)
+
+
+@pytest.mark.parametrize("text", NOT_RUNTIME)
+def test_not_a_runtime(day_first, text):
+    assert not any(pattern.search(text) for pattern in RUNTIME_PATTERNS)
+    assert _runtime_from_value(text) is None
+
+
+@pytest.mark.parametrize("value", [None, 3.5, 45000, True])
+def test_non_text_cells(value):
+    assert _runtime_from_value(value) is None
+
+
+def test_datetime_cell():
+    stamp = datetime(2025, 12, 2, 10, 30, 5)
+    assert _runtime_from_value(stamp) == ("2025-12-02 10:30:05", stamp)
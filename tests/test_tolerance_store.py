@@ -0,0 +1,50 @@
+"""Tolerance profiles: saving, matching by columns and where they are kept."""
+
+import json
+
+import pytest
+
+from app.core import tolerance_store
+from app.core.tolerance_store import ToleranceStore
+
+TOLERANCES = {"Diameter 1 (mm)": (2.0, 0.05, 0.05), "Angle 1 (°)": (45.0, 0.1, 0.1)}
+
+
+def test_save_match_and_reload(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    store = ToleranceStore(path)
+    store.save(" GEM-STD-01 ", TOLERANCES)
+
+    reloaded = ToleranceStore(path)
+    assert reloaded.load_error is None
+    assert reloaded.names() == ["GEM-STD-01"]
+    # Column order and unit spelling don't matter
+    assert reloaded.match(["Angle 1", "Diameter 1 (mm)"]) == "GEM-STD-01"
+    assert reloaded.get("GEM-STD-01") == TOLERANCES
+
+
+def test_save_refuses_blank_values(tmp_path):
+    store = ToleranceStore(str(tmp_path / "profiles.json"))
+    with pytest.raises(ValueError, match="Angle 1"):
+        store.save("incomplete", {"Diameter 1 (mm)": (2.0, 0.05, 0.05), "Angle 1 (°)": (None, 0.1, 0.1)})
+    assert "incomplete" not in store
+    assert not (tmp_path / "profiles.json").exists()
+
+
+def test_default_file_is_outside_the_cache_folder(tmp_path, monkeypatch):
+    default = tmp_path / "config" / "tolerance_profiles.json"
+    legacy = tmp_path / "cache" / "tolerance_profiles.json"
+    monkeypatch.setattr(tolerance_store, "DEFAULT_PROFILES_PATH", str(default))
+    monkeypatch.setattr(tolerance_store, "LEGACY_PROFILES_PATH", str(legacy))
+    legacy.parent.mkdir()
+    ToleranceStore(str(legacy)).save("old", TOLERANCES)
+
+    # Profiles from the old location are loaded until the new file exists, and saved to the new file
+    store = ToleranceStore(str(default))
+    assert store.names() == ["old"]
+    store.save("new", TOLERANCES)
+    assert set(json.loads(default.read_text(encoding="utf-8"))["profiles"]) == {"old", "new"}
+
+    # Clearing the cache folder no longer loses them
+    legacy.unlink()
+    assert ToleranceStore(str(default)).names() == ["new", "old"]
@@ -0,0 +1,87 @@
+"""Vectorized validation must give the same PASS/FAIL as is_value_pass, cell by cell."""
+
+import math
+
+import pytest
+
+from app.core.table import MasterTable
+from app.core.validator import is_value_pass, validate_columns, validate_table
+
+TOLERANCES = [
+    (1.0, 0.05, 0.05),
+    (0.0, 0.05, 0.05),
+    (2.345, 0.012, 0.007),
+    (-3.3, 0.1, 0.0),
+    ("1.5", "0.05", "0.05"),   # numeric strings
+    (None, 0.05, 0.05),        # blank nominal: every value passes
+    ("abc", 0.05, 0.05),
+    (1.0, "", 0.05),
+    (1.0, 0.05),               # wrong length
+]
+
+def edge_values(tolerance_entry):
+    """Values at and around both bounds of a tolerance entry, plus the awkward ones."""
+    values = [None, "", "-", "n/a", "OK", "1.0", " 0.95 ", "1e-3", "nan",
+              math.nan, math.inf, -math.inf, True, False, 0, 1, 10**6]
+    try:
+        nominal, plus, minus = [float(x) for x in tolerance_entry]
+    except (ValueError, TypeError):
+        return values
+    for edge in (nominal - minus, nominal + plus):
+        for offset in (0.0, 0.0005, -0.0005, 0.001, -0.001, 0.005, -0.005,
+                       0.0045, 0.0055, 0.00549, 0.00551, -0.0055, 0.0049999, 0.0050001):
+            values.append(edge + offset)
+            values.append(round(edge + offset, 4))
+    values.append(nominal)
+    values.append(str(nominal + plus + 0.005))
+    return values
+
+
+def expected(value, tolerance_entry):
+    """(passed, failed) of one cell by the scalar rule; blanks are neither."""
+    ok = is_value_pass(value, tolerance_entry)
+    blank = value is None or (isinstance(value, str) and value in ("", "-"))
+    return ok and not blank, not ok
+
+
+@pytest.mark.parametrize("tolerance_entry", TOLERANCES, ids=repr)
+def test_validate_table_matches_is_value_pass(tolerance_entry):
+    values = edge_values(tolerance_entry)
+    colnames = ["Source_File", "Report_Runtime", "Diameter 1 (mm)", "Final Status"]
+    rows = [[f"F{i}", "", value, ""] for i, value in enumerate(values)]
+
+    batch = validate_table(rows, colnames, {"Diameter 1 (mm)": tolerance_entry})
+
+    assert batch.columns == ["Diameter 1 (mm)"]
+    for i, value in enumerate(values):
+        assert (batch.passed[i, 0], batch.failed[i, 0]) == expected(value, tolerance_entry), value
+        assert batch.row_failed[i] == batch.failed[i, 0]
+
+
+@pytest.mark.parametrize("tolerance_entry", TOLERANCES, ids=repr)
+def test_validate_columns_matches_is_value_pass(tolerance_entry):
+    values = edge_values(tolerance_entry)
+    colnames = ["Source_File", "Report_Runtime", "Diameter 1 (mm)", "Depth 1 (mm)", "Final Status"]
+    # Second column in reverse so numeric and non-numeric cells mix differently per row
+    rows = [[f"F{i}", "", value, other, ""] for i, (value, other) in enumerate(zip(values, values[::-1]))]
+    # The table stores None as a blank cell
+    table = MasterTable.from_rows(colnames, [[cell if cell is not None else "" for cell in row] for row in rows])
+
+    batch = validate_columns(table, {"Diameter 1 (mm)": tolerance_entry, "Depth 1 (mm)": tolerance_entry})
+
+    assert batch.columns == ["Diameter 1 (mm)", "Depth 1 (mm)"]
+    for i, row in enumerate(rows):
+        for pos, value in enumerate(row[2:4]):
+            assert (batch.passed[i, pos], batch.failed[i, pos]) == expected(value, tolerance_entry), value
+        assert batch.row_failed[i] == batch.failed[i].any()
+
+
+def test_validate_table_pads_short_rows_and_skips_unchecked_columns():
+    colnames = ["Source_File", "Report_Runtime", "A (mm)", "B (mm)", "Final Status"]
+    rows = [["F1", "", 1.0], ["F2", "", 2.0, 5.0]]
+
+    batch = validate_table(rows, colnames, {"B (mm)": (1.0, 0.05, 0.05)})
+
+    assert batch.columns == ["B (mm)"] and batch.indices == [3]
+    assert batch.passed.tolist() == [[False], [False]]
+    assert batch.failed.tolist() == [[False], [True]]